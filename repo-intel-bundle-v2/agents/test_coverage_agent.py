@@ -3,6 +3,9 @@ import os
 import argparse
 from datetime import datetime
 
+# The only analysis signals this agent reads; an analysis run just for it can be limited to these
+REQUIRED_SIGNALS = ["has_tests", "has_ci"]
+
 def load_json(path):
     with open(path, 'r') as f:
         return json.load(f)
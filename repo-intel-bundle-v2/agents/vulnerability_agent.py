@@ -16,9 +16,18 @@ def save_markdown(path, content):
     with open(path, 'w') as f:
         f.write(content)
 
-def analyze_vulnerability(repo_data):
+def analyze_vulnerability(repo_data, vulnerability_index=None):
+    """
+    `vulnerability_index` (a src.osv_index.VulnerabilityIndex) re-matches the stored
+    dependency list, so results analyzed before the last advisory import are current.
+    """
     signals = repo_data.get("signals", {})
     scores = repo_data.get("scores", {})
+
+    vulnerable = signals.get("vulnerable_dependencies", [])
+    if vulnerability_index is not None and signals.get("dependencies"):
+        vulnerable = vulnerability_index.match(signals["dependencies"])
+    severe = [d for d in vulnerable if any(a["severity"] in ("CRITICAL", "HIGH") for a in d["advisories"])]
     
     # 1. Calculate Security Posture Score
     # Start with base score 100
@@ -58,6 +67,30 @@ def analyze_vulnerability(repo_data):
             "evidence": ["Dockerfile"]
         })
 
+    # Known Vulnerable Dependencies
+    if vulnerable:
+        security_score -= 25 if severe else 10
+        findings.append({
+            "title": "Vulnerable Dependencies",
+            "severity": "High" if severe else "Medium",
+            "description": f"{len(vulnerable)} dependencies match known advisories ({len(severe)} critical or high).",
+            "evidence": [
+                f"{d['name']} {d['version']} ({d['ecosystem']}): " + ", ".join(a["id"] for a in d["advisories"])
+                for d in vulnerable
+            ]
+        })
+
+    # Manifests or lockfiles that were cut short or unparseable: their dependencies are unknown, not clean
+    incomplete = signals.get("dependency_audit_incomplete", [])
+    if incomplete:
+        security_score -= 10
+        findings.append({
+            "title": "Dependency Audit Incomplete",
+            "severity": "Medium",
+            "description": f"{len(incomplete)} manifests or lockfiles could not be audited.",
+            "evidence": [f"{f['path']} ({f['reason']})" for f in incomplete]
+        })
+
     # Missing Lockfile
     if not signals.get("has_lockfile"):
         security_score -= 5
@@ -87,6 +120,15 @@ def analyze_vulnerability(repo_data):
         plan["immediate"].append("Revoke exposed secrets immediately.")
         plan["short_term"].append("Implement git-secrets or similar pre-commit hooks.")
         
+    for d in severe:
+        fixes = [a["fixed"] for a in d["advisories"] if a["fixed"]]
+        plan["immediate"].append(f"Upgrade {d['name']} {d['version']}" + (f" to {fixes[-1]} or later." if fixes else " (no fixed version published)."))
+    if len(vulnerable) > len(severe):
+        plan["short_term"].append("Upgrade dependencies with moderate or low severity advisories.")
+
+    if incomplete:
+        plan["short_term"].append("Audit " + ", ".join(f["path"] for f in incomplete) + " with a dedicated scanner.")
+
     if "Runs as root user" in docker_issues:
         plan["short_term"].append("Update Dockerfile to creating a non-root user.")
         
@@ -100,6 +142,8 @@ def analyze_vulnerability(repo_data):
         "security_score": security_score,
         "risk_level": risk_level,
         "findings": findings,
+        "vulnerable_dependencies": vulnerable,
+        "dependency_audit_incomplete": incomplete,
         "remediation_plan": plan
     }
 
@@ -7,15 +7,16 @@ from pydantic import BaseModel
 from orchestrator.tool_registry import registry
 from orchestrator.pipeline import AssessmentPipeline
 from orchestrator.workflow import WorkflowParser
+from src.utils import get_github_tokens
 
 logger = logging.getLogger(__name__)
 
 # --- Helper Functions ---
 def _get_pipeline():
     # Helper to get a configured pipeline instance
-    github_token = os.getenv("GITHUB_TOKEN", "")
+    # A pool of tokens (GITHUB_TOKENS, comma-separated) multiplies the hourly request budget
     return AssessmentPipeline(
-        github_token=github_token,
+        github_token=get_github_tokens(),
         api_base=os.getenv("GITHUB_API_URL"),
         output_dir="outputs"
     )
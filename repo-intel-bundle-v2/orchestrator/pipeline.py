@@ -1,17 +1,25 @@
 import os
 import json
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
+import asyncio
 import time
 
 # Import Core Logic
-from src.github_client import GitHubClient
-from src.analyzer import RepoAnalyzer
+from src.async_github_client import AsyncGitHubClient
+from src.github_client import client_options_from_env, max_file_bytes_from_env
+from src.osv_index import VulnerabilityIndex
+from src.local_git import LocalGitClient
+from src.analyzer import AsyncRepoAnalyzer
+from src.utils import run_sync
+from src.rate_limit import RateLimitScheduler
+from src.result_store import ResultStore
+from src.signals import LazySignals
 
 # Import Agents Logic
 from agents.vulnerability_agent import analyze_vulnerability, generate_report as run_vuln_report
-from agents.test_coverage_agent import analyze_coverage, generate_report as run_test_report
+from agents.test_coverage_agent import REQUIRED_SIGNALS as TEST_COVERAGE_SIGNALS, analyze_coverage, generate_report as run_test_report
 from agents.integrator_agent import aggregate_data, generate_governance_report
 
 # Import Seller Mode
@@ -29,7 +37,7 @@ from orchestrator.workflow import WorkflowEngine, WorkflowStep
 logger = logging.getLogger(__name__)
 
 class AssessmentPipeline:
-    def __init__(self, github_token: str, api_base: Optional[str], output_dir: str):
+    def __init__(self, github_token: Union[str, List[str]], api_base: Optional[str], output_dir: str):
         self.github_token = github_token
         self.api_base = api_base
         self.output_dir = output_dir
@@ -68,17 +76,30 @@ class AssessmentPipeline:
     def execute_repo_analysis(self, context: Dict[str, Any], **kwargs):
         """Phase: analysis"""
         self.bus.emit("MCP_ANALYZE", "STARTED", message="Initializing GitHub Client", progress=10, agent_id="mcp_analyze")
-        client = GitHubClient(token=self.github_token, api_base_url=self.api_base)
-        analyzer = RepoAnalyzer(client)
-        
-        for url in context["repos"]:
+        max_concurrency = int(kwargs.get("max_concurrency") or os.getenv("GITHUB_MAX_CONCURRENCY", "8"))
+        # Local mirrors replace the GitHub API entirely when configured
+        git_mirror_root = kwargs.get("git_mirror_root") or os.getenv("GIT_MIRROR_ROOT")
+        backend = LocalGitClient(git_mirror_root, max_file_bytes_from_env()) if git_mirror_root else None
+        client = AsyncGitHubClient(token=self.github_token, api_base_url=self.api_base, max_concurrency=max_concurrency,
+                                   backend=backend, **client_options_from_env())
+        # Workflow steps can override the env default, e.g. "- [x] phase:analysis fetch_mode=archive"
+        fetch_mode = "contents" if backend else (kwargs.get("fetch_mode") or os.getenv("GITHUB_FETCH_MODE", "contents"))
+        incremental = str(kwargs.get("incremental") or os.getenv("INCREMENTAL_ANALYSIS", "false")).lower() in ("1", "true", "yes")
+        analyzer = AsyncRepoAnalyzer(client, fetch_mode=fetch_mode, result_store=ResultStore.from_env(),
+                                     incremental=incremental)
+        signals = self._analysis_signals(context, kwargs.get("signals"))
+
+        async def analyze_one(url: str):
             repo_slug = url.split("/")[-1]
             try:
                 self.bus.emit("MCP_ANALYZE", "IN_PROGRESS", repo=repo_slug, message=f"Analyzing {url}", agent_id="mcp_analyze")
                 logger.info(f"Analyzing {url}...")
                 
                 # Use 'ref' from kwargs or default to None
-                repo_result = analyzer.analyze(url, kwargs.get("ref"))
+                repo_result = await analyzer.analyze(url, kwargs.get("ref"), signals)
+                if isinstance(repo_result["signals"], LazySignals):
+                    # Dumping lazy signals would evaluate every detector the subset skipped
+                    repo_result = dict(repo_result, signals=repo_result["signals"].evaluated())
                 
                 slug = f"{repo_result['metadata']['owner']}_{repo_result['metadata']['repo']}"
                 json_path = os.path.join(self.repos_dir, f"{slug}.json")
@@ -90,15 +111,41 @@ class AssessmentPipeline:
                     f.write(repo_result.get("report_markdown", ""))
                 
                 self.bus.emit("MCP_ANALYZE", "COMPLETED", repo=slug, message="Analysis complete", artifact_paths=[json_path, md_path], agent_id="mcp_analyze")
-                context["analyzed_slugs"].append(slug)
+                return slug
                 
             except Exception as e:
                 logger.error(f"Analysis failed for {url}: {e}")
                 self.bus.emit("MCP_ANALYZE", "FAILED", repo=repo_slug, message=str(e), agent_id="mcp_analyze")
                 context["failures"].append({"url": url, "stage": "analysis", "error": str(e)})
 
+        async def analyze_all():
+            return await asyncio.gather(*(analyze_one(url) for url in context["repos"]))
+
+        try:
+            slugs = run_sync(analyze_all())
+        finally:
+            client.close()
+        context["rate_limit"] = RateLimitScheduler.shared().snapshot()
+        context["http"] = client.http_metrics()
+        # Keep the input order for downstream phases regardless of completion order
+        context["analyzed_slugs"].extend(slug for slug in slugs if slug)
+
+    @staticmethod
+    def _analysis_signals(context: Dict[str, Any], requested: Optional[str]) -> Optional[List[str]]:
+        """
+        The signal subset the analysis phase computes: `signals=a,b` on the phase, or just what
+        the test coverage agent reads when that is the only phase consuming the analysis.
+        None means a full analysis.
+        """
+        if requested:
+            return [name.strip() for name in requested.split(",") if name.strip()]
+        consumers = {phase for phase in context.get("phases", []) if phase != "analysis"}
+        return list(TEST_COVERAGE_SIGNALS) if consumers == {"tests"} else None
+
     def execute_security_scan(self, context: Dict[str, Any], **kwargs):
         """Phase: security"""
+        # One index for the whole portfolio; shards loaded for one repo serve the rest
+        vulnerability_index = VulnerabilityIndex.from_env()
         for slug in context["analyzed_slugs"]:
             try:
                 # Load Repo Data
@@ -106,7 +153,7 @@ class AssessmentPipeline:
                     repo_result = json.load(f)
 
                 self.bus.emit("AGENT_SECURITY", "STARTED", repo=slug, message="Running Vulnerability Detective", agent_id="security")
-                vuln_result = analyze_vulnerability(repo_result)
+                vuln_result = analyze_vulnerability(repo_result, vulnerability_index)
                 vuln_json_path = os.path.join(self.agents_dir, f"{slug}.vuln_detective.json")
                 vuln_md_path = os.path.join(self.agents_dir, f"{slug}.vuln_detective.md")
                 
@@ -232,6 +279,7 @@ class AssessmentPipeline:
         
         # Add basic context shared across steps
         context["github_token"] = self.github_token
+        context["phases"] = [step.phase for step in workflow_steps if step.enabled]
         
         engine.run_workflow(workflow_steps, context)
         
@@ -6,7 +6,7 @@ import logging
 from dotenv import load_dotenv
 
 from orchestrator.pipeline import AssessmentPipeline
-from src.utils import setup_logging
+from src.utils import setup_logging, get_github_tokens
 
 # Setup
 load_dotenv()
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("repo-intel-orchestrator")
 
 # Global Dependencies
-github_token = os.getenv("GITHUB_TOKEN")
+github_token = get_github_tokens()
 api_base = os.getenv("GITHUB_API_BASE_URL")
 output_dir = os.getenv("OUTPUT_DIR", "outputs")
 
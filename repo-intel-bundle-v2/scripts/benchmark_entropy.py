@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+# Ensure we can import from src
+sys.path.append(os.getcwd())
+
+from src.entropy_scanner import EntropyScanner, np
+
+
+def synthetic_source(lines: int, seed: int = 0) -> str:
+    """Code-like text with long identifiers, hashes and a few planted random tokens."""
+    rng = random.Random(seed)
+    words = ["def", "return", "self", "import", "request_handler_factory", "AbstractRepositoryImpl", "config",
+             "get_user_by_id", "None", "data", "value_12345", "client", "response_status_code", "for", "if"]
+    out = []
+    for i in range(lines):
+        out.append(" ".join(rng.choice(words) + rng.choice(["", "=1", "()", ":", "."]) for _ in range(8)))
+        if i % 2000 == 0:
+            out.append(f"api_key = '{''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(40))}'")
+    return "\n".join(out)
+
+
+def random_blob(size: int, seed: int = 1) -> str:
+    """Worst case: base64-like noise where almost every run is a candidate."""
+    rng = random.Random(seed)
+    return "".join(rng.choice(string.ascii_letters + string.digits + "+/ \n") for _ in range(size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entropy scan throughput, NumPy versus pure Python.")
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--blob-mb", type=float, default=2.0)
+    args = parser.parse_args()
+
+    backends = [False] + ([True] if np is not None else [])
+    for name, text in (("source", synthetic_source(args.lines)), ("random blob", random_blob(int(args.blob_mb * 1e6)))):
+        mb = len(text) / 1e6
+        print(f"{name}: {mb:.1f} MB")
+        for use_numpy in backends:
+            scanner = EntropyScanner(use_numpy=use_numpy)
+            start = time.perf_counter()
+            hits = scanner.scan(text)
+            elapsed = time.perf_counter() - start
+            print(f"  {scanner.backend:>6}: {mb / elapsed:7.1f} MB/s, {len(hits)} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import argparse
+
+# Ensure we can import from src/tools
+sys.path.append(os.getcwd())
+
+from src.github_client import GitHubClient
+from src.analyzer import RepoAnalyzer, FETCH_MODES
+from tools.fake_github import FakeGitHubServer, synthetic_repo
+
+REPO = "bench/synthetic"
+
+
+def run_mode(server: FakeGitHubServer, fetch_mode: str, rounds: int, repo_url: str):
+    """Runs the analyzer `rounds` times against the fake server and returns (best seconds, requests per run)."""
+    timings = []
+    for _ in range(rounds):
+        server.state.reset_stats()
+        client = GitHubClient(token="bench-token", api_base_url=server.url)
+        analyzer = RepoAnalyzer(client, fetch_mode=fetch_mode)
+        start = time.perf_counter()
+        analyzer.analyze(repo_url)
+        timings.append(time.perf_counter() - start)
+    return min(timings), dict(server.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fetch modes against a local fake GitHub server.")
+    parser.add_argument("--files", type=int, default=500, help="Total files in the synthetic repo")
+    parser.add_argument("--yaml", type=int, default=200, help="YAML files in the synthetic repo")
+    parser.add_argument("--dockerfiles", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per mode (best is reported)")
+    parser.add_argument("--modes", nargs="+", default=list(FETCH_MODES), choices=FETCH_MODES)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay the fake server adds to every response")
+    parser.add_argument("--rate-limit", type=int, help="Emulated requests per window (sends X-RateLimit-* headers)")
+    parser.add_argument("--cassette", help="Replay a recorded cassette (see tools/fake_github.py --record)")
+    parser.add_argument("--repo-url", default=f"https://github.com/{REPO}", help="Repo to analyze (for cassettes)")
+    args = parser.parse_args()
+
+    repos = {REPO: synthetic_repo(args.files, args.yaml, args.dockerfiles)}
+    if args.cassette:
+        print(f"Cassette: {args.cassette} ({args.repo_url})")
+    else:
+        print(f"Synthetic repo: {args.files} files, {args.yaml} YAML, {args.dockerfiles} Dockerfiles")
+    print(f"{'mode':<10} {'best (s)':>10} {'requests':>10}  breakdown")
+
+    with FakeGitHubServer(repos, latency=args.latency_ms / 1000, rate_limit=args.rate_limit,
+                          cassette=args.cassette) as server:
+        for mode in args.modes:
+            seconds, stats = run_mode(server, mode, args.rounds, args.repo_url)
+            requests = stats.pop("requests", 0)
+            breakdown = ", ".join(f"{k}={v}" for k, v in sorted(stats.items()))
+            print(f"{mode:<10} {seconds:>10.3f} {requests:>10}  {breakdown}")
+
+
+if __name__ == "__main__":
+    main()
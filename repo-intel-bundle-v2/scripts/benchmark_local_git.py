@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+
+# Ensure we can import from src/tools
+sys.path.append(os.getcwd())
+
+from src.analyzer import RepoAnalyzer
+from src.local_git import LocalGitClient
+from tools.fake_github import synthetic_repo
+
+OWNER, REPO = "bench", "synthetic"
+
+
+def build_mirror(mirror_root: str, files: int, yaml_files: int, dockerfiles: int):
+    """Commits a synthetic repo and clones it as a bare mirror at <root>/bench/synthetic.git."""
+    with tempfile.TemporaryDirectory() as work:
+        for path, content in synthetic_repo(files, yaml_files, dockerfiles).items():
+            full = os.path.join(work, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "wb") as f:
+                f.write(content)
+        git = ["git", "-C", work, "-c", "user.name=bench", "-c", "user.email=bench@localhost"]
+        subprocess.run(git + ["init", "-q", "-b", "main"], check=True)
+        subprocess.run(git + ["add", "-A"], check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "synthetic"], check=True)
+        subprocess.run(["git", "clone", "-q", "--bare", work, os.path.join(mirror_root, OWNER, f"{REPO}.git")], check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signal pipeline offline against local git mirrors.")
+    parser.add_argument("--mirror-root", help="Existing mirror root (default: build a synthetic mirror)")
+    parser.add_argument("--repos", nargs="+", help="Repo URLs to analyze from --mirror-root")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--yaml", type=int, default=500)
+    parser.add_argument("--dockerfiles", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per repo (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        mirror_root = args.mirror_root
+        repos = args.repos
+        if not mirror_root:
+            mirror_root = scratch
+            build_mirror(mirror_root, args.files, args.yaml, args.dockerfiles)
+            repos = [f"https://github.com/{OWNER}/{REPO}"]
+            print(f"Synthetic mirror: {args.files} files, {args.yaml} YAML, {args.dockerfiles} Dockerfiles")
+        if not repos:
+            parser.error("--repos is required with --mirror-root")
+
+        print(f"{'repo':<40} {'files':>8} {'best (s)':>10} {'blobs read':>11}")
+        for url in repos:
+            timings = []
+            for _ in range(args.rounds):
+                # A fresh client per round so tree walking is measured too
+                client = LocalGitClient(mirror_root)
+                start = time.perf_counter()
+                result = RepoAnalyzer(client).analyze(url)
+                timings.append(time.perf_counter() - start)
+                owner, repo = client.parse_repo_url(url)
+                files = len(client.list_tree(owner, repo, result["commit_sha"]))
+                stats = result["fetch_stats"]["local_git"]
+                client.close()
+            print(f"{owner + '/' + repo:<40} {files:>8} {min(timings):>10.3f} {stats['blobs_read']:>11}")
+
+
+if __name__ == "__main__":
+    main()
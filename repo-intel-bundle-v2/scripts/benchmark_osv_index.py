@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+# Ensure we can import from src
+sys.path.append(os.getcwd())
+
+from src.osv_index import VulnerabilityIndex
+
+
+def synthetic_advisories(packages: int, per_package: int, seed: int = 0):
+    """OSV records for npm packages, each advisory with one or two ranges."""
+    rng = random.Random(seed)
+    records = []
+    for p in range(packages):
+        for a in range(rng.randint(1, per_package)):
+            major = rng.randint(0, 5)
+            events = [{"introduced": "0" if rng.random() < 0.3 else f"{major}.0.0"},
+                      {"fixed": f"{major}.{rng.randint(1, 9)}.{rng.randint(0, 9)}"}]
+            if rng.random() < 0.3:
+                events += [{"introduced": f"{major + 1}.0.0"}, {"last_affected": f"{major + 1}.2.0"}]
+            records.append({
+                "id": f"GHSA-{p:05d}-{a:04d}",
+                "summary": "synthetic",
+                "affected": [{"package": {"ecosystem": "npm", "name": f"pkg-{p}"},
+                              "ranges": [{"type": "SEMVER", "events": events}]}],
+                "database_specific": {"severity": rng.choice(["LOW", "MODERATE", "HIGH", "CRITICAL"])},
+            })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vulnerability index build and portfolio lookup times.")
+    parser.add_argument("--packages", type=int, default=20000)
+    parser.add_argument("--advisories-per-package", type=int, default=4)
+    parser.add_argument("--repos", type=int, default=200)
+    parser.add_argument("--deps-per-repo", type=int, default=800)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "advisories.json")
+        with open(source, "w") as f:
+            json.dump(synthetic_advisories(args.packages, args.advisories_per_package), f)
+
+        start = time.perf_counter()
+        index = VulnerabilityIndex.build([source], os.path.join(tmp, "osv"))
+        print(f"build: {index.info['advisories']} advisories in {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(1)
+        # Half the names have advisories, half are unknown to the index
+        portfolio = [
+            [{"ecosystem": "npm", "name": f"pkg-{rng.randint(0, args.packages * 2)}",
+              "version": f"{rng.randint(0, 6)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}", "path": "package-lock.json"}
+             for _ in range(args.deps_per_repo)]
+            for _ in range(args.repos)
+        ]
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            vulnerable = sum(len(index.match(dependencies)) for dependencies in portfolio)
+            elapsed = time.perf_counter() - start
+            lookups = args.repos * args.deps_per_repo
+            print(f"{label}: {lookups} lookups in {elapsed * 1000:.0f} ms ({elapsed / lookups * 1e6:.1f} us each), "
+                  f"{vulnerable} vulnerable, {index.stats['shard_loads']} shard loads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import re
+import time
+import random
+import string
+import argparse
+
+# Ensure we can import from src
+sys.path.append(os.getcwd())
+
+from src.secret_scanner import BUILTIN_RULES, SecretRule, SecretScanner
+
+
+def synthetic_source(lines: int, seed: int = 0) -> str:
+    """Code-like text with a few planted secrets."""
+    rng = random.Random(seed)
+    words = ["def", "return", "self", "import", "value", "config", "token", "password", "for", "if",
+             "else", "class", "None", "data", "key", "url", "user", "private", "api", "client"]
+    out = []
+    for i in range(lines):
+        out.append(" ".join(rng.choice(words) + rng.choice(["", "_x", "=1", "()", ":"]) for _ in range(8)))
+        if i % 5000 == 0:
+            out.append(f"aws_key = 'AKIA{''.join(rng.choice(string.ascii_uppercase) for _ in range(16))}'")
+    return "\n".join(out)
+
+
+def synthetic_rules(count: int, seed: int = 1):
+    """User-style rules: a keyword prefix followed by a token body."""
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        keyword = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8))) + "_"
+        rules.append(SecretRule(f"Custom {i}", re.escape(keyword) + r"[A-Za-z0-9]{20,40}", (keyword,)))
+    return tuple(rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Secret scan throughput per backend as the rule set grows.")
+    parser.add_argument("--lines", type=int, default=40000)
+    parser.add_argument("--rules", type=int, nargs="+", default=[0, 30, 100, 300, 1000])
+    args = parser.parse_args()
+
+    text = synthetic_source(args.lines)
+    mb = len(text) / 1e6
+    print(f"{mb:.1f} MB of text")
+    for extra in args.rules:
+        rules = BUILTIN_RULES + synthetic_rules(extra)
+        timings = []
+        for use_numpy in (True, False):
+            scanner = SecretScanner(rules, use_numpy=use_numpy)
+            start = time.perf_counter()
+            hits = scanner.scan(text)
+            timings.append(f"{scanner.backend} {mb / (time.perf_counter() - start):7.1f} MB/s")
+
+        # One re.search pass per rule, as the old detector did
+        patterns = [re.compile(r.pattern) for r in rules]
+        start = time.perf_counter()
+        for pattern in patterns:
+            list(pattern.finditer(text))
+        naive_s = time.perf_counter() - start
+        print(f"  {len(rules):>5} rules: scanner {', '.join(timings)}, per-rule search {mb / naive_s:7.1f} MB/s, {len(hits)} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+import argparse
+import json
+
+# Ensure we can import from src
+sys.path.append(os.getcwd())
+
+from scripts.benchmark_tree_cache import synthetic_entries
+from src.path_classifier import classify_paths
+from src.signals import SignalDetector
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the per-path cost of path classification and detect_all.")
+    parser.add_argument("--paths", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [e["path"] for e in json.loads(synthetic_entries(args.paths))]
+    # A few paths every rule should see
+    paths += ["README.md", "package.json", "Dockerfile", ".github/workflows/ci.yml", "tests/test_app.py", "main.tf"]
+
+    for label, run in (("classify_paths", lambda: classify_paths(paths)),
+                       ("detect_all", lambda: SignalDetector(paths, lambda path, max_bytes=None: "").detect_all())):
+        best = min(_timed(run) for _ in range(args.rounds))
+        print(f"{label:<15}: {best:.3f}s for {len(paths)} paths, {best / len(paths) * 1e9:.0f} ns/path")
+
+    index = classify_paths(paths)
+    print("tags: " + ", ".join(f"{tag}={len(index.paths(tag))}" for tag in index.tags()))
+
+
+def _timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
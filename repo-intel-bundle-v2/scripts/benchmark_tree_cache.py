@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import argparse
+import json
+import random
+import tracemalloc
+
+# Ensure we can import from src
+sys.path.append(os.getcwd())
+
+from src.signals import SignalDetector
+from src.tree_cache import CompactTree
+
+
+def synthetic_entries(count: int, files_per_dir: int = 15, seed: int = 0):
+    """Monorepo-shaped tree entries: deep, repetitive directory prefixes and common basenames."""
+    rng = random.Random(seed)
+    names = ["index.js", "package.json", "README.md", "main.py", "__init__.py", "utils.ts", "config.yaml", "BUILD"]
+    roots = ["services", "libs", "tools", "packages"]
+    directories = [
+        "/".join(f"{roots[j % len(roots)]}_{rng.randint(0, 40)}" for j in range(rng.randint(2, 6)))
+        for _ in range(max(1, count // files_per_dir))
+    ]
+    entries = []
+    for i in range(count):
+        name = names[i % len(names)] if i % 3 else f"file_{i}.py"
+        entries.append({"path": f"{rng.choice(directories)}/{name}", "mode": "100644", "type": "blob",
+                        "sha": f"{rng.getrandbits(160):040x}", "size": rng.randint(10, 100000)})
+    # Round-trip through JSON so every string is a fresh object, as in a parsed API response
+    return json.dumps(entries)
+
+
+def measure(build):
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of plain path lists against CompactTree.")
+    parser.add_argument("--paths", type=int, default=300000)
+    parser.add_argument("--files-per-dir", type=int, default=15)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.paths, args.files_per_dir)
+
+    # What GitHubClient used to keep per tree: the path list plus path -> sha and path -> size dicts
+    def build_plain():
+        rows = json.loads(entries)
+        return ([r["path"] for r in rows], {r["path"]: r["sha"] for r in rows}, {r["path"]: r["size"] for r in rows})
+
+    def build_compact():
+        return CompactTree(json.loads(entries))
+
+    plain, plain_bytes = measure(build_plain)
+    compact, compact_bytes = measure(build_compact)
+    assert list(compact) == plain[0]
+
+    print(f"{args.paths} paths")
+    print(f"  list + dicts : {plain_bytes / 1e6:8.1f} MB")
+    print(f"  CompactTree  : {compact_bytes / 1e6:8.1f} MB (estimate {compact.nbytes / 1e6:.1f} MB)")
+
+    for label, tree in (("list", plain[0]), ("CompactTree", compact)):
+        start = time.perf_counter()
+        SignalDetector(tree, lambda path, max_bytes=None: "").detect_all()
+        print(f"  detect_all over {label:<12}: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
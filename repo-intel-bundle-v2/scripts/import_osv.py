@@ -0,0 +1,28 @@
+import os
+import sys
+import argparse
+import logging
+
+# Ensure we can import from src
+sys.path.append(os.getcwd())
+
+from src.osv_index import VulnerabilityIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the offline vulnerability index from OSV exports, e.g. "
+                    "https://osv-vulnerabilities.storage.googleapis.com/PyPI/all.zip (npm, PyPI, Go, crates.io)."
+    )
+    parser.add_argument("sources", nargs="+", help="OSV export zips, directories of OSV JSON files, or JSON files")
+    parser.add_argument("--index-dir", default=None,
+                        help="Where to write the index (default: OSV_INDEX_DIR, or osv/ under REPO_INTEL_CACHE_DIR)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    index = VulnerabilityIndex.build(args.sources, args.index_dir)
+    print(f"{index.info['advisories']} advisories, packages per ecosystem: {index.info['packages']} -> {index.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,58 @@
 from datetime import datetime, timezone
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional, Dict, Any, List
+import logging
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from .archive_index import ArchiveIndex
+from .change_set import ChangeSet
+from .content_cache import ContentCache
+from .content_policy import ContentPolicy
+from .detectors import DetectorRegistry
+from .entropy_scanner import EntropyScanner
 from .github_client import GitHubClient
-from .signals import SignalDetector
+from .async_github_client import AsyncGitHubClient
+from .graphql_reader import GraphQLBlobReader
+from .osv_index import VulnerabilityIndex, describe_match
+from .signals import LazySignals, SignalDetector
+from .tree_cache import CompactTree
 from .scoring import calculate_scores
 from .report import ReportGenerator
+from .result_store import ResultStore
+from .secret_scanner import SecretScanner
+
+logger = logging.getLogger(__name__)
+
+FETCH_MODES = ("contents", "archive", "graphql")
 
 class RepoAnalyzer:
-    def __init__(self, github_client: GitHubClient):
+    def __init__(self, github_client: GitHubClient, fetch_mode: str = "contents",
+                 result_store: Optional[ResultStore] = None, incremental: bool = False):
+        """
+        `github_client` is a GitHubClient or any source backend with the same surface,
+        such as LocalGitClient; backends other than GitHubClient only support "contents".
+        With a `result_store`, re-analyzing a commit returns its stored result, and with
+        `incremental` a new commit is analyzed from the diff against the latest stored one.
+        """
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode '{fetch_mode}'. Expected one of {FETCH_MODES}.")
         self.gh = github_client
+        # "contents": one Contents API call per file read (default).
+        # "archive": download the ref's tarball once and serve every read from it.
+        # "graphql": fetch the files detectors need in batched GraphQL queries.
+        self.fetch_mode = fetch_mode
+        self.result_store = result_store
+        self.incremental = incremental and result_store is not None
 
-    def analyze(self, repo_url: str, ref: Optional[str] = None) -> Dict[str, Any]:
+    def analyze(self, repo_url: str, ref: Optional[str] = None,
+                signals: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Orchestrates the analysis of a single repository.
+
+        With `signals`, only the detectors behind those signals run (and only their
+        files are fetched); the result is partial, with no scores, findings or report,
+        and its other signals are computed on first access.
         """
         owner, repo = self.gh.parse_repo_url(repo_url)
         
@@ -20,28 +60,192 @@ class RepoAnalyzer:
         metadata = self.gh.get_repo_metadata(owner, repo)
         default_branch = metadata.get("default_branch", "main")
         target_ref = ref or default_branch
+        # Pin the analysis to one commit so trees, file contents and results are keyed immutably
+        commit_sha = self.gh.resolve_ref(owner, repo, target_ref)
+        stored = self._load_result(owner, repo, commit_sha)
+        if stored is not None:
+            return self._relabel_result(stored, repo_url, owner, repo, target_ref)
+        if signals is None:
+            baseline = self._baseline(owner, repo)
+            if baseline is not None:
+                files = self.gh.compare(owner, repo, baseline[0]["commit_sha"], commit_sha)
+                if files is not None:
+                    return self._analyze_changes(repo_url, owner, repo, target_ref, commit_sha, metadata,
+                                                 baseline, ChangeSet.from_files(files))
 
         # 2. Fetch File Tree
-        file_tree = self.gh.list_tree(owner, repo, target_ref)
+        file_tree = self.gh.list_tree(owner, repo, commit_sha)
 
         # 3. Detect Signals
-        # Helper to read files on demand
-        def file_reader(path: str) -> str:
-            return self.gh.read_file(owner, repo, path, target_ref)
+        detector = SignalDetector(file_tree, None)
+        # Path-only subsets skip the archive download and GraphQL batch entirely
+        needs_content = signals is None or bool(detector.read_plan(speculative=True, signals=signals))
+        archive = None
+        if self.fetch_mode == "archive" and needs_content:
+            archive = self.gh.download_archive(owner, repo, commit_sha)
+            file_reader = self._archive_reader(archive, self.gh.max_file_bytes)
+        else:
+            # Helper to read files on demand
+            def file_reader(path: str, max_bytes: Optional[int] = None) -> str:
+                return self.gh.read_file(owner, repo, path, commit_sha, max_bytes=max_bytes)
 
-        detector = SignalDetector(file_tree, file_reader)
-        signals = detector.detect_all()
+        content = self._content_cache(detector, file_reader, signals)
+        if self.fetch_mode == "graphql" and needs_content:
+            # Submit every path the detectors may read as one batched request set; batches land
+            # in the content cache, and anything GraphQL leaves out is read on demand
+            reader = GraphQLBlobReader(self.gh)
+            for batch in reader.batches(detector.planned_reads(speculative=True, signals=signals)):
+                content.store(reader.fetch_batch(owner, repo, batch, commit_sha))
+        elif self.fetch_mode == "contents":
+            # Fetch everything the detectors declared at once; detection then runs on cached content
+            content.prefetch(detector.read_plan(signals=signals), max_workers=int(os.getenv("GITHUB_MAX_CONCURRENCY", "8")))
+        try:
+            detected = detector.detect_all() if signals is None else detector.detect(signals)
+        finally:
+            if archive is not None:
+                archive.close()
+        if archive is not None and signals is not None:
+            # Reads would fail once the archive is closed
+            detected.freeze()
 
-        # 4. Calculate Scores
-        scores = calculate_scores(signals)
+        if signals is not None:
+            return self._build_partial_result(repo_url, owner, repo, target_ref, commit_sha, metadata, detected, content.stats)
+        return self._build_result(repo_url, owner, repo, target_ref, commit_sha, metadata, detected, content.stats,
+                                  file_tree)
 
-        # 5. Generate Findings (Derived from signals/scores)
-        findings = self._generate_findings(signals, scores)
+    def _baseline(self, owner: str, repo: str) -> Optional[Tuple[Dict[str, Any], CompactTree]]:
+        """The latest stored result and its file listing, when incremental analysis can start from them."""
+        if not self.incremental:
+            return None
+        previous = self.result_store.latest(owner, repo)
+        if previous is None or previous.get("partial") or previous.get("config_fingerprint") != self.config_fingerprint():
+            # Signals the diff leaves alone would be carried over from other settings
+            return None
+        listing = self.result_store.listing(owner, repo, previous["commit_sha"])
+        return (previous, listing) if listing is not None else None
 
-        # 6. Construct Result Object
+    def _analyze_changes(self, repo_url: str, owner: str, repo: str, target_ref: str, commit_sha: str,
+                         metadata: Dict[str, Any], baseline: Tuple[Dict[str, Any], CompactTree],
+                         changes: ChangeSet) -> Dict[str, Any]:
+        """
+        Re-analysis from the previous result: the listing is patched with the diff
+        instead of relisted, only the detectors the diff affects run again, and
+        only changed files are fetched up front.
+        """
+        previous, listing = baseline
+        detector, rerun, plan = self._change_plan(listing, previous, changes)
+        # Reads at the head commit look up blob SHAs and sizes in the patched listing, as after list_tree
+        self.gh.remember_tree(owner, repo, commit_sha, detector.file_paths)
+        # An archive holds the whole tree, so the diff is read file by file instead
+        def file_reader(path: str, max_bytes: Optional[int] = None) -> str:
+            return self.gh.read_file(owner, repo, path, commit_sha, max_bytes=max_bytes)
+
+        content = self._content_cache(detector, file_reader, [s for d in rerun for s in d.signals])
+        if self.fetch_mode == "graphql":
+            reader = GraphQLBlobReader(self.gh)
+            for batch in reader.batches(list(plan)):
+                content.store(reader.fetch_batch(owner, repo, batch, commit_sha))
+        else:
+            content.prefetch(plan, max_workers=int(os.getenv("GITHUB_MAX_CONCURRENCY", "8")))
+        signals = detector.update(previous["signals"], changes, rerun)
+        return self._build_result(repo_url, owner, repo, target_ref, commit_sha, metadata, signals, content.stats,
+                                  detector.file_paths, self._incremental_stats(previous, changes, rerun))
+
+    @staticmethod
+    def _change_plan(listing: CompactTree, previous: Dict[str, Any], changes: ChangeSet):
+        """The detector over the patched listing, the detectors to re-run, and the changed files they read."""
+        detector = SignalDetector(changes.apply(listing), None)
+        rerun = detector.affected(changes, previous["signals"])
+        plan = {path: limit for path, limit in detector.read_plan(signals=[s for d in rerun for s in d.signals]).items()
+                if path in changes.current}
+        logger.info(f"{len(changes)} changed files since {previous['commit_sha'][:12]}; "
+                    f"re-running {[d.name for d in rerun]} with {len(plan)} reads")
+        return detector, rerun, plan
+
+    @staticmethod
+    def _incremental_stats(previous: Dict[str, Any], changes: ChangeSet, rerun: List[Any]) -> Dict[str, Any]:
+        return {
+            "base_commit": previous["commit_sha"],
+            "changed_files": len(changes),
+            "rerun_detectors": [d.name for d in rerun]
+        }
+
+    @staticmethod
+    def _content_cache(detector: SignalDetector, file_reader, signals: Optional[Sequence[str]] = None) -> ContentCache:
+        """Routes the detector's reads through a per-analysis cache, so no path is fetched twice."""
+        plan = detector.read_plan(signals=signals)
+        content = ContentCache.from_env(RepoAnalyzer._capped_reader(detector, file_reader),
+                                        full_paths=[path for path, limit in plan.items() if limit is None])
+        detector.read_file = content
+        return content
+
+    @staticmethod
+    def _capped_reader(detector: SignalDetector, file_reader):
+        """
+        Wraps a reader (sync or async) so whole-file reads of paths with a raised cap
+        (see SignalDetector.read_caps) ask for that cap explicitly.
+        """
+        caps = detector.read_caps()
+        if not caps:
+            return file_reader
+
+        def capped_reader(path: str, max_bytes: Optional[int] = None):
+            return file_reader(path, max_bytes=caps.get(path) if max_bytes is None else max_bytes)
+        return capped_reader
+
+    @staticmethod
+    def _archive_reader(archive: ArchiveIndex, max_file_bytes: Optional[int]):
+        """File reader over a downloaded archive, applying the same per-file cap as GitHubClient.read_file."""
+        def file_reader(path: str, max_bytes: Optional[int] = None) -> str:
+            return archive.read(path, max_bytes if max_bytes is not None else max_file_bytes)
+        return file_reader
+
+    def config_fingerprint(self) -> str:
+        """
+        Hash of the settings a result depends on besides its commit: the registered detectors
+        and their versions, the secret rules, the entropy allowlist, the content policy, the
+        per-file read cap and the build of the advisory index. A stored result computed under
+        other settings is not reused.
+        """
+        policy = ContentPolicy.from_env()
+        index = VulnerabilityIndex.from_env()
+        settings = {
+            "detectors": sorted(f"{d.name}@{d.version}" for d in DetectorRegistry.shared().detectors()),
+            "secret_rules": SecretScanner.from_env().fingerprint,
+            "entropy_allowlist": EntropyScanner.from_env().fingerprint,
+            "content_policy": policy.fingerprint if policy is not None else None,
+            "max_file_bytes": getattr(getattr(self.gh, "sync", self.gh), "max_file_bytes", None),
+            "vulnerability_index": index.describe()["built_at"] if index is not None else None
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _load_result(self, owner: str, repo: str, commit_sha: str) -> Optional[Dict[str, Any]]:
+        if self.result_store is None:
+            return None
+        stored = self.result_store.get(owner, repo, commit_sha)
+        if stored is not None and stored.get("config_fingerprint") != self.config_fingerprint():
+            logger.info(f"Stored result for {owner}/{repo}@{commit_sha[:12]} was computed under other settings; re-analyzing")
+            return None
+        return stored
+
+    def _relabel_result(self, stored: Dict[str, Any], repo_url: str, owner: str, repo: str,
+                        target_ref: str) -> Dict[str, Any]:
+        """A result stored for this commit, labelled with the URL and ref it was requested as."""
+        result = dict(stored, repo_url=repo_url, ref=target_ref, from_result_store=True)
+        result["fetch_stats"] = self.gh.fetch_stats(owner, repo)
+        return result
+
+    def _base_result(self, repo_url: str, owner: str, repo: str, target_ref: str, commit_sha: str,
+                     metadata: Dict[str, Any], signals: Dict[str, Any], content_stats: Optional[Dict[str, int]],
+                     scores: Optional[Dict[str, int]] = None,
+                     findings: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         result = {
             "repo_url": repo_url,
             "ref": target_ref,
+            "commit_sha": commit_sha,
+            "fetch_mode": self.fetch_mode,
+            "from_result_store": False,
+            "config_fingerprint": self.config_fingerprint(),
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "metadata": {
                 "owner": owner,
@@ -51,13 +255,52 @@ class RepoAnalyzer:
             },
             "scores": scores,
             "signals": signals,
-            "findings": findings
+            "findings": findings,
+            "fetch_stats": self.gh.fetch_stats(owner, repo)
         }
-        
+        if scores is None:
+            # Partial results are neither scored nor given findings
+            del result["scores"], result["findings"]
+        if content_stats is not None:
+            result["fetch_stats"]["content_cache"] = dict(content_stats)
+        return result
+
+    def _build_partial_result(self, repo_url: str, owner: str, repo: str, target_ref: str, commit_sha: str,
+                              metadata: Dict[str, Any], signals: LazySignals,
+                              content_stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """A result for a signal subset: not scored, not reported and not stored."""
+        result = self._base_result(repo_url, owner, repo, target_ref, commit_sha, metadata, signals, content_stats)
+        result["partial"] = True
+        return result
+
+    def _build_result(self, repo_url: str, owner: str, repo: str, target_ref: str, commit_sha: str,
+                      metadata: Dict[str, Any], signals: Dict[str, Any],
+                      content_stats: Optional[Dict[str, int]] = None, file_paths: Optional[Sequence[str]] = None,
+                      incremental: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # 4. Calculate Scores
+        scores = calculate_scores(signals)
+
+        # 5. Generate Findings (Derived from signals/scores)
+        findings = self._generate_findings(signals, scores)
+
+        # 6. Construct Result Object
+        result = self._base_result(repo_url, owner, repo, target_ref, commit_sha, metadata, signals, content_stats,
+                                   scores, findings)
+        if incremental is not None:
+            result["incremental"] = incremental
+
         # 7. Generate Markdown Report
         reporter = ReportGenerator(result)
         result["report_markdown"] = reporter.to_markdown()
 
+        if result["fetch_stats"].get("tree", {}).get("partial"):
+            # Signals from an incomplete listing would be served as final for this commit
+            logger.warning(f"Not storing the result for {owner}/{repo}@{commit_sha[:12]}: its file listing is partial")
+        elif self.result_store is not None:
+            if self.incremental and file_paths is not None:
+                # Written first, so the latest result always has the listing the next increment patches
+                self.result_store.put_listing(owner, repo, commit_sha, file_paths)
+            self.result_store.put(owner, repo, commit_sha, result)
         return result
 
     def _generate_findings(self, signals: Dict[str, Any], scores: Dict[str, int]) -> List[Dict[str, Any]]:
@@ -74,6 +317,38 @@ class RepoAnalyzer:
                 "evidence": signals.get("potential_secrets_found", [])
             })
 
+        if signals.get("has_high_entropy_strings"):
+            findings.append({
+                "id": "SEC-002",
+                "category": "Security",
+                "severity": "Medium",
+                "title": "High-Entropy Strings",
+                "description": "Found random-looking strings (possible keys or tokens) that match no known secret format.",
+                "evidence": signals.get("high_entropy_strings", [])
+            })
+
+        if signals.get("has_vulnerable_dependencies"):
+            vulnerable = signals.get("vulnerable_dependencies", [])
+            severe = any(a["severity"] in ("CRITICAL", "HIGH") for d in vulnerable for a in d["advisories"])
+            findings.append({
+                "id": "SEC-003",
+                "category": "Security",
+                "severity": "High" if severe else "Medium",
+                "title": "Vulnerable Dependencies",
+                "description": "Dependencies match known advisories in the imported OSV database.",
+                "evidence": [describe_match(d) for d in vulnerable]
+            })
+
+        if signals.get("dependency_audit_incomplete"):
+            findings.append({
+                "id": "SEC-004",
+                "category": "Security",
+                "severity": "Medium",
+                "title": "Dependency Audit Incomplete",
+                "description": "Some manifests or lockfiles could not be read in full or parsed, so their dependencies were not checked for advisories.",
+                "evidence": [f"{f['path']} ({f['reason']})" for f in signals["dependency_audit_incomplete"]]
+            })
+
         if not signals.get("has_ci"):
              findings.append({
                 "id": "OPS-001",
@@ -100,8 +375,117 @@ class RepoAnalyzer:
                 "category": "Cloud",
                 "severity": "Low",
                 "title": "Dockerfile Best Practices",
-                "description": "Issues found in Dockerfile.",
-                "evidence": signals.get("dockerfile_issues", [])
+                "description": "Issues found in Dockerfiles.",
+                "evidence": [
+                    f"{i['issue']} in {r['path']}" + (f":{i['line']}" if i["line"] else "")
+                    for r in signals.get("dockerfiles", []) for i in r["issues"]
+                ] or signals.get("dockerfile_issues", [])
             })
             
         return findings
+
+
+class AsyncRepoAnalyzer(RepoAnalyzer):
+    """
+    Concurrent variant of RepoAnalyzer backed by AsyncGitHubClient.
+
+    Within one analysis, the files the detectors are certain to read are fetched
+    concurrently before detection runs; across analyses, `analyze_many` overlaps
+    whole repositories. Both share the client's concurrency limit.
+    """
+
+    def __init__(self, github_client: AsyncGitHubClient, fetch_mode: str = "contents",
+                 result_store: Optional[ResultStore] = None, incremental: bool = False):
+        super().__init__(github_client, fetch_mode, result_store, incremental)
+
+    async def analyze(self, repo_url: str, ref: Optional[str] = None,
+                      signals: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Orchestrates the analysis of a single repository. `signals` selects a
+        subset, as in RepoAnalyzer.analyze.
+        """
+        owner, repo = self.gh.parse_repo_url(repo_url)
+
+        metadata = await self.gh.get_repo_metadata(owner, repo)
+        target_ref = ref or metadata.get("default_branch", "main")
+        commit_sha = await self.gh.resolve_ref(owner, repo, target_ref)
+        stored = self._load_result(owner, repo, commit_sha)
+        if stored is not None:
+            return self._relabel_result(stored, repo_url, owner, repo, target_ref)
+        if signals is None:
+            baseline = self._baseline(owner, repo)
+            if baseline is not None:
+                files = await self.gh.compare(owner, repo, baseline[0]["commit_sha"], commit_sha)
+                if files is not None:
+                    return await self._analyze_changes_async(repo_url, owner, repo, target_ref, commit_sha, metadata,
+                                                             baseline, ChangeSet.from_files(files))
+        file_tree = await self.gh.list_tree(owner, repo, commit_sha)
+
+        detector = SignalDetector(file_tree, None)
+        needs_content = signals is None or bool(detector.read_plan(speculative=True, signals=signals))
+        archive = None
+        if self.fetch_mode == "archive" and needs_content:
+            archive = await self.gh.download_archive(owner, repo, commit_sha)
+            file_reader = self._archive_reader(archive, self.gh.sync.max_file_bytes)
+        else:
+            # Content-dependent reads (e.g. the IaC scan) stay on demand
+            def file_reader(path: str, max_bytes: Optional[int] = None) -> str:
+                return self.gh.sync.read_file(owner, repo, path, commit_sha, max_bytes=max_bytes)
+
+        content = self._content_cache(detector, file_reader, signals)
+        # Prefetched content lands in the content cache, so it counts against the same budget
+        if self.fetch_mode == "graphql" and needs_content:
+            planned = detector.planned_reads(speculative=True, signals=signals)
+            await self.gh.read_files_graphql(owner, repo, planned, commit_sha, store=content.store)
+        elif archive is None:
+            await content.prefetch_async(detector.read_plan(signals=signals),
+                                         self._async_reader(detector, owner, repo, commit_sha))
+        detect = detector.detect_all if signals is None else (lambda: detector.detect(signals))
+        try:
+            # Detection may still block on on-demand reads, so keep it off the event loop
+            detected = await asyncio.get_running_loop().run_in_executor(None, detect)
+        finally:
+            if archive is not None:
+                archive.close()
+        if archive is not None and signals is not None:
+            # Reads would fail once the archive is closed
+            detected.freeze()
+
+        if signals is not None:
+            return self._build_partial_result(repo_url, owner, repo, target_ref, commit_sha, metadata, detected, content.stats)
+        return self._build_result(repo_url, owner, repo, target_ref, commit_sha, metadata, detected, content.stats,
+                                  file_tree)
+
+    async def _analyze_changes_async(self, repo_url: str, owner: str, repo: str, target_ref: str, commit_sha: str,
+                                     metadata: Dict[str, Any], baseline: Tuple[Dict[str, Any], CompactTree],
+                                     changes: ChangeSet) -> Dict[str, Any]:
+        """Concurrent variant of RepoAnalyzer._analyze_changes."""
+        previous, listing = baseline
+        detector, rerun, plan = self._change_plan(listing, previous, changes)
+        self.gh.sync.remember_tree(owner, repo, commit_sha, detector.file_paths)
+        def file_reader(path: str, max_bytes: Optional[int] = None) -> str:
+            return self.gh.sync.read_file(owner, repo, path, commit_sha, max_bytes=max_bytes)
+
+        content = self._content_cache(detector, file_reader, [s for d in rerun for s in d.signals])
+        if self.fetch_mode == "graphql":
+            await self.gh.read_files_graphql(owner, repo, list(plan), commit_sha, store=content.store)
+        else:
+            await content.prefetch_async(plan, self._async_reader(detector, owner, repo, commit_sha))
+        signals = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: detector.update(previous["signals"], changes, rerun))
+        return self._build_result(repo_url, owner, repo, target_ref, commit_sha, metadata, signals, content.stats,
+                                  detector.file_paths, self._incremental_stats(previous, changes, rerun))
+
+    def _async_reader(self, detector: SignalDetector, owner: str, repo: str, ref: str):
+        """Awaitable reads through the client's concurrency limit, for ContentCache.prefetch_async."""
+        def read(path: str, max_bytes: Optional[int] = None):
+            return self.gh.read_file(owner, repo, path, ref, max_bytes=max_bytes)
+        return self._capped_reader(detector, read)
+
+    async def analyze_many(self, repo_urls: List[str], ref: Optional[str] = None,
+                           signals: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Analyzes repositories concurrently. Returns one entry per URL, in order:
+        the result dict, or the exception that analysis raised.
+        """
+        return await asyncio.gather(*(self.analyze(url, ref, signals) for url in repo_urls), return_exceptions=True)
@@ -0,0 +1,108 @@
+import io
+import logging
+import tarfile
+import tempfile
+import zipfile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Archives smaller than this stay in memory; larger ones spill to a temp file.
+DEFAULT_SPOOL_BYTES = 64 * 1024 * 1024
+# Same heuristic as git: a NUL byte in the first 8000 bytes marks a file as binary
+BINARY_SNIFF_BYTES = 8000
+
+
+def is_binary(raw: bytes) -> bool:
+    return b"\0" in raw[:BINARY_SNIFF_BYTES]
+
+
+class ArchiveIndex:
+    """
+    Serves file contents from a single downloaded repository archive.
+
+    File bodies are copied once into a spooled buffer (memory first, temp file
+    past `spool_bytes`) and looked up by path through an offset table, so reads
+    never touch the network.
+    """
+
+    def __init__(self, spool_bytes: int = DEFAULT_SPOOL_BYTES):
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+
+    @classmethod
+    def from_tarball(cls, stream: BinaryIO, spool_bytes: int = DEFAULT_SPOOL_BYTES) -> "ArchiveIndex":
+        """Builds an index from a (possibly gzipped) tar stream, reading it in a single pass."""
+        index = cls(spool_bytes)
+        with tarfile.open(fileobj=stream, mode="r|*") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                handle = tar.extractfile(member)
+                if handle is None:
+                    continue
+                index._add(member.name, handle)
+        return index
+
+    @classmethod
+    def from_zipball(cls, stream: BinaryIO, spool_bytes: int = DEFAULT_SPOOL_BYTES) -> "ArchiveIndex":
+        """Builds an index from a zip stream. Zip needs random access, so the download is spooled first."""
+        index = cls(spool_bytes)
+        with tempfile.SpooledTemporaryFile(max_size=spool_bytes) as raw:
+            for chunk in iter(lambda: stream.read(io.DEFAULT_BUFFER_SIZE * 16), b""):
+                raw.write(chunk)
+            raw.seek(0)
+            with zipfile.ZipFile(raw) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    with zf.open(info) as handle:
+                        index._add(info.filename, handle)
+        return index
+
+    def _add(self, archive_name: str, handle: BinaryIO):
+        # GitHub archives wrap everything in a single "<owner>-<repo>-<sha>/" directory
+        parts = archive_name.split("/", 1)
+        if len(parts) < 2 or not parts[1]:
+            return
+        path = parts[1]
+
+        self._buffer.seek(0, io.SEEK_END)
+        start = self._buffer.tell()
+        for chunk in iter(lambda: handle.read(io.DEFAULT_BUFFER_SIZE * 16), b""):
+            self._buffer.write(chunk)
+        self._offsets[path] = (start, self._buffer.tell() - start)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def paths(self) -> List[str]:
+        """Lists every file path held in the archive."""
+        return list(self._offsets)
+
+    def read_bytes(self, path: str, max_bytes: Optional[int] = None) -> bytes:
+        """Returns the raw bytes of a file (at most `max_bytes`), or b"" if it is not in the archive."""
+        entry = self._offsets.get(path)
+        if entry is None:
+            return b""
+        start, size = entry
+        self._buffer.seek(start)
+        return self._buffer.read(size if max_bytes is None else min(size, max_bytes))
+
+    def read(self, path: str, max_bytes: Optional[int] = None) -> str:
+        """Returns the decoded content of a file, mirroring GitHubClient.read_file: binary files read as ""."""
+        raw = self.read_bytes(path, max_bytes)
+        return "" if is_binary(raw) else raw.decode("utf-8", errors="replace")
+
+    def close(self):
+        self._buffer.close()
+        self._offsets.clear()
+
+    def __enter__(self) -> "ArchiveIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
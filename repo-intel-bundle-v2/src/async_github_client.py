@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, Dict, Any, Union
+
+from .archive_index import ArchiveIndex
+from .github_client import GitHubClient
+from .graphql_reader import GraphQLBlobReader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncGitHubClient:
+    """
+    asyncio front-end for GitHubClient with the same public surface.
+
+    Calls are dispatched to a worker pool sized to `max_concurrency` and gated
+    by a semaphore, so any number of coroutines can await reads while at most
+    `max_concurrency` requests are on the wire. All workers share one
+    `requests.Session` whose connection pool is sized to match.
+    """
+
+    def __init__(self, token: Union[str, List[str]], api_base_url: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, backend=None, **client_options):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        # `backend` swaps in another source with the GitHubClient surface (e.g. LocalGitClient);
+        # otherwise the remaining options (blob_cache, validator_cache, ...) configure a GitHubClient
+        self.sync = backend or GitHubClient(token=token, api_base_url=api_base_url, **client_options)
+
+        transport = getattr(self.sync, "transport", None)
+        if transport is not None:
+            # One keep-alive connection per worker
+            transport.resize(max_concurrency)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="github")
+        if hasattr(self.sync, "executor"):
+            # Tree walks fan out on the same workers, within max_concurrency
+            self.sync.executor = self._executor
+        # One semaphore per event loop: a semaphore binds to the first loop that waits on it, and a
+        # client may be reused across asyncio.run / run_sync calls. The shared pool still caps the total.
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            if loop not in self._semaphores:
+                self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return self._semaphores[loop]
+
+    async def _call(self, fn, *args):
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    def parse_repo_url(self, repo_url: str) -> Tuple[str, str]:
+        """Parses owner and repo name from a URL."""
+        return self.sync.parse_repo_url(repo_url)
+
+    async def get_repo_metadata(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Fetches repository metadata."""
+        return await self._call(self.sync.get_repo_metadata, owner, repo)
+
+    async def resolve_ref(self, owner: str, repo: str, ref: str) -> str:
+        """Resolves a ref to the commit SHA it currently points at."""
+        return await self._call(self.sync.resolve_ref, owner, repo, ref)
+
+    async def list_tree(self, owner: str, repo: str, ref: str) -> List[str]:
+        """Lists all files in the repository recursively."""
+        return await self._call(self.sync.list_tree, owner, repo, ref)
+
+    async def compare(self, owner: str, repo: str, base: str, head: str) -> Optional[List[Dict[str, Any]]]:
+        """Files changed from commit `base` to `head`, or None when the diff is not usable."""
+        return await self._call(self.sync.compare, owner, repo, base, head)
+
+    async def read_file(self, owner: str, repo: str, path: str, ref: str, max_bytes: Optional[int] = None) -> str:
+        """Reads the content of a file, or its first `max_bytes` bytes."""
+        return await self._call(self.sync.read_file, owner, repo, path, ref, max_bytes)
+
+    async def read_files(self, owner: str, repo: str, paths: List[str], ref: str) -> Dict[str, str]:
+        """Reads many files concurrently, bounded by the client's concurrency limit."""
+        contents = await asyncio.gather(*(self.read_file(owner, repo, p, ref) for p in paths))
+        return dict(zip(paths, contents))
+
+    async def read_files_graphql(self, owner: str, repo: str, paths: List[str], ref: str,
+                                 store: Optional[Callable[[Dict[str, str]], None]] = None) -> Dict[str, str]:
+        """
+        Reads many files through batched GraphQL queries, running the batches concurrently.
+        With `store`, each batch is handed to it as it arrives (e.g. ContentCache.store)
+        instead of being collected, and the result is empty.
+        """
+        reader = GraphQLBlobReader(self.sync)
+        contents = {}
+
+        async def fetch(batch: List[str]):
+            batch_contents = await self._call(reader.fetch_batch, owner, repo, batch, ref)
+            (store or contents.update)(batch_contents)
+        await asyncio.gather(*(fetch(batch) for batch in reader.batches(paths)))
+        return contents
+
+    def fetch_stats(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Cache outcomes for requests this client made on behalf of one repository."""
+        return self.sync.fetch_stats(owner, repo)
+
+    async def download_archive(self, owner: str, repo: str, ref: str, archive_format: str = "tarball") -> ArchiveIndex:
+        """Downloads and indexes the repository archive for a ref."""
+        return await self._call(self.sync.download_archive, owner, repo, ref, archive_format)
+
+    def http_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint latency and retry metrics for every request this client sent."""
+        transport = getattr(self.sync, "transport", None)
+        return transport.metrics.snapshot() if transport is not None else {}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if hasattr(self.sync, "transport"):
+            self.sync.transport.close()
+        elif hasattr(self.sync, "close"):
+            self.sync.close()
@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 512
+
+
+def cache_dir() -> str:
+    """
+    Root of the on-disk caches: REPO_INTEL_CACHE_DIR, or repo-intel under the
+    per-user cache directory ($XDG_CACHE_HOME, default ~/.cache).
+    """
+    directory = os.getenv("REPO_INTEL_CACHE_DIR")
+    if not directory:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        directory = os.path.join(base, "repo-intel")
+    return os.path.abspath(directory)
+
+
+def git_blob_sha(content: bytes) -> str:
+    """Computes the git object id of a blob (what the trees and contents APIs call `sha`)."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class BlobCache:
+    """
+    Persistent, content-addressed store for file contents keyed by git blob SHA.
+
+    A blob SHA identifies content, not a location, so entries never go stale and
+    are shared across refs, re-runs and forks. Total size is bounded by
+    `max_bytes`; the least recently used blobs are evicted first.
+    """
+
+    _shared: Dict[str, "BlobCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = os.path.join(directory, "blobs")
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        # sha -> size, oldest first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def from_env(cls) -> Optional["BlobCache"]:
+        """
+        Returns the process-wide cache configured by REPO_INTEL_CACHE_DIR and
+        BLOB_CACHE_MAX_MB, or None when BLOB_CACHE_MAX_MB is 0.
+        """
+        max_mb = int(os.getenv("BLOB_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+        if max_mb <= 0:
+            return None
+        directory = cache_dir()
+        with cls._shared_lock:
+            if directory not in cls._shared:
+                cls._shared[directory] = cls(directory, max_mb * 1024 * 1024)
+            return cls._shared[directory]
+
+    def _path(self, sha: str) -> str:
+        return os.path.join(self.directory, sha[:2], sha[2:])
+
+    def _load_index(self):
+        """Rebuilds the LRU order from disk, using modification time as last access."""
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, os.path.basename(root) + name, st.st_size))
+        for _, sha, size in sorted(found):
+            self._entries[sha] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Returns the cached blob, or None on a miss."""
+        with self._lock:
+            if sha not in self._entries:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(sha)
+            self.stats["hits"] += 1
+        path = self._path(sha)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            # Removed behind our back (e.g. another process evicted it)
+            with self._lock:
+                self._forget(sha)
+                self.stats["hits"] -= 1
+                self.stats["misses"] += 1
+            return None
+
+    def put(self, sha: str, data: bytes):
+        """Stores a blob. Content that does not hash to `sha` is ignored."""
+        if git_blob_sha(data) != sha:
+            logger.debug(f"Not caching blob {sha}: content does not match its SHA")
+            return
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if sha in self._entries:
+                self._entries.move_to_end(sha)
+                return
+
+        path = self._path(sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write blob {sha} to cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            if sha not in self._entries:
+                self._entries[sha] = len(data)
+                self._total_bytes += len(data)
+            self._evict()
+
+    def _forget(self, sha: str):
+        size = self._entries.pop(sha, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            sha, _ = next(iter(self._entries.items()))
+            self._forget(sha)
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(sha))
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Sequence
+
+from .path_classifier import PathIndex, classify_paths
+from .tree_cache import CompactTree
+
+# The compare API lists at most this many files; a diff that reaches it may be incomplete
+COMPARE_MAX_FILES = 300
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """
+    Paths that differ between two commits. A rename is a removal of the old
+    path plus an addition of the new one, so detectors see both names.
+    `blobs` holds what the diff reports about each added or modified path at
+    the new commit ({"sha", "size", "mode"}, None where unknown).
+    """
+    added: FrozenSet[str] = frozenset()
+    modified: FrozenSet[str] = frozenset()
+    removed: FrozenSet[str] = frozenset()
+    blobs: Mapping[str, Dict[str, Any]] = field(default_factory=dict, compare=False, hash=False)
+
+    @classmethod
+    def from_files(cls, files: Iterable[Dict[str, Any]]) -> "ChangeSet":
+        """
+        Builds a change set from compare API entries: {"filename", "status",
+        "previous_filename", "sha"}, plus "size" and "mode" where the source has them.
+        """
+        added, modified, removed = set(), set(), set()
+        blobs = {}
+        for entry in files:
+            status, path = entry["status"], entry["filename"]
+            if status in ("added", "copied"):
+                added.add(path)
+            elif status in ("modified", "changed"):
+                modified.add(path)
+            elif status == "removed":
+                removed.add(path)
+                continue
+            elif status == "renamed":
+                removed.add(entry["previous_filename"])
+                added.add(path)
+            else:
+                continue
+            blobs[path] = {key: entry.get(key) for key in ("sha", "size", "mode")}
+        return cls(frozenset(added), frozenset(modified), frozenset(removed), blobs)
+
+    @cached_property
+    def changed(self) -> List[str]:
+        """Every added, modified or removed path, sorted."""
+        return sorted(self.added | self.modified | self.removed)
+
+    @cached_property
+    def current(self) -> FrozenSet[str]:
+        """Changed paths that exist at the new commit."""
+        return self.added | self.modified
+
+    @cached_property
+    def paths(self) -> PathIndex:
+        # Tags depend only on the path, so classifying the diff alone tells which inputs it touches
+        return classify_paths(self.changed)
+
+    @cached_property
+    def listing(self) -> PathIndex:
+        """Classification of the paths added or removed, i.e. how the file listing changed."""
+        return classify_paths(sorted(self.added | self.removed))
+
+    @property
+    def listing_changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def apply(self, file_paths: Sequence[str]) -> CompactTree:
+        """
+        The listing at the new commit, given the listing at the old one. Unchanged paths
+        keep their SHA, size and mode; changed paths take what the diff reports, and a
+        modified file keeps its old mode when the diff has none. The compare API reports
+        no sizes, so those of changed files are unknown unless the source supplies them.
+        """
+        old = file_paths.entries() if isinstance(file_paths, CompactTree) else ({"path": p} for p in file_paths)
+        entries = {entry["path"]: entry for entry in old if entry["path"] not in self.removed}
+        for path in self.current:
+            blob = self.blobs.get(path, {})
+            entries[path] = {
+                "path": path,
+                "sha": blob.get("sha"),
+                "size": blob.get("size"),
+                "mode": blob.get("mode") or entries.get(path, {}).get("mode")
+            }
+        return CompactTree(entries[path] for path in sorted(entries))
+
+    def __len__(self) -> int:
+        return len(self.changed)
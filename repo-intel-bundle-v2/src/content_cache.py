@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 64
+
+
+def truncate_utf8(content: str, max_bytes: int) -> str:
+    """The text of the first `max_bytes` bytes of `content`, as a capped read would return it."""
+    return content.encode("utf-8")[:max_bytes].decode("utf-8", errors="replace")
+
+
+class ContentCache:
+    """
+    Per-analysis memo of file contents between the detectors and the fetch layer.
+
+    Each path is fetched at most once: later reads, including prefix reads
+    (`max_bytes`), are served from memory. Paths in `full_paths` are known to be
+    read whole later on, so a prefix read of one fetches the whole file up front
+    instead of fetching twice. Memory is bounded by `max_bytes`, least recently
+    used entries first.
+    """
+
+    def __init__(self, reader: Callable[..., str], max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+                 full_paths: Iterable[str] = ()):
+        self._reader = reader
+        self.max_bytes = max_bytes
+        self._full_paths = frozenset(full_paths)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+        # path -> (content, byte limit it was read with; None when read whole), oldest first
+        self._entries: "OrderedDict[str, Tuple[str, Optional[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, reader: Callable[..., str], full_paths: Iterable[str] = ()) -> "ContentCache":
+        """A cache bounded by CONTENT_CACHE_MAX_MB."""
+        max_mb = int(os.getenv("CONTENT_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+        return cls(reader, max_mb * 1024 * 1024, full_paths)
+
+    def __call__(self, path: str, max_bytes: Optional[int] = None) -> str:
+        cached = self._lookup(path, max_bytes)
+        if cached is not None:
+            return cached
+        limit = None if path in self._full_paths else max_bytes
+        content = self._reader(path, max_bytes=limit)
+        self._put(path, content, limit)
+        return content if limit == max_bytes else truncate_utf8(content, max_bytes)
+
+    def _lookup(self, path: str, max_bytes: Optional[int]) -> Optional[str]:
+        """The cached content for a read, or None (counted as a miss) when it must be fetched."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                content, limit = entry
+                if limit is None or (max_bytes is not None and max_bytes <= limit):
+                    self._entries.move_to_end(path)
+                    self.stats["hits"] += 1
+                    return content if max_bytes is None or max_bytes == limit else truncate_utf8(content, max_bytes)
+            self.stats["misses"] += 1
+        return None
+
+    def prefetch(self, plan: Dict[str, Optional[int]], max_workers: int = 8):
+        """Reads every planned path (path -> byte limit) concurrently, so later reads are hits."""
+        if not plan:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch") as pool:
+            list(pool.map(lambda item: self(item[0], max_bytes=item[1]), plan.items()))
+
+    async def prefetch_async(self, plan: Dict[str, Optional[int]],
+                             read: Callable[[str, Optional[int]], Awaitable[str]]):
+        """
+        Variant of prefetch for async fetchers: `read(path, max_bytes)` is awaited for every
+        planned path not already cached, and its content lands in the cache under the same
+        budget as any other read. Concurrency is left to whatever `read` awaits on.
+        """
+        async def fetch(path: str, max_bytes: Optional[int]):
+            if self._lookup(path, max_bytes) is None:
+                limit = None if path in self._full_paths else max_bytes
+                self._put(path, await read(path, limit), limit)
+        await asyncio.gather(*(fetch(path, max_bytes) for path, max_bytes in plan.items()))
+
+    def store(self, contents: Dict[str, str]):
+        """Caches whole-file contents fetched in bulk elsewhere (e.g. a GraphQL batch)."""
+        for path, content in contents.items():
+            self._put(path, content, None)
+
+    def _put(self, path: str, content: str, limit: Optional[int]):
+        # Characters approximate bytes closely enough for source text
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self.stats["bytes"] -= len(previous[0])
+            self._entries[path] = (content, limit)
+            self.stats["bytes"] += size
+            while self.stats["bytes"] > self.max_bytes:
+                evicted_path, (evicted, _) = self._entries.popitem(last=False)
+                self.stats["bytes"] -= len(evicted)
+                self.stats["evictions"] += 1
+                logger.debug(f"Evicted {evicted_path} from content cache ({len(evicted)} chars)")
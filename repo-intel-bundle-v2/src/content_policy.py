@@ -0,0 +1,122 @@
+import fnmatch
+import hashlib
+import os
+import re
+import threading
+from typing import Optional, Sequence
+
+DEFAULT_MAX_KB = 512
+# Binary and minified checks look at this much of the file, as git's binary check does
+SNIFF_CHARS = 8000
+# Generated-code markers are looked for in the header only
+HEADER_CHARS = 1024
+# Source lines average well under this; minified bundles and single-line data dumps do not
+MINIFIED_LINE_CHARS = 500
+SYMLINK_MODE = "120000"
+
+SKIP_TOO_LARGE = "too_large"
+SKIP_SYMLINK = "symlink"
+SKIP_GENERATED = "generated"
+SKIP_MINIFIED = "minified"
+SKIP_BINARY = "binary"
+
+# fnmatch globs ("*" also crosses "/") for build output, vendored code, compiled protobufs and lockfiles
+DEFAULT_GENERATED_PATHS = (
+    "*.min.js", "*.min.css", "*.map", "*.bundle.js", "*.chunk.js",
+    "dist/*", "*/dist/*", "build/*", "*/build/*", "node_modules/*", "*/node_modules/*", "vendor/*", "*/vendor/*",
+    "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.generated.*",
+    "*package-lock.json", "*npm-shrinkwrap.json", "*composer.lock", "*Pipfile.lock",
+)
+GENERATED_MARKER = re.compile(r"@generated|do not edit|code generated by|auto-?generated", re.IGNORECASE)
+
+
+class ContentPolicy:
+    """
+    Which files the content scanners (secrets, entropy, IaC) read.
+
+    A file is skipped before it is fetched when the listing says it is larger
+    than `max_bytes` or a symlink, or its path marks it as generated or
+    vendored. Otherwise it is read and skipped when its first SNIFF_CHARS look
+    binary or minified, or its header carries a generated-code marker. Skips
+    are reported by reason, so coverage can be weighed against cost.
+    """
+
+    _shared: Optional["ContentPolicy"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: Optional[int] = DEFAULT_MAX_KB * 1024,
+                 generated_paths: Sequence[str] = DEFAULT_GENERATED_PATHS):
+        self.max_bytes = max_bytes
+        self.generated_paths = tuple(generated_paths)
+        self.fingerprint = hashlib.sha256(repr((max_bytes, self.generated_paths)).encode()).hexdigest()
+        # Most globs are a suffix ("*.min.js") or a directory ("dist/*", "*/dist/*"), which are
+        # checked with string operations; one regex of the rest would cost microseconds per path
+        suffixes, top_dirs, dirs, patterns = [], set(), set(), []
+        for glob in self.generated_paths:
+            literal = glob.strip("*")
+            if any(c in literal for c in "*?["):
+                patterns.append(fnmatch.translate(glob))
+            elif glob == "*" + literal and "/" not in literal:
+                suffixes.append(literal)
+            elif glob == literal.rstrip("/") + "/*" and "/" not in literal.rstrip("/"):
+                top_dirs.add(literal.rstrip("/"))
+            elif glob == "*/" + literal.strip("/") + "/*" and "/" not in literal.strip("/"):
+                dirs.add(literal.strip("/"))
+            else:
+                patterns.append(fnmatch.translate(glob))
+        self._suffixes = tuple(suffixes)
+        self._top_dirs = frozenset(top_dirs)
+        self._dirs = frozenset(dirs)
+        self._generated = re.compile("|".join(patterns)) if patterns else None
+
+    @classmethod
+    def from_env(cls) -> Optional["ContentPolicy"]:
+        """
+        Returns the process-wide policy: files over CONTENT_MAX_FILE_KB (0 for no limit) are
+        skipped, and CONTENT_GENERATED_PATHS adds comma-separated globs to the generated paths.
+        None when CONTENT_POLICY is "false", so every candidate is scanned.
+        """
+        if os.getenv("CONTENT_POLICY", "true").lower() in ("0", "false", "no"):
+            return None
+        with cls._shared_lock:
+            if cls._shared is None:
+                max_kb = int(os.getenv("CONTENT_MAX_FILE_KB", str(DEFAULT_MAX_KB)))
+                extra = [p.strip() for p in os.getenv("CONTENT_GENERATED_PATHS", "").split(",") if p.strip()]
+                cls._shared = cls(max_kb * 1024 if max_kb > 0 else None, DEFAULT_GENERATED_PATHS + tuple(extra))
+            return cls._shared
+
+    def skip_path(self, path: str, size: Optional[int] = None, mode: Optional[str] = None) -> Optional[str]:
+        """Why to skip a file from its listing entry alone, or None to read it."""
+        if mode == SYMLINK_MODE:
+            return SKIP_SYMLINK
+        if size is not None and self.max_bytes is not None and size > self.max_bytes:
+            return SKIP_TOO_LARGE
+        if self.generated_path(path):
+            return SKIP_GENERATED
+        return None
+
+    def generated_path(self, path: str) -> bool:
+        """Whether the path matches one of the generated or vendored globs."""
+        if path.endswith(self._suffixes):
+            return True
+        if "/" in path:
+            directories = path.split("/")[:-1]
+            if directories[0] in self._top_dirs or not self._dirs.isdisjoint(directories[1:]):
+                return True
+        return self._generated is not None and self._generated.match(path) is not None
+
+    def skip_content(self, content: str) -> Optional[str]:
+        """Why to skip a file from its content, or None to scan it. Only its start is examined."""
+        if self.max_bytes is not None and len(content) > self.max_bytes:
+            # Listings without sizes are caught here instead
+            return SKIP_TOO_LARGE
+        head = content[:SNIFF_CHARS]
+        # Binary content decodes with NULs or, when not UTF-8, many replacement characters
+        if "\x00" in head or head.count("\ufffd") * 10 > len(head):
+            return SKIP_BINARY
+        if GENERATED_MARKER.search(head, 0, HEADER_CHARS):
+            return SKIP_GENERATED
+        # Short one-line files (a compact JSON credential, say) are still scanned
+        if len(head) >= 4 * MINIFIED_LINE_CHARS and len(head) / (head.count("\n") + 1) > MINIFIED_LINE_CHARS:
+            return SKIP_MINIFIED
+        return None
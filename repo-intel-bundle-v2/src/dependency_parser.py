@@ -0,0 +1,260 @@
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# OSV ecosystem names
+NPM = "npm"
+PYPI = "PyPI"
+GO = "Go"
+CARGO = "crates.io"
+
+# Per-file read cap for manifests and lockfiles, above GITHUB_MAX_FILE_KB: a lockfile cut
+# short cannot be parsed, and an audit of part of it would look clean
+MAX_FILE_BYTES = 64 * 1024 * 1024
+
+# An exact version, as opposed to a range such as ^1.2 or >=2
+EXACT_VERSION = re.compile(r"^v?\d+(?:\.\d+)*(?:[-+.]?[0-9A-Za-z.+-]*)?$")
+WILDCARD = re.compile(r"(?:^|\.)[xX*](?:\.|$)")
+PINNED = re.compile(r"^===?\s*([^\s,]+)$")
+REQUIREMENT = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*)$")
+YARN_VERSION = re.compile(r"^\s+version:?\s+\"?([^\"\s]+)\"?\s*$")
+TOML_STRING = re.compile(r"^(\w+)\s*=\s*\"([^\"]*)\"")
+CARGO_SECTION = re.compile(r"^\[(?:workspace\.|target\.[^\]]+\.)?(?:dev-|build-)?dependencies(?:\.([A-Za-z0-9_-]+))?\]$")
+
+
+@dataclass(frozen=True)
+class Dependency:
+    """One package a repository depends on. `version` is None when the file only gives a range."""
+    ecosystem: str
+    name: str
+    version: Optional[str]
+    path: str
+    direct: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def normalize_name(ecosystem: str, name: str) -> str:
+    """Canonical package name, as advisories are keyed: PyPI per PEP 503, crates case-insensitively."""
+    if ecosystem == PYPI:
+        return re.sub(r"[-_.]+", "-", name).lower()
+    if ecosystem == CARGO:
+        return name.lower()
+    return name
+
+
+def _exact(spec: str) -> Optional[str]:
+    spec = spec.strip().lstrip("=").strip()
+    return spec if EXACT_VERSION.match(spec) and not WILDCARD.search(spec) else None
+
+
+def _npm_lock(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    data = json.loads(content)
+    found = []
+    if "packages" in data:
+        # lockfileVersion 2+: keyed by install path, e.g. node_modules/a/node_modules/b
+        for location, entry in data["packages"].items():
+            # Other locations are the project itself or its workspace members
+            if "node_modules/" not in location or entry.get("link") or "version" not in entry:
+                continue
+            name = entry.get("name") or location.rpartition("node_modules/")[2]
+            found.append((NPM, name, _npm_version(entry["version"]), False))
+        return found
+
+    def walk(dependencies: Mapping[str, Any]):
+        for name, entry in dependencies.items():
+            if "version" in entry:
+                found.append((NPM, name, _npm_version(entry["version"]), False))
+            walk(entry.get("dependencies", {}))
+
+    walk(data.get("dependencies", {}))
+    return found
+
+
+def _npm_version(version: str) -> Optional[str]:
+    # Aliases (npm:other@1.2.3) resolve to a version; git, file and tarball sources do not
+    if version.startswith("npm:"):
+        version = version.rpartition("@")[2]
+    return _exact(version)
+
+
+def _yarn_lock(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    found = []
+    name = None
+    for line in content.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        if not line[0].isspace():
+            # Header: "name@range, name@other-range:" (quoted in yarn 1 when scoped)
+            spec = line.rstrip(":").split(",")[0].strip().strip('"')
+            at = spec.find("@", 1)
+            local = any(protocol in spec for protocol in ("@workspace:", "@link:", "@portal:", "@file:"))
+            name = spec[:at] if at > 0 and not local else None
+            continue
+        match = YARN_VERSION.match(line)
+        if name is not None and match:
+            found.append((NPM, name, _exact(match.group(1)), False))
+            name = None
+    return found
+
+
+def _package_json(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    data = json.loads(content)
+    return [
+        (NPM, name, _exact(spec) if isinstance(spec, str) else None, True)
+        for section in ("dependencies", "devDependencies", "optionalDependencies")
+        for name, spec in (data.get(section) or {}).items()
+    ]
+
+
+def _requirements(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    found = []
+    for line in content.splitlines():
+        line = line.split(" #")[0].split(";")[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        match = REQUIREMENT.match(line)
+        if not match:
+            continue
+        pinned = PINNED.match(match.group(2).strip())
+        found.append((PYPI, match.group(1), _exact(pinned.group(1)) if pinned else None, True))
+    return found
+
+
+def _pipfile_lock(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    data = json.loads(content)
+    return [
+        (PYPI, name, _exact(entry.get("version", "")), False)
+        for section in ("default", "develop")
+        for name, entry in (data.get(section) or {}).items()
+    ]
+
+
+def _toml_packages(content: str) -> List[Dict[str, str]]:
+    """The string fields of each [[package]] table (poetry.lock, Cargo.lock)."""
+    packages = []
+    current = None
+    for line in content.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            current = {} if line == "[[package]]" else None
+            if current is not None:
+                packages.append(current)
+            continue
+        match = TOML_STRING.match(line)
+        if current is not None and match:
+            current[match.group(1)] = match.group(2)
+    return packages
+
+
+def _poetry_lock(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    return [(PYPI, p["name"], _exact(p.get("version", "")), False) for p in _toml_packages(content) if "name" in p]
+
+
+def _cargo_lock(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    # Workspace members have no source; only registry crates can have advisories
+    return [(CARGO, p["name"], _exact(p.get("version", "")), False)
+            for p in _toml_packages(content) if "name" in p and p.get("source", "").startswith("registry+")]
+
+
+def _cargo_toml(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    found = []
+    in_dependencies = False
+    for line in content.splitlines():
+        line = line.split("#")[0].strip()
+        if line.startswith("["):
+            match = CARGO_SECTION.match(line)
+            in_dependencies = match is not None and match.group(1) is None
+            if match and match.group(1):
+                found.append((CARGO, match.group(1), None, True))  # [dependencies.name] table
+            continue
+        if in_dependencies and "=" in line:
+            name, _, spec = line.partition("=")
+            spec = spec.strip()
+            if spec.startswith("{"):
+                version = re.search(r"version\s*=\s*\"([^\"]*)\"", spec)
+                spec = version.group(1) if version else ""
+            spec = spec.strip('"')
+            # A bare Cargo requirement ("1.2") means ^1.2; only "=1.2.3" pins
+            found.append((CARGO, name.strip().strip('"'), _exact(spec) if spec.startswith("=") else None, True))
+    return found
+
+
+def _go_mod(content: str) -> List[Tuple[str, str, Optional[str], bool]]:
+    found = []
+    in_block = False
+    for line in content.splitlines():
+        line = line.strip()
+        if line.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and line.startswith(")"):
+            in_block = False
+            continue
+        if line.startswith("require "):
+            line = line[len("require "):]
+        elif not in_block:
+            continue
+        words = line.split()
+        if len(words) >= 2:
+            # Minimal version selection makes each listed version the one built; OSV omits the "v"
+            found.append((GO, words[0], _exact(words[1].lstrip("v")), "// indirect" not in line))
+    return found
+
+
+PARSERS: Dict[str, Callable[[str], List[Tuple[str, str, Optional[str], bool]]]] = {
+    "package-lock.json": _npm_lock,
+    "yarn.lock": _yarn_lock,
+    "package.json": _package_json,
+    "requirements.txt": _requirements,
+    "Pipfile.lock": _pipfile_lock,
+    "poetry.lock": _poetry_lock,
+    "Cargo.lock": _cargo_lock,
+    "Cargo.toml": _cargo_toml,
+    "go.mod": _go_mod,
+}
+
+
+def supports(path: str) -> bool:
+    return path.rpartition("/")[2] in PARSERS
+
+
+def parse_file(path: str, content: str) -> Optional[List[Dependency]]:
+    """Dependencies declared in one manifest or lockfile, or None when the file cannot be parsed."""
+    parser = PARSERS.get(path.rpartition("/")[2])
+    if parser is None:
+        return []
+    try:
+        entries = parser(content)
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.warning(f"Could not parse {path}: {e}")
+        return None
+    return [Dependency(ecosystem, normalize_name(ecosystem, name), version, path, direct)
+            for ecosystem, name, version, direct in entries if name]
+
+
+def merge(dependencies: Iterable[Dependency]) -> List[Dependency]:
+    """
+    One normalized list from every parsed file. Resolved versions (lockfiles,
+    pins) are kept; a package is direct if any manifest names it; a range from
+    a manifest is kept only for packages no lockfile resolves.
+    """
+    dependencies = list(dependencies)
+    direct = {(d.ecosystem, d.name) for d in dependencies if d.direct}
+    resolved: Dict[Tuple[str, str, str], Dependency] = {}
+    for d in dependencies:
+        if d.version is not None:
+            resolved.setdefault((d.ecosystem, d.name, d.version), d)
+    names = {(ecosystem, name) for ecosystem, name, _ in resolved}
+    unresolved: Dict[Tuple[str, str], Dependency] = {}
+    for d in dependencies:
+        if d.version is None and (d.ecosystem, d.name) not in names:
+            unresolved.setdefault((d.ecosystem, d.name), d)
+    merged = [Dependency(d.ecosystem, d.name, d.version, d.path, (d.ecosystem, d.name) in direct)
+              for d in [*resolved.values(), *unresolved.values()]]
+    return sorted(merged, key=lambda d: (d.ecosystem, d.name, d.version or ""))
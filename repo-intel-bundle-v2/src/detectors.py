@@ -0,0 +1,600 @@
+import fnmatch
+import importlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import dependency_parser, dockerfile
+from .change_set import ChangeSet
+from .content_policy import ContentPolicy
+from .dockerfile import ParseCache
+from .path_classifier import PathIndex, classify_paths
+from .entropy_scanner import EntropyScanner
+from .osv_index import VulnerabilityIndex
+from .secret_scanner import MAX_HITS_PER_FILE, SecretScanner
+
+logger = logging.getLogger(__name__)
+
+# Kubernetes manifests declare apiVersion at the top, so only a prefix is needed to recognise one
+K8S_SNIFF_BYTES = 8 * 1024
+
+
+@dataclass(frozen=True)
+class Content:
+    """
+    Files whose content a detector reads: those carrying a classifier `tag`
+    (see path_classifier) and/or matching a `glob`, minus those matching `exclude`.
+
+    `max_bytes` asks for a prefix only, `first` for only the first N matches in
+    tree order. `speculative` marks reads that depend on earlier content (e.g.
+    stopping at the first match); they are prefetched only by bulk fetchers.
+    `cap` raises the reader's per-file cap (GITHUB_MAX_FILE_KB) for whole-file
+    reads of these files, for formats that are useless when cut short.
+    """
+    tag: Optional[str] = None
+    glob: Optional[str] = None
+    exclude: Optional[str] = None
+    max_bytes: Optional[int] = None
+    first: Optional[int] = None
+    speculative: bool = False
+    cap: Optional[int] = None
+
+    def select(self, paths: PathIndex, file_paths: Sequence[str]) -> List[str]:
+        selected = paths.paths(self.tag) if self.tag is not None else file_paths
+        if self.glob is not None:
+            match = _glob(self.glob)
+            selected = [p for p in selected if match(p)]
+        if self.exclude is not None:
+            excluded = _glob(self.exclude)
+            selected = [p for p in selected if not excluded(p)]
+        return list(selected[:self.first] if self.first is not None else selected)
+
+
+def _glob(pattern: str) -> Callable[[str], Any]:
+    # fnmatch semantics ("*" also crosses "/"), compiled once per selection instead of per path
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+class DetectionContext:
+    """
+    What a detector sees: the file listing, its classification, and a reader for
+    declared inputs. Content scanners go through `scannable` and `read_for_scan`,
+    which apply the content policy (see content_policy) and remember what it skipped.
+    """
+
+    def __init__(self, file_paths: Sequence[str], paths: PathIndex, read: Callable[..., str],
+                 policy: Optional[ContentPolicy] = None):
+        self.file_paths = file_paths
+        self.paths = paths
+        # read(path, max_bytes=None) returns the file's text, or only its first max_bytes bytes
+        self.read = read
+        self.policy = policy
+        self._selected: Dict[Content, List[str]] = {}
+        self._scannable: Dict[Content, List[str]] = {}
+        self._listing_skips: Dict[str, Optional[Dict[str, Any]]] = {}
+        # path -> {"path", "reason", "size"} when skipped, None when scanned
+        self._skips: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def files(self, content: Content) -> List[str]:
+        """Paths selected by one of the detector's declared inputs."""
+        if content not in self._selected:
+            self._selected[content] = content.select(self.paths, self.file_paths)
+        return self._selected[content]
+
+    def scannable(self, content: Content) -> List[str]:
+        """Paths of an input that the content policy does not rule out from path, size and mode alone."""
+        if self.policy is None:
+            return self.files(content)
+        if content not in self._scannable:
+            self._scannable[content] = [p for p in self.files(content) if self._listing_skip(p) is None]
+        return self._scannable[content]
+
+    def skipped(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Why the content policy skips a file, as {"path", "reason", "size"}, or None
+        when it is scanned. Files the listing does not rule out are read to decide.
+        """
+        if self.policy is None:
+            return None
+        if path not in self._skips:
+            skip = self._listing_skip(path)
+            if skip is None:
+                content = self.read(path)
+                reason = self.policy.skip_content(content) if content else None
+                if reason is not None:
+                    skip = {"path": path, "reason": reason, "size": self.paths.size(path)}
+            self._skips[path] = skip
+        return self._skips[path]
+
+    def read_for_scan(self, path: str) -> Optional[str]:
+        """The file's text for a content scanner, or None when the policy skips it."""
+        return None if self.skipped(path) is not None else self.read(path)
+
+    def _listing_skip(self, path: str) -> Optional[Dict[str, Any]]:
+        if path not in self._listing_skips:
+            size = self.paths.size(path)
+            reason = self.policy.skip_path(path, size, self.paths.mode(path))
+            self._listing_skips[path] = {"path": path, "reason": reason, "size": size} if reason is not None else None
+        return self._listing_skips[path]
+
+    def blob_sha(self, path: str) -> Optional[str]:
+        """Blob SHA of a path when the listing carries SHAs (a CompactTree), else None."""
+        sha = getattr(self.file_paths, "sha", None)
+        return sha(path) if sha is not None else None
+
+
+class Detector:
+    """
+    A signal detector plugin.
+
+    Subclasses set a unique `name`, the signal keys they produce in `signals`,
+    and the file contents they read in `inputs` (path-only detectors declare
+    none). The engine fetches every declared input up front, then calls
+    `detect`, whose reads are served from that prefetched content.
+
+    `tags` lists the classifier tags whose presence in the listing the detector
+    checks; None means any file added or removed may change its output. Together
+    with `inputs` they decide when incremental re-analysis has to run it again.
+
+    Bump `version` when a detector's output changes for the same input, so stored
+    results computed by the old code are not reused.
+    """
+
+    name: str = ""
+    version: int = 1
+    signals: Tuple[str, ...] = ()
+    inputs: Tuple[Content, ...] = ()
+    tags: Optional[Tuple[str, ...]] = None
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def reads(self, ctx: DetectionContext, content: Content) -> List[str]:
+        """Paths of a declared input that `detect` will actually read, for prefetch planning."""
+        return ctx.files(content)
+
+    def affected_by(self, changes: ChangeSet) -> bool:
+        """Whether `changes` may alter this detector's output."""
+        if any(content.select(changes.paths, changes.changed) for content in self.inputs):
+            return True
+        if not changes.listing_changed:
+            return False
+        return self.tags is None or any(changes.listing.has(tag) for tag in self.tags)
+
+    def update(self, ctx: DetectionContext, previous: Dict[str, Any], changes: ChangeSet) -> Optional[Dict[str, Any]]:
+        """
+        This detector's signals at the new commit, from its `previous` signals and
+        only the changed files. None (the default) means run `detect` from scratch.
+        """
+        return None
+
+
+class HygieneDetector(Detector):
+    name = "hygiene"
+    signals = ("has_readme", "manifests_found", "has_manifest")
+    tags = ("readme", "manifest")
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        manifests = list(ctx.paths.paths("manifest"))
+        return {
+            "has_readme": ctx.paths.has("readme"),
+            "manifests_found": manifests,
+            "has_manifest": len(manifests) > 0
+        }
+
+
+class CIDetector(Detector):
+    name = "ci"
+    signals = ("has_ci", "ci_providers")
+    PROVIDERS = (
+        ("GitHub Actions", "github_actions"),
+        ("Jenkins", "jenkins"),
+        ("GitLab CI", "gitlab_ci"),
+        ("CircleCI", "circleci"),
+        ("Travis CI", "travis"),
+    )
+    tags = tuple(tag for _, tag in PROVIDERS)
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        providers = [provider for provider, tag in self.PROVIDERS if ctx.paths.has(tag)]
+        return {
+            "has_ci": len(providers) > 0,
+            "ci_providers": providers
+        }
+
+
+class TestsDetector(Detector):
+    name = "tests"
+    signals = ("has_tests",)
+    tags = ("test_dir", "test_file")
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        # Simple heuristic: folder names or file patterns
+        return {
+            "has_tests": ctx.paths.has("test_dir") or ctx.paths.has("test_file")
+        }
+
+
+class DockerDetector(Detector):
+    name = "docker"
+    signals = ("has_docker", "dockerfile_issues", "dockerfiles")
+    DOCKERFILE = Content(tag="dockerfile")
+    inputs = (DOCKERFILE,)
+    tags = ("dockerfile",)
+
+    def __init__(self, cache: Optional[ParseCache] = None, max_workers: int = 8):
+        self.cache = cache
+        self.max_workers = max_workers
+
+    def _cache(self) -> ParseCache:
+        return self.cache or ParseCache.shared()
+
+    def reads(self, ctx: DetectionContext, content: Content) -> List[str]:
+        # Dockerfiles whose blob was parsed before are not read again
+        cache = self._cache()
+        return [p for p in ctx.files(content) if ctx.blob_sha(p) is None or ctx.blob_sha(p) not in cache]
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        dockerfiles = ctx.files(self.DOCKERFILE)
+        return self._summarize(dockerfiles, self._parse(ctx, dockerfiles))
+
+    def update(self, ctx: DetectionContext, previous: Dict[str, Any], changes: ChangeSet) -> Optional[Dict[str, Any]]:
+        stale = changes.modified | changes.removed
+        reports = {r["path"]: r for r in previous["dockerfiles"] if r["path"] not in stale}
+        changed = [p for p in self.DOCKERFILE.select(changes.paths, changes.changed) if p in changes.current]
+        reports.update((r["path"], r) for r in self._parse(ctx, changed))
+        return self._summarize(ctx.files(self.DOCKERFILE), sorted(reports.values(), key=lambda r: r["path"]))
+
+    def _parse(self, ctx: DetectionContext, paths: Sequence[str]) -> List[Dict[str, Any]]:
+        """Per-file reports for `paths`, read and parsed concurrently, in the order given."""
+        cache = self._cache()
+
+        def report(path: str) -> Optional[Dict[str, Any]]:
+            sha = ctx.blob_sha(path)
+            parsed = cache.get(sha) if sha is not None else None
+            if parsed is None:
+                content = ctx.read(path)
+                if not content:
+                    return None
+                parsed = dockerfile.analyze(content)
+                if sha is not None:
+                    cache.put(sha, parsed)
+            return {"path": path, **parsed}
+
+        if len(paths) <= 1:
+            reports = [report(p) for p in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths)), thread_name_prefix="dockerfile") as pool:
+                reports = list(pool.map(report, paths))
+        return [r for r in reports if r is not None]
+
+    @staticmethod
+    def _summarize(dockerfiles: Sequence[str], reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Each kind of issue counts once however many Dockerfiles have it; `dockerfiles` says where
+        issues = list(dict.fromkeys(i["issue"] for r in reports for i in r["issues"]))
+        return {
+            "has_docker": len(dockerfiles) > 0,
+            "dockerfile_issues": issues,
+            "dockerfiles": reports
+        }
+
+
+class DependenciesDetector(Detector):
+    name = "dependencies"
+    signals = ("has_lockfile",)
+    tags = ("lockfile",)
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        return {
+            "has_lockfile": ctx.paths.has("lockfile")
+        }
+
+
+class DependencyAuditDetector(Detector):
+    name = "dependency_audit"
+    signals = ("dependencies", "vulnerable_dependencies", "has_vulnerable_dependencies", "vulnerability_index",
+               "dependency_audit_incomplete")
+    MANIFESTS = Content(tag="manifest", cap=dependency_parser.MAX_FILE_BYTES)
+    LOCKFILES = Content(tag="lockfile", cap=dependency_parser.MAX_FILE_BYTES)
+    inputs = (MANIFESTS, LOCKFILES)
+    tags = ("manifest", "lockfile")
+
+    def __init__(self, index: Optional[VulnerabilityIndex] = None):
+        self.index = index
+
+    def reads(self, ctx: DetectionContext, content: Content) -> List[str]:
+        # Only formats with a parser (not pom.xml, go.sum, ...)
+        return [p for p in ctx.files(content) if dependency_parser.supports(p)]
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        parsed = []
+        # Files whose dependencies are missing or may be: never reported as a clean audit
+        incomplete = []
+        for content in self.inputs:
+            for path in self.reads(ctx, content):
+                text = ctx.read(path)
+                if not text:
+                    continue
+                size = ctx.paths.size(path)
+                read = len(text.encode("utf-8"))
+                # Without a size from the listing, a read that filled the cap is assumed cut short
+                if read < size if size is not None else read >= content.cap:
+                    logger.warning(f"Read {read} of {size or 'unknown'} bytes of {path}; its dependencies are incomplete")
+                    incomplete.append({"path": path, "reason": "truncated", "size": size})
+                    continue
+                dependencies = dependency_parser.parse_file(path, text)
+                if dependencies is None:
+                    incomplete.append({"path": path, "reason": "unparsed", "size": size})
+                    continue
+                parsed.extend(dependencies)
+        dependencies = [d.to_dict() for d in dependency_parser.merge(parsed)]
+        # Without an imported advisory dump the dependency list is still recorded, for matching later
+        index = self.index or VulnerabilityIndex.from_env()
+        vulnerable = index.match(dependencies) if index is not None else []
+        return {
+            "dependencies": dependencies,
+            "vulnerable_dependencies": vulnerable,
+            "has_vulnerable_dependencies": len(vulnerable) > 0,
+            "vulnerability_index": index.describe() if index is not None else None,
+            "dependency_audit_incomplete": incomplete
+        }
+
+
+class IaCDetector(Detector):
+    name = "iac"
+    signals = ("has_iac", "iac_providers")
+    # Read until the first manifest is found, so these are only prefetched speculatively
+    K8S = Content(tag="yaml", exclude="*github/workflows*", max_bytes=K8S_SNIFF_BYTES, speculative=True)
+    inputs = (K8S,)
+    tags = ("terraform", "helm_chart")
+
+    def reads(self, ctx: DetectionContext, content: Content) -> List[str]:
+        return ctx.scannable(content)
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        has_terraform = ctx.paths.has("terraform")
+        has_k8s = any("apiVersion:" in ctx.read(f, max_bytes=K8S_SNIFF_BYTES) for f in ctx.scannable(self.K8S))
+        has_helm = ctx.paths.has("helm_chart")
+
+        return {
+            "has_iac": has_terraform or has_k8s or has_helm,
+            "iac_providers": [
+                p for p, found in [
+                    ("Terraform", has_terraform),
+                    ("Kubernetes", has_k8s),
+                    ("Helm", has_helm)
+                ] if found
+            ]
+        }
+
+
+class FileScanDetector(Detector):
+    """
+    Base for detectors that scan each candidate file on its own. Hits carry
+    their path, so incremental re-analysis rescans only changed files and keeps
+    the previous hits of the rest. Subclasses name the signals holding the hits
+    and the count of files scanned, and implement `scan_file` and `summarize`.
+    """
+
+    # Every config or code file the scanners are meant for
+    CANDIDATES = Content(tag="secret_scan")
+    inputs = (CANDIDATES,)
+    tags = ()
+    hits_signal: str = ""
+    files_signal: str = ""
+
+    def scan_file(self, path: str, content: str) -> List[Dict[str, Any]]:
+        """Hits in one file, each with at least "line" and "offset" ("path" is added)."""
+        raise NotImplementedError
+
+    def summarize(self, hits: List[Dict[str, Any]], scanned: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def reads(self, ctx: DetectionContext, content: Content) -> List[str]:
+        return ctx.scannable(content)
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        hits, scanned = self._scan(ctx, ctx.scannable(self.CANDIDATES))
+        return self.summarize(hits, scanned)
+
+    def update(self, ctx: DetectionContext, previous: Dict[str, Any], changes: ChangeSet) -> Optional[Dict[str, Any]]:
+        stale = changes.modified | changes.removed
+        kept = [hit for hit in previous[self.hits_signal] if hit["path"] not in stale]
+        rescan = [p for p in self.CANDIDATES.select(changes.paths, changes.changed) if p in changes.current]
+        hits, scanned = self._scan(ctx, rescan)
+        # Old versions of stale candidates are assumed to have been scanned unless the policy skipped them
+        skipped = {s["path"] for s in previous.get("skipped_files", ())}
+        dropped = len([p for p in self.CANDIDATES.select(classify_paths(sorted(stale)), sorted(stale))
+                       if self.counts_path(p) and p not in skipped])
+        hits = sorted(kept + hits, key=lambda hit: (hit["path"], hit["offset"]))
+        return self.summarize(hits, max(0, previous[self.files_signal] - dropped) + scanned)
+
+    def counts_path(self, path: str) -> bool:
+        """Whether a candidate at `path` is scanned at all; skipped files are not counted."""
+        return True
+
+    def _scan(self, ctx: DetectionContext, paths: Sequence[str]) -> Tuple[List[Dict[str, Any]], int]:
+        hits = []
+        scanned = 0
+        for f in paths:
+            if not self.counts_path(f): continue
+            content = ctx.read_for_scan(f)
+            if not content: continue
+            scanned += 1
+            hits.extend({"path": f, **hit} for hit in self.scan_file(f, content))
+        return hits, scanned
+
+
+class SecretsDetector(FileScanDetector):
+    name = "secrets"
+    signals = ("potential_secrets_found", "secret_hits", "secret_scan_files", "has_secrets_smell")
+    hits_signal = "secret_hits"
+    files_signal = "secret_scan_files"
+
+    def __init__(self, scanner: Optional[SecretScanner] = None):
+        self.scanner = scanner
+
+    def scan_file(self, path: str, content: str) -> List[Dict[str, Any]]:
+        # Pattern-based, so expect false positives (test fixtures, docs)
+        return (self.scanner or SecretScanner.from_env()).scan(content, limit=MAX_HITS_PER_FILE)
+
+    def summarize(self, hits: List[Dict[str, Any]], scanned: int) -> Dict[str, Any]:
+        # Each rule is reported once per file, at its first line
+        found_secrets = []
+        seen = set()
+        for hit in hits:
+            if (hit["path"], hit["rule"]) not in seen:
+                seen.add((hit["path"], hit["rule"]))
+                found_secrets.append(f"{hit['rule']} in {hit['path']}:{hit['line']}")
+
+        return {
+            "potential_secrets_found": found_secrets,
+            "secret_hits": hits,
+            "secret_scan_files": scanned,
+            "has_secrets_smell": len(found_secrets) > 0
+        }
+
+
+class EntropyDetector(FileScanDetector):
+    name = "entropy"
+    signals = ("high_entropy_strings", "entropy_hits", "entropy_scan_files", "has_high_entropy_strings")
+    hits_signal = "entropy_hits"
+    files_signal = "entropy_scan_files"
+
+    def __init__(self, scanner: Optional[EntropyScanner] = None):
+        self.scanner = scanner
+
+    def _scanner(self) -> EntropyScanner:
+        return self.scanner or EntropyScanner.from_env()
+
+    def counts_path(self, path: str) -> bool:
+        # Lockfiles, minified bundles and the like are random by construction
+        return not self._scanner().allows_path(path)
+
+    def scan_file(self, path: str, content: str) -> List[Dict[str, Any]]:
+        return self._scanner().scan(content, limit=MAX_HITS_PER_FILE)
+
+    def summarize(self, hits: List[Dict[str, Any]], scanned: int) -> Dict[str, Any]:
+        # Evidence names the alphabet and entropy, never the string itself
+        return {
+            "high_entropy_strings": [f"{h['kind']} string in {h['path']}:{h['line']} (entropy {h['entropy']})" for h in hits],
+            "entropy_hits": hits,
+            "entropy_scan_files": scanned,
+            "has_high_entropy_strings": len(hits) > 0
+        }
+
+
+class CoverageDetector(Detector):
+    """Which content-scan candidates the content policy skipped, and why."""
+
+    name = "coverage"
+    signals = ("skipped_files", "scan_coverage")
+    CANDIDATES = FileScanDetector.CANDIDATES
+    inputs = (CANDIDATES,)
+    tags = ()
+
+    def reads(self, ctx: DetectionContext, content: Content) -> List[str]:
+        return ctx.scannable(content)
+
+    def detect(self, ctx: DetectionContext) -> Dict[str, Any]:
+        candidates = ctx.files(self.CANDIDATES)
+        return self._summarize(ctx, candidates, [s for s in map(ctx.skipped, candidates) if s is not None])
+
+    def update(self, ctx: DetectionContext, previous: Dict[str, Any], changes: ChangeSet) -> Optional[Dict[str, Any]]:
+        stale = changes.modified | changes.removed
+        kept = [s for s in previous["skipped_files"] if s["path"] not in stale]
+        rechecked = [p for p in self.CANDIDATES.select(changes.paths, changes.changed) if p in changes.current]
+        skipped = kept + [s for s in map(ctx.skipped, rechecked) if s is not None]
+        order = {path: i for i, path in enumerate(ctx.files(self.CANDIDATES))}
+        skipped.sort(key=lambda s: order.get(s["path"], len(order)))
+        return self._summarize(ctx, ctx.files(self.CANDIDATES), skipped)
+
+    @staticmethod
+    def _summarize(ctx: DetectionContext, candidates: Sequence[str], skipped: List[Dict[str, Any]]) -> Dict[str, Any]:
+        reasons: Dict[str, int] = {}
+        for skip in skipped:
+            reasons[skip["reason"]] = reasons.get(skip["reason"], 0) + 1
+        return {
+            "skipped_files": skipped,
+            "scan_coverage": {
+                "candidates": len(candidates),
+                "skipped": len(skipped),
+                # Known from the listing only; files skipped on content were fetched anyway
+                "skipped_bytes": sum(s["size"] for s in skipped if s["size"] is not None),
+                "by_reason": reasons,
+                "max_file_bytes": ctx.policy.max_bytes if ctx.policy is not None else None
+            }
+        }
+
+
+BUILTIN_DETECTORS: Tuple[Callable[[], Detector], ...] = (
+    HygieneDetector, CIDetector, TestsDetector, DockerDetector, DependenciesDetector, DependencyAuditDetector,
+    IaCDetector, SecretsDetector, EntropyDetector, CoverageDetector,
+)
+
+
+class DetectorRegistry:
+    """
+    Ordered set of detectors that SignalDetector runs.
+
+    The process-wide registry holds the built-in detectors plus any named in
+    SIGNAL_DETECTORS; third-party code can also `register` its own.
+    """
+
+    _instance: Optional["DetectorRegistry"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, detectors: Sequence[Detector] = ()):
+        self._detectors: Dict[str, Detector] = {}
+        self._lock = threading.Lock()
+        for detector in detectors:
+            self.register(detector)
+
+    @classmethod
+    def shared(cls) -> "DetectorRegistry":
+        """
+        Returns the process-wide registry: the built-in detectors, then those named in
+        SIGNAL_DETECTORS as comma-separated "module:attribute" references to a Detector
+        subclass or factory.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                registry = cls([factory() for factory in BUILTIN_DETECTORS])
+                for reference in filter(None, (r.strip() for r in os.getenv("SIGNAL_DETECTORS", "").split(","))):
+                    registry.register(load_detector(reference))
+                cls._instance = registry
+            return cls._instance
+
+    def register(self, detector: Detector, replace: bool = False):
+        """Adds a detector; `replace` swaps out an existing one with the same name in place."""
+        if not detector.name:
+            raise ValueError(f"{type(detector).__name__} has no name")
+        with self._lock:
+            if detector.name in self._detectors and not replace:
+                raise ValueError(f"Detector '{detector.name}' is already registered")
+            self._detectors[detector.name] = detector
+        logger.debug(f"Registered detector {detector.name}")
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._detectors.pop(name, None)
+
+    def detectors(self) -> List[Detector]:
+        with self._lock:
+            return list(self._detectors.values())
+
+
+def load_detector(reference: str) -> Detector:
+    """Instantiates a detector from a "module:attribute" reference."""
+    module_name, _, attribute = reference.partition(":")
+    if not attribute:
+        raise ValueError(f"Detector reference '{reference}' must look like 'module:attribute'")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    detector = factory()
+    if not isinstance(detector, Detector):
+        raise ValueError(f"'{reference}' did not produce a Detector")
+    return detector
@@ -0,0 +1,227 @@
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ENTRIES = 4096
+
+ISSUE_ROOT = "Runs as root user"
+ISSUE_LATEST = "Uses 'latest' tag"
+ISSUE_HEALTHCHECK = "Missing HEALTHCHECK"
+ISSUE_PIPE_SHELL = "Piping curl/wget to shell"
+
+DIRECTIVE = re.compile(r"^#\s*(\w+)\s*=\s*(\S+)\s*$")
+VARIABLE = re.compile(r"\$(?:\{(\w+)(?::?[-+][^}]*)?\}|(\w+))")
+PIPE_TO_SHELL = re.compile(r"\b(?:curl|wget)\b[^|;&]*\|\s*(?:sudo\s+)?(?:ba|da|z)?sh\b")
+ROOT_USERS = ("root", "0")
+
+
+@dataclass
+class Instruction:
+    keyword: str  # upper-cased
+    args: str
+    line: int  # first line of the instruction, 1-based
+
+
+@dataclass
+class Stage:
+    """One FROM ... section. `image` is None when the stage builds on an earlier stage or scratch."""
+    base: str
+    line: int
+    name: Optional[str] = None
+    image: Optional[str] = None
+    tag: Optional[str] = None
+    digest: Optional[str] = None
+    user: Optional[str] = None
+    user_line: Optional[int] = None
+    healthcheck: bool = False
+    instructions: List[Instruction] = field(default_factory=list)
+
+
+def instructions(content: str) -> List[Instruction]:
+    """
+    Splits a Dockerfile into instructions: joins continuation lines (honouring an
+    `# escape=` directive), drops comments and blank lines, and skips heredoc bodies.
+    """
+    escape = "\\"
+    lines = content.splitlines()
+    result: List[Instruction] = []
+    i = 0
+    # Parser directives are only recognised before the first instruction or ordinary comment
+    while i < len(lines):
+        match = DIRECTIVE.match(lines[i])
+        if not match:
+            break
+        if match.group(1).lower() == "escape":
+            escape = match.group(2)[:1] or escape
+        i += 1
+
+    while i < len(lines):
+        start = i
+        stripped = lines[i].strip()
+        i += 1
+        if not stripped or stripped.startswith("#"):
+            continue
+        parts = [stripped]
+        continued = stripped.endswith(escape)
+        while continued and i < len(lines):
+            following = lines[i].strip()
+            i += 1
+            if not following or following.startswith("#"):
+                continue  # Blank lines and comments inside a continuation are dropped, as docker does
+            parts[-1] = parts[-1][:-len(escape)]
+            parts.append(following)
+            continued = following.endswith(escape)
+        if continued:
+            parts[-1] = parts[-1][:-len(escape)]
+        text = " ".join(p for p in parts if p)
+        keyword, _, args = text.partition(" ")
+        # Heredocs (RUN <<EOF ... EOF) carry their body on the following lines
+        for marker in re.findall(r"(?<!<)<<-?(?!<)[\"']?(\w+)[\"']?", args):
+            body = []
+            while i < len(lines) and lines[i].strip() != marker:
+                body.append(lines[i])
+                i += 1
+            i += 1
+            args = args + "\n" + "\n".join(body)
+        result.append(Instruction(keyword.upper(), args.strip(), start + 1))
+    return result
+
+
+def _substitute(value: str, variables: Dict[str, str]) -> str:
+    return VARIABLE.sub(lambda m: variables.get(m.group(1) or m.group(2), ""), value)
+
+
+def _split_image(reference: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """image[:tag][@digest] -> (image, tag, digest); a registry port is not a tag."""
+    reference, _, digest = reference.partition("@")
+    name, _, tag = reference.rpartition(":")
+    if not name or "/" in tag:
+        return reference, None, digest or None
+    return name, tag, digest or None
+
+
+def parse(content: str) -> List[Stage]:
+    """Parses a Dockerfile into its build stages."""
+    stages: List[Stage] = []
+    by_name: Dict[str, Stage] = {}
+    # ARGs declared before the first FROM may be used in FROM lines
+    global_args: Dict[str, str] = {}
+    for instruction in instructions(content):
+        if instruction.keyword == "ARG" and not stages:
+            name, _, default = instruction.args.partition("=")
+            global_args[name.strip()] = default.strip().strip("\"'")
+            continue
+        if instruction.keyword == "FROM":
+            words = [w for w in instruction.args.split() if not w.startswith("--")]
+            if not words:
+                continue
+            base = _substitute(words[0], global_args)
+            stage = Stage(base=base, line=instruction.line)
+            if len(words) >= 3 and words[1].lower() == "as":
+                stage.name = words[2].lower()
+            parent = by_name.get(base.lower()) or (stages[int(base)] if base.isdigit() and int(base) < len(stages) else None)
+            if parent is not None:
+                # Building on an earlier stage inherits its user and healthcheck
+                stage.user, stage.user_line, stage.healthcheck = parent.user, parent.user_line, parent.healthcheck
+            elif base.lower() != "scratch":
+                stage.image, stage.tag, stage.digest = _split_image(base)
+            stages.append(stage)
+            if stage.name:
+                by_name[stage.name] = stage
+            continue
+        if not stages:
+            continue
+        stage = stages[-1]
+        stage.instructions.append(instruction)
+        if instruction.keyword == "USER":
+            stage.user, stage.user_line = instruction.args.split()[0] if instruction.args else None, instruction.line
+        elif instruction.keyword == "HEALTHCHECK":
+            stage.healthcheck = instruction.args.split()[:1] != ["NONE"]
+    return stages
+
+
+def analyze(content: str) -> Dict[str, Any]:
+    """
+    Structured summary of one Dockerfile: its stages and base images, the
+    final stage's effective USER, and issues with the line they were found on.
+    """
+    stages = parse(content)
+    issues: List[Dict[str, Any]] = []
+    if stages:
+        final = stages[-1]
+        if final.user is not None and final.user.split(":")[0] in ROOT_USERS:
+            issues.append({"issue": ISSUE_ROOT, "line": final.user_line})
+        for stage in stages:
+            # An untagged image is implicitly :latest; a digest pins it either way
+            if stage.image and not stage.digest and stage.tag in (None, "latest"):
+                issues.append({"issue": ISSUE_LATEST, "line": stage.line})
+                break
+        if not final.healthcheck:
+            issues.append({"issue": ISSUE_HEALTHCHECK, "line": None})
+        for stage in stages:
+            piped = next((i for i in stage.instructions if i.keyword == "RUN" and PIPE_TO_SHELL.search(i.args)), None)
+            if piped is not None:
+                issues.append({"issue": ISSUE_PIPE_SHELL, "line": piped.line})
+                break
+    return {
+        "stages": [
+            {"name": s.name, "base": s.base, "image": s.image, "tag": s.tag, "digest": s.digest, "line": s.line}
+            for s in stages
+        ],
+        "final_user": stages[-1].user if stages else None,
+        "issues": issues,
+    }
+
+
+class ParseCache:
+    """
+    Process-wide memo of `analyze()` results keyed by blob SHA. A blob's content
+    never changes, so a Dockerfile shared across refs, forks or repeated analyses
+    is parsed, and read, once. Bounded by entry count, least recently used first.
+    """
+
+    _instance: Optional["ParseCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def shared(cls) -> "ParseCache":
+        """Returns the process-wide cache, sized by DOCKERFILE_CACHE_ENTRIES."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(int(os.getenv("DOCKERFILE_CACHE_ENTRIES", str(DEFAULT_CACHE_ENTRIES))))
+            return cls._instance
+
+    def __contains__(self, sha: str) -> bool:
+        with self._lock:
+            return sha in self._entries
+
+    def get(self, sha: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            parsed = self._entries.get(sha)
+            if parsed is not None:
+                self._entries.move_to_end(sha)
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+            return parsed
+
+    def put(self, sha: str, parsed: Dict[str, Any]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[sha] = parsed
+            self._entries.move_to_end(sha)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
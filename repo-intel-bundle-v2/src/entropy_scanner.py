@@ -0,0 +1,253 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: pip install "repo-intel-bundle-v2[entropy]"
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Characters of base64 (standard and URL-safe) and hex secrets; candidates are maximal runs of them
+LETTERS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+DIGITS = b"0123456789"
+TOKEN_CHARS = LETTERS + DIGITS + b"+/=_-"
+HEX_CHARS = DIGITS + b"abcdefABCDEF"
+MIN_TOKEN_CHARS = 20
+# Shorter hex runs are content hashes in filenames and cache keys, and 16 symbols cannot score much
+# higher at 20 characters whether random or not; hex keys and tokens are 32 characters or more
+MIN_HEX_CHARS = 32
+# Long runs (embedded blobs, minified code) are scored by their most random window, not as a whole
+WINDOW_CHARS = 64
+WINDOW_STRIDE = 32
+# Bits per character; hex tops out at 4, so it gets a lower bar
+BASE64_THRESHOLD = 4.5
+HEX_THRESHOLD = 3.0
+# Character class bits, OR-ed over each run by the NumPy scan
+DIGIT, LETTER, NON_HEX = 1, 2, 4
+# Windows histogrammed per NumPy batch (batch x len(TOKEN_CHARS) counts)
+BATCH_WINDOWS = 4096
+
+DEFAULT_ALLOWED_TOKENS = (
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$",  # UUID
+    r"^(?:sha1|sha256|sha384|sha512)-",  # Subresource integrity
+    r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$",  # Git object IDs: pinned actions (uses: owner/repo@<sha>), refs, lockfiles
+)
+# Lines mentioning these (lowercase) carry checksums, not credentials. Not "hash": password_hash
+# and hashed_secret lines hold exactly what the scanner is for
+DEFAULT_ALLOWED_CONTEXT = ("integrity", "checksum", "sha1", "sha256", "sha512", "digest", "pragma: allowlist secret")
+DEFAULT_ALLOWED_PATHS = ("*package-lock.json", "*yarn.lock", "*.min.js", "*.map", "*.svg")
+
+
+@dataclass(frozen=True)
+class Allowlist:
+    """Candidates to drop: whole tokens matching `tokens`, lines containing `context` words, files matching `paths`."""
+    tokens: Tuple[str, ...] = DEFAULT_ALLOWED_TOKENS
+    context: Tuple[str, ...] = DEFAULT_ALLOWED_CONTEXT
+    paths: Tuple[str, ...] = DEFAULT_ALLOWED_PATHS
+
+    def extend(self, other: "Allowlist") -> "Allowlist":
+        return Allowlist(self.tokens + other.tokens, self.context + other.context, self.paths + other.paths)
+
+
+def shannon_entropy(token: bytes) -> float:
+    """Bits per character of `token`."""
+    length = len(token)
+    return -sum(n / length * math.log2(n / length) for n in Counter(token).values())
+
+
+def _table(chars: bytes) -> List[bool]:
+    table = [False] * 256
+    for c in chars:
+        table[c] = True
+    return table
+
+
+class EntropyScanner:
+    """
+    Finds high-entropy strings (random-looking tokens such as API keys) in text.
+
+    Candidates are maximal runs of base64/hex characters of at least
+    MIN_TOKEN_CHARS (MIN_HEX_CHARS for pure hex). Each is scored by Shannon entropy, longer runs by their
+    best WINDOW_CHARS window, and kept when it clears the threshold for its
+    alphabet, mixes letters and digits, and is not allowlisted. With NumPy the
+    whole file is processed as one byte array: runs are found with vector ops
+    and every window's byte histogram is a row of one bincount per batch.
+    Without NumPy the same rules run in pure Python, much more slowly.
+    """
+
+    _shared: Dict[str, "EntropyScanner"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, allowlist: Allowlist = Allowlist(), use_numpy: Optional[bool] = None):
+        self.allowlist = allowlist
+        # Identifies the allowlist, so results filtered by another one are not reused
+        self.fingerprint = hashlib.sha256(repr(allowlist).encode()).hexdigest()
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise ValueError("NumPy is not installed")
+        self._allowed_tokens = re.compile("|".join(f"(?:{p})" for p in allowlist.tokens)) if allowlist.tokens else None
+        self._allowed_paths = re.compile("|".join(fnmatch.translate(p) for p in allowlist.paths)) if allowlist.paths else None
+        self._allowed_context = (re.compile(b"|".join(re.escape(w.lower().encode()) for w in allowlist.context))
+                                 if allowlist.context else None)
+        self._token_run = re.compile(rb"[%s]{%d,}" % (re.escape(TOKEN_CHARS), MIN_TOKEN_CHARS))
+        self._is_hex = _table(HEX_CHARS)
+        self._is_digit = _table(DIGITS)
+        self._is_alpha = _table(LETTERS)
+        if self.use_numpy:
+            self._np_token = np.array(_table(TOKEN_CHARS))
+            self._np_symbol = np.zeros(256, dtype=np.int64)
+            self._np_symbol[np.frombuffer(TOKEN_CHARS, dtype=np.uint8)] = np.arange(len(TOKEN_CHARS))
+            self._np_class = np.array([DIGIT * d | LETTER * a | NON_HEX * (not h)
+                                       for d, a, h in zip(self._is_digit, self._is_alpha, self._is_hex)], dtype=np.uint8)
+            # c * log2(c) for every count a window can hold
+            counts = np.arange(WINDOW_CHARS + 1, dtype=np.float64)
+            self._np_clog = counts * np.log2(np.maximum(counts, 1))
+
+    @classmethod
+    def from_env(cls) -> "EntropyScanner":
+        """
+        Returns the process-wide scanner with the default allowlist plus any in the JSON
+        file at ENTROPY_ALLOWLIST_FILE: {"tokens": [regex], "context": [word], "paths": [glob]}.
+        """
+        path = os.getenv("ENTROPY_ALLOWLIST_FILE", "")
+        with cls._shared_lock:
+            if path not in cls._shared:
+                allowlist = Allowlist().extend(load_allowlist(path)) if path else Allowlist()
+                if np is None:
+                    logger.warning("NumPy not installed; entropy scanning falls back to pure Python")
+                cls._shared[path] = cls(allowlist)
+            return cls._shared[path]
+
+    @property
+    def backend(self) -> str:
+        return "numpy" if self.use_numpy else "python"
+
+    def allows_path(self, path: str) -> bool:
+        return self._allowed_paths is not None and self._allowed_paths.match(path) is not None
+
+    def scan(self, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        High-entropy strings in `text` in order of offset, at most `limit`, as
+        {"rule", "kind", "entropy", "line", "offset", "length"}. The token itself is not returned.
+        """
+        data = text.encode("utf-8", errors="replace")
+        candidates = self._candidates_numpy(data) if self.use_numpy else self._candidates_python(data)
+        hits = []
+        lowered = data.lower()
+        ascii_only = len(data) == len(text)
+        # Line and character offsets are carried forward from hit to hit, so the text is walked once
+        line, offset, position = 1, 0, 0
+        for start, end, entropy, kind in candidates:
+            if self._allowed_tokens is not None and self._allowed_tokens.search(data[start:end].decode("ascii")):
+                continue
+            line_end = lowered.find(b"\n", end)
+            context = lowered[lowered.rfind(b"\n", 0, start) + 1:line_end if line_end != -1 else len(data)]
+            if self._allowed_context is not None and self._allowed_context.search(context):
+                continue
+            line += data.count(b"\n", position, start)
+            # Tokens are ASCII, so `start` never splits a multi-byte character
+            offset = start if ascii_only else offset + len(data[position:start].decode("utf-8", errors="replace"))
+            position = start
+            hits.append({
+                "rule": "High Entropy String",
+                "kind": kind,
+                "entropy": round(entropy, 2),
+                "line": line,
+                "offset": offset,
+                "length": end - start,
+            })
+            if limit is not None and len(hits) >= limit:
+                break
+        return hits
+
+    def _candidates_python(self, data: bytes) -> Iterable[Tuple[int, int, float, str]]:
+        for match in self._token_run.finditer(data):
+            token = match.group()
+            if not (any(self._is_digit[c] for c in token) and any(self._is_alpha[c] for c in token)):
+                continue
+            entropy = max(shannon_entropy(token[i:i + WINDOW_CHARS]) for i in _window_starts(len(token)))
+            kind = "hex" if all(self._is_hex[c] for c in token) else "base64"
+            if kind == "hex" and len(token) < MIN_HEX_CHARS:
+                continue
+            if entropy >= (HEX_THRESHOLD if kind == "hex" else BASE64_THRESHOLD):
+                yield match.start(), match.end(), entropy, kind
+
+    def _candidates_numpy(self, data: bytes) -> List[Tuple[int, int, float, str]]:
+        if len(data) < MIN_TOKEN_CHARS:
+            return []
+        codes = np.frombuffer(data, dtype=np.uint8)
+        # Run boundaries are where the token mask flips
+        mask = np.zeros(len(codes) + 2, dtype=np.int8)
+        mask[1:-1] = self._np_token[codes]
+        edges = np.flatnonzero(np.diff(mask))
+        starts, ends = edges[0::2], edges[1::2]
+        keep = (ends - starts) >= MIN_TOKEN_CHARS
+        starts, ends = starts[keep], ends[keep]
+        if not len(starts):
+            return []
+
+        # Character classes of every run in one pass: OR the class bits over [start, end) segments
+        classes = np.zeros(len(codes) + 1, dtype=np.uint8)
+        classes[:-1] = self._np_class[codes]
+        bits = np.bitwise_or.reduceat(classes, np.stack([starts, ends], axis=1).ravel())[0::2]
+        mixed = (bits & (DIGIT | LETTER)) == (DIGIT | LETTER)
+        starts, ends, bits = starts[mixed], ends[mixed], bits[mixed]
+        if not len(starts):
+            return []
+        is_hex = (bits & NON_HEX) == 0
+
+        # Windows: one per short run, overlapping WINDOW_CHARS windows across long ones (the last flush with the end)
+        lengths = ends - starts
+        windows = 1 + -(-np.maximum(lengths - WINDOW_CHARS, 0) // WINDOW_STRIDE)
+        run_of = np.repeat(np.arange(len(starts)), windows)
+        first = np.concatenate(([0], np.cumsum(windows)[:-1]))
+        k = np.arange(len(run_of)) - np.repeat(first, windows)
+        window_start = starts[run_of] + np.minimum(k * WINDOW_STRIDE, np.maximum(lengths[run_of] - WINDOW_CHARS, 0))
+        window_len = np.minimum(lengths[run_of], WINDOW_CHARS)
+
+        entropy = np.empty(len(run_of))
+        offsets = np.arange(WINDOW_CHARS)
+        symbols = len(TOKEN_CHARS)
+        for b in range(0, len(run_of), BATCH_WINDOWS):
+            ws, wl = window_start[b:b + BATCH_WINDOWS], window_len[b:b + BATCH_WINDOWS]
+            rows = len(ws)
+            inside = offsets[None, :] < wl[:, None]
+            positions = np.minimum(ws[:, None] + offsets[None, :], len(codes) - 1)
+            # Windows hold only token characters, so histograms need one column per token character, not 256
+            keys = (np.arange(rows)[:, None] * symbols + self._np_symbol[codes[positions]])[inside]
+            counts = np.bincount(keys, minlength=rows * symbols).reshape(rows, symbols)
+            # H = log2(L) - sum(c * log2(c)) / L, with c * log2(c) looked up rather than computed per cell
+            entropy[b:b + rows] = np.log2(wl) - self._np_clog[counts].sum(axis=1) / wl
+
+        best = np.maximum.reduceat(entropy, first)
+        flagged = np.flatnonzero((best >= np.where(is_hex, HEX_THRESHOLD, BASE64_THRESHOLD))
+                                 & (~is_hex | (lengths >= MIN_HEX_CHARS)))
+        return [(start, end, entropy, "hex" if hexish else "base64") for start, end, entropy, hexish
+                in zip(starts[flagged].tolist(), ends[flagged].tolist(), best[flagged].tolist(), is_hex[flagged].tolist())]
+
+
+def _window_starts(length: int) -> Sequence[int]:
+    if length <= WINDOW_CHARS:
+        return [0]
+    last = length - WINDOW_CHARS
+    return sorted(set(range(0, last, WINDOW_STRIDE)) | {last})
+
+
+def load_allowlist(path: str) -> Allowlist:
+    """Reads a user-supplied allowlist from {"tokens": [regex], "context": [word], "paths": [glob]}."""
+    with open(path) as f:
+        entry = json.load(f)
+    allowlist = Allowlist(tuple(entry.get("tokens", ())), tuple(w.lower() for w in entry.get("context", ())),
+                          tuple(entry.get("paths", ())))
+    logger.info(f"Loaded entropy allowlist from {path}")
+    return allowlist
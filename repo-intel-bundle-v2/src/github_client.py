@@ -1,26 +1,89 @@
-import base64
 import logging
 import os
+import re
+import threading
+import weakref
 import requests
-from typing import List, Optional, Tuple, Dict, Any
+from collections import Counter
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple, Dict, Any, Union
 from urllib.parse import urlparse
 
+from .archive_index import ArchiveIndex, is_binary
+from .blob_cache import BlobCache
+from .change_set import COMPARE_MAX_FILES
+from .http_cache import ValidatorCache
+from .rate_limit import RateLimitScheduler
+from .token_pool import TokenPool
+from .single_flight import NegativeCache, SingleFlight
+from .tree_cache import CompactTree, TreeCache
+from .transport import Transport, endpoint_name
+from .tree_walker import TreeWalker
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# File contents come back as the raw bytes instead of base64 inside a JSON envelope
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+# Default per-file read cap; larger files are read as a prefix of this size
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+COMMIT_SHA = re.compile(r"^[0-9a-f]{40}$")
+
+def max_file_bytes_from_env() -> Optional[int]:
+    """Per-file read cap from GITHUB_MAX_FILE_KB (0 for no cap); local mirrors apply it too."""
+    max_file_kb = int(os.getenv("GITHUB_MAX_FILE_KB", DEFAULT_MAX_FILE_BYTES // 1024))
+    return max_file_kb * 1024 if max_file_kb > 0 else None
+
+def client_options_from_env() -> Dict[str, Any]:
+    """GitHubClient keyword arguments configured through environment variables."""
+    return {
+        "blob_cache": BlobCache.from_env(),
+        "validator_cache": ValidatorCache.from_env(),
+        "max_file_bytes": max_file_bytes_from_env()
+    }
+
 class GitHubClient:
-    def __init__(self, token: str, api_base_url: Optional[str] = None):
-        self.token = token
+    def __init__(self, token: Union[str, List[str]], api_base_url: Optional[str] = None, blob_cache: Optional[BlobCache] = None,
+                 validator_cache: Optional[ValidatorCache] = None, scheduler: Optional[RateLimitScheduler] = None,
+                 max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES, tree_cache: Optional[TreeCache] = None,
+                 transport: Optional[Transport] = None, executor: Optional[Executor] = None):
         self.api_base_url = api_base_url or "https://api.github.com"
         # Ensure no trailing slash
         self.api_base_url = self.api_base_url.rstrip("/")
-        self.session = requests.Session()
+        # Timeouts, retries with backoff, pool sizing and per-endpoint metrics
+        self.transport = transport or Transport.from_env()
+        self.session = self.transport.session
+        # Authorization is set per request by the token pool
         self.session.headers.update({
-            "Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github.v3+json",
             "X-GitHub-Api-Version": "2022-11-28"
         })
-        self._tree_cache = {}
+        # Trees of commit SHAs are shared by every client in the process
+        self.tree_cache = tree_cache or TreeCache.shared()
+        # owner/repo@ref -> trees this client handed out, while callers still hold them; their
+        # blob SHAs and sizes let reads hit the blob cache and know up front when a file exceeds its cap
+        self._trees: "weakref.WeakValueDictionary[str, CompactTree]" = weakref.WeakValueDictionary()
+        # Upper bound on bytes read per file (None for no cap)
+        self.max_file_bytes = max_file_bytes
+        # Worker pool for fan-out such as tree walks; AsyncGitHubClient shares its own so its limit holds
+        self.executor = executor
+        self.blob_cache = blob_cache
+        # ETag / Last-Modified store for conditional metadata and tree requests
+        self.validator_cache = validator_cache
+        # Shared by every client in the process unless one is injected
+        self.scheduler = scheduler or RateLimitScheduler.shared()
+        # One token or several (a list or comma-separated string); requests go to the one with most quota left
+        self.tokens = TokenPool(token, self.scheduler)
+        self.token = self.tokens.tokens[0]
+        # Identical concurrent requests share one HTTP call, across every client in the process;
+        # keys are scoped by API and credentials because responses vary by token
+        self.flight = SingleFlight.shared()
+        self.negative_cache = NegativeCache.shared()
+        self._scope = f"{self.api_base_url}|{','.join(self.tokens.credentials)}"
+        # owner/repo -> Counter of cache outcomes, reported per analysis by fetch_stats()
+        self._stats: Dict[str, Counter] = {}
+        self._stats_lock = threading.Lock()
 
     def _get_api_url(self, repo_url: str) -> str:
         """Determines the API base URL for a given repo URL."""
@@ -38,57 +101,340 @@ class GitHubClient:
             raise ValueError(f"Invalid repository URL: {repo_url}")
         return path_parts[-2], path_parts[-1].replace(".git", "")
 
+    def _request(self, url: str, method: str = "GET", resource: str = "core", max_attempts: int = 5, **kwargs) -> requests.Response:
+        """
+        Sends a request through the shared rate-limit scheduler. Rate-limited responses
+        (primary or secondary) pause every worker on this token and are retried.
+        """
+        headers = kwargs.pop("headers", None) or {}
+        for attempt in range(1, max_attempts + 1):
+            token = self.tokens.select(resource)
+            credential = self.tokens.credential(token)
+            self.scheduler.acquire(credential, resource)
+            response = self.transport.send(method, url, headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs)
+            wait = self.scheduler.record(credential, response, resource)
+            if wait is None or attempt == max_attempts:
+                return response
+            # Retry on whichever token recovers first (another pool member, or this one after its pause)
+            if not self.scheduler.should_retry(self.tokens.credential(self.tokens.select(resource)), resource):
+                return response
+            self.transport.metrics.retry(endpoint_name(url), "rate_limit")
+            response.close()
+        return response
+
+    def _get_json(self, url: str, owner: str, repo: str, immutable: bool = False) -> Any:
+        """
+        GETs a JSON resource, revalidating a stored copy with If-None-Match /
+        If-Modified-Since when one exists. A 304 replays the stored body.
+        Stored copies of `immutable` resources (addressed by SHA) are served without a request.
+        """
+        if self.validator_cache is None:
+            response = self._request(url)
+            response.raise_for_status()
+            return response.json()
+
+        key = ValidatorCache.key(url, ",".join(self.tokens.credentials))
+        cached = self.validator_cache.get(key)
+        if cached and immutable:
+            self._count(owner, repo, "immutable_hits")
+            return cached["body"]
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self._request(url, headers=headers)
+        if response.status_code == 304 and cached:
+            self._count(owner, repo, "not_modified")
+            return cached["body"]
+        response.raise_for_status()
+
+        body = response.json()
+        self._count(owner, repo, "modified")
+        self.validator_cache.put(key, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return body
+
+    @property
+    def graphql_url(self) -> str:
+        """GraphQL endpoint matching the REST base (GHES serves it at /api/graphql, not /api/v3/graphql)."""
+        if self.api_base_url.endswith("/api/v3"):
+            return self.api_base_url[:-len("/v3")] + "/graphql"
+        return f"{self.api_base_url}/graphql"
+
+    def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs a GraphQL query and returns its `data`. Raises if the response carries errors and no data."""
+        # Queries are read-only, so the transport may retry them like GETs
+        response = self._request(self.graphql_url, method="POST", resource="graphql", retry=True,
+                                 json={"query": query, "variables": variables})
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(e.get("message", "") for e in payload["errors"])
+            if not payload.get("data"):
+                raise RuntimeError(f"GraphQL query failed: {messages}")
+            logger.warning(f"GraphQL query returned partial data: {messages}")
+        return payload.get("data") or {}
+
+    def _coalesced(self, owner: str, repo: str, key: str, fn) -> Any:
+        """Runs `fn`, or waits for an identical call already in flight and shares its result."""
+        result, shared = self.flight.do(f"{self._scope}|{key}", fn)
+        if shared:
+            self._count(owner, repo, "coalesced")
+        return result
+
     def get_repo_metadata(self, owner: str, repo: str) -> Dict[str, Any]:
         """Fetches repository metadata."""
         url = f"{self.api_base_url}/repos/{owner}/{repo}"
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.json()
+        return self._coalesced(owner, repo, url, lambda: self._get_json(url, owner, repo))
 
-    def list_tree(self, owner: str, repo: str, ref: str) -> List[str]:
-        """Lists all files in the repository recursively."""
+    def resolve_ref(self, owner: str, repo: str, ref: str) -> str:
+        """Resolves a branch, tag or short SHA to the full commit SHA it currently points at."""
+        if COMMIT_SHA.match(ref):
+            return ref
+        # The sha media type returns just the commit SHA instead of the full commit
+        # https://docs.github.com/en/rest/commits/commits?apiVersion=2022-11-28#get-a-commit
+        url = f"{self.api_base_url}/repos/{owner}/{repo}/commits/{ref}"
+
+        def resolve() -> str:
+            response = self._request(url, headers={"Accept": "application/vnd.github.sha"})
+            response.raise_for_status()
+            return response.text.strip()
+
+        try:
+            return self._coalesced(owner, repo, url, resolve)
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Failed to resolve ref {ref} in {owner}/{repo}: {e}")
+            raise
+
+    def list_tree(self, owner: str, repo: str, ref: str) -> CompactTree:
+        """
+        Lists all files in the repository recursively, as a list-like CompactTree.
+        Listings of a commit SHA are kept in the process-wide tree cache.
+        """
         cache_key = f"{owner}/{repo}@{ref}"
-        if cache_key in self._tree_cache:
-            return self._tree_cache[cache_key]
+        immutable = bool(COMMIT_SHA.match(ref))
+        tree = self._trees.get(cache_key) or (self.tree_cache.get(cache_key) if immutable else None)
+        if tree is not None:
+            self._count(owner, repo, "tree_cache_hits")
+            self._trees[cache_key] = tree
+            return tree
 
-        # Use the git tree API for recursive listing
-        # https://docs.github.com/en/rest/git/trees?apiVersion=2022-11-28#get-a-tree
-        url = f"{self.api_base_url}/repos/{owner}/{repo}/git/trees/{ref}?recursive=1"
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("truncated", False):
-                logger.warning(f"Tree for {owner}/{repo}@{ref} is truncated.")
-
-            files = [item["path"] for item in data.get("tree", []) if item["type"] == "blob"]
-            self._tree_cache[cache_key] = files
-            return files
+            tree, complete = self._coalesced(owner, repo, f"tree:{cache_key}",
+                                             lambda: self._fetch_tree(owner, repo, ref, immutable))
         except requests.exceptions.HTTPError as e:
             logger.error(f"Failed to list tree for {owner}/{repo}@{ref}: {e}")
             raise
+        if immutable and complete:
+            self.tree_cache.put(cache_key, tree)
+        self._trees[cache_key] = tree
+        return tree
 
-    def read_file(self, owner: str, repo: str, path: str, ref: str) -> str:
-        """Reads the content of a file."""
-        # Use the contents API
+    def remember_tree(self, owner: str, repo: str, ref: str, tree: CompactTree):
+        """
+        Registers a complete listing of `ref` built without list_tree (e.g. a previous
+        listing patched with a diff), so reads at `ref` find its blob SHAs and sizes.
+        """
+        cache_key = f"{owner}/{repo}@{ref}"
+        if COMMIT_SHA.match(ref):
+            self.tree_cache.put(cache_key, tree)
+        self._trees[cache_key] = tree
+
+    def compare(self, owner: str, repo: str, base: str, head: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Files changed from commit `base` to `head`, as the compare API lists them
+        ({"filename", "status", "previous_filename"}). Returns None when the diff
+        cannot be trusted to be complete: too many files for the API to list, a head
+        that is not a descendant of base (the API diffs against their merge base),
+        or a base that no longer exists (e.g. after a force push).
+        """
+        # Changed files come with the first page; one commit per page keeps the rest of the response small
+        # https://docs.github.com/en/rest/commits/commits?apiVersion=2022-11-28#compare-two-commits
+        url = f"{self.api_base_url}/repos/{owner}/{repo}/compare/{base}...{head}?per_page=1"
+        immutable = bool(COMMIT_SHA.match(base) and COMMIT_SHA.match(head))
+        try:
+            data = self._coalesced(owner, repo, url, lambda: self._get_json(url, owner, repo, immutable=immutable))
+        except requests.exceptions.HTTPError as e:
+            logger.warning(f"Failed to compare {owner}/{repo} {base}...{head}: {e}")
+            return None
+        files = data.get("files") or []
+        if data.get("status") not in ("ahead", "identical") or len(files) >= COMPARE_MAX_FILES:
+            logger.info(f"Compare {owner}/{repo} {base}...{head} is {data.get('status')} with {len(files)} files; "
+                        "not usable for incremental analysis")
+            return None
+        return files
+
+    def _fetch_tree(self, owner: str, repo: str, ref: str, immutable: bool) -> Tuple[CompactTree, bool]:
+        """The listing, and whether it is complete (a walk that ran out of budget is not)."""
+        # Use the git tree API for recursive listing
+        # https://docs.github.com/en/rest/git/trees?apiVersion=2022-11-28#get-a-tree
+        url = f"{self.api_base_url}/repos/{owner}/{repo}/git/trees/{ref}?recursive=1"
+        data = self._get_json(url, owner, repo, immutable=immutable)
+
+        if data.get("truncated", False):
+            # Too large for one recursive listing: walk the subtrees instead of using a partial list
+            logger.warning(f"Tree for {owner}/{repo}@{ref} is truncated; listing subtrees level by level.")
+            self._count(owner, repo, "tree_truncated")
+            blobs, skipped, unwalked = TreeWalker.from_env(self, self.executor).walk(owner, repo, data["sha"])
+            with self._stats_lock:
+                counts = self._stats.setdefault(f"{owner}/{repo}", Counter())
+                counts["skipped_dirs"] += len(skipped)
+                counts["unwalked_dirs"] += len(unwalked)
+            return CompactTree(blobs), not unwalked
+        blobs = [item for item in data.get("tree", []) if item["type"] == "blob"]
+        return CompactTree(blobs), True
+
+    def read_file(self, owner: str, repo: str, path: str, ref: str, max_bytes: Optional[int] = None) -> str:
+        """
+        Reads the content of a file, serving it from the blob cache when its SHA is known.
+        At most `max_bytes` are read (the client's `max_file_bytes` when not given);
+        binary files read as "". Paths that returned 404 recently read as "" without a request.
+        """
+        location = f"{self._scope}|{owner}/{repo}@{ref}:{path}"
+        if location in self.negative_cache:
+            self._count(owner, repo, "negative_hits")
+            return ""
+        limit = self._read_limit(max_bytes)
+        return self._coalesced(owner, repo, f"file:{owner}/{repo}@{ref}:{path}:{limit}",
+                               lambda: self._read_file(owner, repo, path, ref, limit, location))
+
+    def _read_file(self, owner: str, repo: str, path: str, ref: str, limit: Optional[int], location: str) -> str:
+        sha = self.blob_sha(owner, repo, path, ref)
+        if self.blob_cache is not None and sha:
+            cached = self.blob_cache.get(sha)
+            self._count(owner, repo, "blob_hits" if cached is not None else "blob_misses")
+            if cached is not None:
+                return self._decode(owner, repo, path, cached if limit is None else cached[:limit])
+
+        size = self.blob_size(owner, repo, path, ref)
+        # Use the contents API with the raw media type, streaming the body
         # https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#get-repository-content
         url = f"{self.api_base_url}/repos/{owner}/{repo}/contents/{path}?ref={ref}"
+        headers = {"Accept": RAW_MEDIA_TYPE}
+        if limit is not None and (size is None or size > limit):
+            headers["Range"] = f"bytes=0-{limit - 1}"
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            if "content" not in data:
-                return "" # Handle empty or size 0 files gracefully if api returns no content field
-            
-            content = base64.b64decode(data["content"]).decode("utf-8", errors="replace")
-            return content
+            with self._request(url, headers=headers, stream=True) as response:
+                response.raise_for_status()
+                raw = self._read_body(response, limit)
+            self._count(owner, repo, "raw_reads")
+            if limit is not None and (size > limit if size is not None else len(raw) >= limit):
+                logger.debug(f"Read the first {limit} bytes of {path} in {owner}/{repo} ({size or 'unknown'} bytes)")
+                self._count(owner, repo, "truncated_reads")
+
+            if self.blob_cache is not None and sha and (size is None or len(raw) == size):
+                self.blob_cache.put(sha, raw)
+            return self._decode(owner, repo, path, raw)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
+                self.negative_cache.add(location)
                 return "" # File not found, treat as empty or missing
             logger.error(f"Failed to read file {path} in {owner}/{repo}@{ref}: {e}")
             raise
         except Exception as e:
             logger.error(f"Error decoding file {path}: {e}")
             return "" # Return empty on decode error
+
+    def _read_limit(self, max_bytes: Optional[int]) -> Optional[int]:
+        # An explicit limit wins, even above the cap: callers that need whole lockfiles ask for them
+        return max_bytes if max_bytes is not None else self.max_file_bytes
+
+    @staticmethod
+    def _read_body(response: requests.Response, limit: Optional[int]) -> bytes:
+        """Reads a streamed body, stopping once `limit` bytes have arrived."""
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=READ_CHUNK_BYTES):
+            chunks.append(chunk)
+            received += len(chunk)
+            if limit is not None and received >= limit:
+                break
+        raw = b"".join(chunks)
+        return raw if limit is None else raw[:limit]
+
+    def _decode(self, owner: str, repo: str, path: str, raw: bytes) -> str:
+        if is_binary(raw):
+            logger.debug(f"Skipping binary file {path} in {owner}/{repo}")
+            self._count(owner, repo, "binary_skipped")
+            return ""
+        return raw.decode("utf-8", errors="replace")
+
+    def blob_sha(self, owner: str, repo: str, path: str, ref: str) -> Optional[str]:
+        """Blob SHA of a path from a previous list_tree call, if known."""
+        tree = self._trees.get(f"{owner}/{repo}@{ref}")
+        return tree.sha(path) if tree is not None else None
+
+    def blob_size(self, owner: str, repo: str, path: str, ref: str) -> Optional[int]:
+        """Size in bytes of a path from a previous list_tree call, if known."""
+        tree = self._trees.get(f"{owner}/{repo}@{ref}")
+        return tree.size(path) if tree is not None else None
+
+    def _count(self, owner: str, repo: str, outcome: str):
+        with self._stats_lock:
+            self._stats.setdefault(f"{owner}/{repo}", Counter())[outcome] += 1
+
+    def fetch_stats(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Cache outcomes for requests this client made on behalf of one repository."""
+        with self._stats_lock:
+            counts = Counter(self._stats.get(f"{owner}/{repo}", Counter()))
+        rate_limit = self.scheduler.snapshot()
+        return {
+            "blob_cache": {
+                "enabled": self.blob_cache is not None,
+                "hits": counts["blob_hits"],
+                "misses": counts["blob_misses"]
+            },
+            "conditional_requests": {
+                "enabled": self.validator_cache is not None,
+                "not_modified": counts["not_modified"],
+                "modified": counts["modified"],
+                "immutable_hits": counts["immutable_hits"]
+            },
+            "graphql": {
+                "queries": counts["graphql_queries"],
+                "blobs": counts["graphql_blobs"]
+            },
+            "coalescing": {
+                "shared": counts["coalesced"],
+                "negative_hits": counts["negative_hits"]
+            },
+            "reads": {
+                "raw": counts["raw_reads"],
+                "truncated": counts["truncated_reads"],
+                "binary_skipped": counts["binary_skipped"]
+            },
+            "tree": {
+                "cache_hits": counts["tree_cache_hits"],
+                "truncated": counts["tree_truncated"] > 0,
+                "subtree_calls": counts["subtree_calls"],
+                "skipped_dirs": counts["skipped_dirs"],
+                # Set when a truncated tree's walk ran out of budget and the listing is incomplete
+                "partial": counts["unwalked_dirs"] > 0,
+                "unwalked_dirs": counts["unwalked_dirs"]
+            },
+            "rate_limit": {k: v for k, v in rate_limit.items() if k.split(":")[0] in self.tokens.credentials}
+        }
+
+    def download_archive(self, owner: str, repo: str, ref: str, archive_format: str = "tarball") -> ArchiveIndex:
+        """Downloads the repository archive for a ref once and indexes its files for local reads."""
+        # https://docs.github.com/en/rest/repos/contents?apiVersion=2022-11-28#download-a-repository-archive-tar
+        if archive_format not in ("tarball", "zipball"):
+            raise ValueError(f"Unsupported archive format: {archive_format}")
+
+        url = f"{self.api_base_url}/repos/{owner}/{repo}/{archive_format}/{ref}"
+        try:
+            with self._request(url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                if archive_format == "zipball":
+                    index = ArchiveIndex.from_zipball(response.raw)
+                else:
+                    index = ArchiveIndex.from_tarball(response.raw)
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Failed to download {archive_format} for {owner}/{repo}@{ref}: {e}")
+            raise
+
+        logger.info(f"Indexed {len(index)} files from {archive_format} of {owner}/{repo}@{ref}")
+        return index
@@ -0,0 +1,102 @@
+import logging
+from typing import Dict, List
+
+from .archive_index import BINARY_SNIFF_BYTES, is_binary
+from .github_client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+
+_BLOB_FIELDS = "... on Blob { oid byteSize isBinary isTruncated text }"
+
+
+class GraphQLBlobReader:
+    """
+    Reads many files in a handful of GraphQL queries.
+
+    Each query aliases up to `batch_size` `object(expression: "<ref>:<path>")`
+    lookups, so a config-heavy repository costs a few requests instead of one
+    REST call per file. Blobs GitHub truncates in GraphQL are left out of the
+    result so callers fall back to the Contents API for them.
+    """
+
+    def __init__(self, client: GitHubClient, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.client = client
+        self.batch_size = max(1, batch_size)
+
+    def batches(self, paths: List[str]) -> List[List[str]]:
+        """Splits paths into query-sized groups."""
+        return [paths[i:i + self.batch_size] for i in range(0, len(paths), self.batch_size)]
+
+    def fetch(self, owner: str, repo: str, paths: List[str], ref: str) -> Dict[str, str]:
+        """Reads every path, one query per batch."""
+        contents = {}
+        for batch in self.batches(paths):
+            contents.update(self.fetch_batch(owner, repo, batch, ref))
+        return contents
+
+    def fetch_batch(self, owner: str, repo: str, paths: List[str], ref: str) -> Dict[str, str]:
+        """
+        Reads one batch of paths in a single query. Paths already in the blob cache are
+        not requested, and files over the client's `max_file_bytes` are left to read_file.
+        """
+        contents = {}
+        pending = []
+        cap = self.client.max_file_bytes
+        for path in paths:
+            size = self.client.blob_size(owner, repo, path, ref)
+            if cap is not None and size is not None and size > cap:
+                continue  # Left to read_file, which reads only the capped prefix
+            sha = self.client.blob_sha(owner, repo, path, ref)
+            if self.client.blob_cache is not None and sha:
+                cached = self.client.blob_cache.get(sha)
+                self.client._count(owner, repo, "blob_hits" if cached is not None else "blob_misses")
+                if cached is not None:
+                    # The REST path caches binary blobs too; decode as read_file does, so they read as ""
+                    contents[path] = self.client._decode(owner, repo, path, cached)
+                    continue
+            pending.append(path)
+        if not pending:
+            return contents
+
+        # Expressions travel as variables so paths never need escaping inside the query text
+        variables = {"owner": owner, "name": repo}
+        declarations = ["$owner: String!", "$name: String!"]
+        selections = []
+        for i, path in enumerate(pending):
+            variables[f"e{i}"] = f"{ref}:{path}"
+            declarations.append(f"$e{i}: String!")
+            selections.append(f"f{i}: object(expression: $e{i}) {{ {_BLOB_FIELDS} }}")
+        query = (
+            f"query({', '.join(declarations)}) {{ repository(owner: $owner, name: $name) {{ "
+            + " ".join(selections)
+            + " } }"
+        )
+
+        data = self.client.graphql(query, variables)
+        repository = data.get("repository")
+        if repository is None:
+            raise RuntimeError(f"Repository {owner}/{repo} not found via GraphQL")
+        self.client._count(owner, repo, "graphql_queries")
+
+        for i, path in enumerate(pending):
+            blob = repository.get(f"f{i}")
+            if blob is None:
+                contents[path] = ""  # Missing path, same as a Contents API 404
+                continue
+            if blob.get("isTruncated"):
+                logger.debug(f"GraphQL truncated {path} ({blob.get('byteSize')} bytes); leaving it to the Contents API")
+                continue
+            text = blob.get("text") or ""  # Binary blobs come back without text
+            # GitHub's binary detection is not git's; sniff for NUL as the REST path does
+            if text and is_binary(text[:BINARY_SNIFF_BYTES].encode("utf-8", errors="replace")):
+                self.client._count(owner, repo, "binary_skipped")
+                contents[path] = ""
+            else:
+                contents[path] = text
+            self.client._count(owner, repo, "graphql_blobs")
+            if self.client.blob_cache is not None and blob.get("oid") and not blob.get("isBinary"):
+                # put() verifies the SHA, so text that did not round-trip exactly is simply not cached
+                self.client.blob_cache.put(blob["oid"], text.encode("utf-8"))
+        return contents
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .blob_cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 256
+
+
+class ValidatorCache:
+    """
+    Persistent store of HTTP validators (ETag / Last-Modified) and the bodies they validate.
+
+    GitHubClient sends the stored validators as If-None-Match / If-Modified-Since;
+    on 304 Not Modified the stored body is replayed. GitHub does not count 304s
+    against the rate limit, so unchanged metadata and trees become nearly free.
+    Total size is bounded by `max_bytes`; the least recently used entries are evicted first.
+    """
+
+    _shared: Dict[str, "ValidatorCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = os.path.join(directory, "validators")
+        self.max_bytes = max_bytes
+        self.stats = {"evictions": 0}
+        self._lock = threading.Lock()
+        # key -> size, oldest first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def from_env(cls) -> Optional["ValidatorCache"]:
+        """
+        Returns the process-wide cache under REPO_INTEL_CACHE_DIR, capped at
+        VALIDATOR_CACHE_MAX_MB, or None when GITHUB_CONDITIONAL_REQUESTS is set
+        to "false" or the cap is 0.
+        """
+        if os.getenv("GITHUB_CONDITIONAL_REQUESTS", "true").lower() in ("0", "false", "no"):
+            return None
+        max_mb = int(os.getenv("VALIDATOR_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+        if max_mb <= 0:
+            return None
+        directory = cache_dir()
+        with cls._shared_lock:
+            if directory not in cls._shared:
+                cls._shared[directory] = cls(directory, max_mb * 1024 * 1024)
+            return cls._shared[directory]
+
+    @staticmethod
+    def key(url: str, credential: str) -> str:
+        """Cache key for a URL as seen by one credential (responses vary by token)."""
+        return hashlib.sha256(f"{credential}\n{url}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key[2:]}.json")
+
+    def _load_index(self):
+        """Rebuilds the LRU order from disk, using modification time as last access."""
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                found.append((st.st_mtime, os.path.basename(root) + name[:-len(".json")], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns {"etag", "last_modified", "body"} for a key, or None."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, body: Any, etag: Optional[str], last_modified: Optional[str]):
+        if not etag and not last_modified:
+            return
+        data = json.dumps({"etag": etag, "last_modified": last_modified, "body": body})
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store validators for {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, _ = next(iter(self._entries.items()))
+            self._forget(key)
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
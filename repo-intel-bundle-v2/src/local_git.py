@@ -0,0 +1,266 @@
+import logging
+import os
+import subprocess
+import threading
+import weakref
+from collections import Counter
+from typing import List, Optional, Tuple, Dict, Any
+from urllib.parse import urlparse
+
+from .github_client import COMMIT_SHA, DEFAULT_MAX_FILE_BYTES, is_binary
+from .tree_cache import CompactTree, TreeCache
+
+logger = logging.getLogger(__name__)
+
+GITLINK_MODE = "160000"
+
+
+class GitObjectNotFound(LookupError):
+    pass
+
+
+class CatFileBatch:
+    """
+    A long-lived `git cat-file --batch` process for one repository.
+    Objects are requested by any name git understands (`<sha>`, `<ref>:<path>`,
+    `<ref>^{tree}`), so a whole analysis costs one process instead of one per read.
+    """
+
+    def __init__(self, git_dir: str):
+        self.git_dir = git_dir
+        self._lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            ["git", f"--git-dir={git_dir}", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.objects_read = 0
+
+    def read(self, name: str) -> Tuple[str, str, bytes]:
+        """Returns (sha, type, content) for an object name. Raises GitObjectNotFound if it does not resolve."""
+        if "\n" in name:
+            raise ValueError(f"Invalid object name: {name!r}")
+        with self._lock:
+            self._proc.stdin.write(name.encode() + b"\n")
+            self._proc.stdin.flush()
+            header = self._proc.stdout.readline()
+            if not header:
+                raise RuntimeError(f"git cat-file exited unexpectedly for {self.git_dir}")
+            parts = header.decode().split()
+            if len(parts) != 3:
+                # "<name> missing" or "<name> ambiguous"
+                raise GitObjectNotFound(name)
+            sha, obj_type, size = parts[0], parts[1], int(parts[2])
+            content = self._proc.stdout.read(size)
+            self._proc.stdout.read(1)  # trailing newline
+            self.objects_read += 1
+        return sha, obj_type, content
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=5)
+
+
+class LocalGitClient:
+    """
+    Source backend that reads repositories from local (bare) mirrors instead of the
+    GitHub API. It has the same surface RepoAnalyzer uses on GitHubClient, so
+    analysis runs at disk speed with no network access or rate limits.
+
+    A repo URL such as https://github.com/owner/repo is looked up under `mirror_root`
+    as owner/repo.git, owner/repo, or repo.git, in that order.
+
+    Reads follow GitHubClient: at most `max_file_bytes` per file, and binary files
+    read as "", so a mirror yields the same content as the API.
+    """
+
+    def __init__(self, mirror_root: str, max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES):
+        self.mirror_root = os.path.abspath(mirror_root)
+        # Upper bound on bytes read per file (None for no cap)
+        self.max_file_bytes = max_file_bytes
+        self._batches: Dict[str, CatFileBatch] = {}
+        self.tree_cache = TreeCache.shared()
+        self._trees: "weakref.WeakValueDictionary[str, CompactTree]" = weakref.WeakValueDictionary()
+        self._stats: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def parse_repo_url(self, repo_url: str) -> Tuple[str, str]:
+        """Parses owner and repo name from a URL."""
+        parsed = urlparse(repo_url)
+        path_parts = parsed.path.strip("/").split("/")
+        if len(path_parts) < 2:
+            raise ValueError(f"Invalid repository URL: {repo_url}")
+        return path_parts[-2], path_parts[-1].replace(".git", "")
+
+    def git_dir(self, owner: str, repo: str) -> str:
+        """Locates the mirror for owner/repo."""
+        for candidate in (
+            os.path.join(self.mirror_root, owner, f"{repo}.git"),
+            os.path.join(self.mirror_root, owner, repo, ".git"),
+            os.path.join(self.mirror_root, owner, repo),
+            os.path.join(self.mirror_root, f"{repo}.git"),
+        ):
+            if os.path.isfile(os.path.join(candidate, "HEAD")):
+                return candidate
+        raise FileNotFoundError(f"No local mirror for {owner}/{repo} under {self.mirror_root}")
+
+    def _batch(self, owner: str, repo: str) -> CatFileBatch:
+        key = f"{owner}/{repo}"
+        with self._lock:
+            if key not in self._batches:
+                self._batches[key] = CatFileBatch(self.git_dir(owner, repo))
+            return self._batches[key]
+
+    def _git(self, owner: str, repo: str, *args: str) -> str:
+        result = subprocess.run(["git", f"--git-dir={self.git_dir(owner, repo)}", *args],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+
+    def get_repo_metadata(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Synthesizes the metadata fields RepoAnalyzer reads from the mirror."""
+        try:
+            default_branch = self._git(owner, repo, "symbolic-ref", "--short", "HEAD")
+        except subprocess.CalledProcessError:
+            default_branch = "HEAD"  # Detached HEAD
+        return {
+            "full_name": f"{owner}/{repo}",
+            "default_branch": default_branch,
+            "stargazers_count": 0,
+            "language": None
+        }
+
+    def resolve_ref(self, owner: str, repo: str, ref: str) -> str:
+        """Resolves a branch, tag or short SHA to the full commit SHA it points at."""
+        try:
+            sha, _, _ = self._batch(owner, repo).read(f"{ref}^{{commit}}")
+        except GitObjectNotFound:
+            raise ValueError(f"Ref '{ref}' not found in {owner}/{repo}")
+        return sha
+
+    def list_tree(self, owner: str, repo: str, ref: str) -> CompactTree:
+        """Lists all files in the repository recursively, with their sizes, modes and blob SHAs."""
+        cache_key = f"{owner}/{repo}@{ref}"
+        immutable = bool(COMMIT_SHA.match(ref))
+        tree = self._trees.get(cache_key) or (self.tree_cache.get(cache_key) if immutable else None)
+        if tree is not None:
+            self._trees[cache_key] = tree
+            return tree
+
+        try:
+            root, _, _ = self._batch(owner, repo).read(f"{ref}^{{tree}}")
+        except GitObjectNotFound:
+            raise ValueError(f"Ref '{ref}' not found in {owner}/{repo}")
+
+        # One `git ls-tree -l` lists every blob with its size, unlike walking tree objects
+        output = subprocess.run(["git", f"--git-dir={self.git_dir(owner, repo)}", "ls-tree", "-r", "-l", "-z", root],
+                                capture_output=True, check=True).stdout
+        blobs = []
+        for record in output.split(b"\0"):
+            if not record:
+                continue
+            info, _, path = record.partition(b"\t")
+            mode, obj_type, sha, size = info.decode().split()
+            if obj_type == "blob":  # Skip submodule commits, like the trees API "commit" type
+                blobs.append({"path": path.decode("utf-8", errors="surrogateescape"), "mode": mode,
+                              "sha": sha, "size": int(size)})
+
+        tree = CompactTree(sorted(blobs, key=lambda b: b["path"]))
+        self.remember_tree(owner, repo, ref, tree)
+        return tree
+
+    def remember_tree(self, owner: str, repo: str, ref: str, tree: CompactTree):
+        """Registers a complete listing of `ref` built without list_tree, like GitHubClient.remember_tree."""
+        cache_key = f"{owner}/{repo}@{ref}"
+        if COMMIT_SHA.match(ref):
+            self.tree_cache.put(cache_key, tree)
+        self._trees[cache_key] = tree
+
+    # `git diff --name-status` letters -> compare API statuses (renames are off, so they show as D + A)
+    DIFF_STATUSES = {"A": "added", "M": "modified", "T": "changed", "D": "removed"}
+
+    def compare(self, owner: str, repo: str, base: str, head: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Files changed from commit `base` to `head`, shaped like GitHubClient.compare, plus
+        the "size" and "mode" of each file at `head`; None if base is gone.
+        """
+        try:
+            # Raw records: ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0", kept as
+            # bytes so paths with other encodings or surrounding whitespace come back intact
+            output = subprocess.run(["git", f"--git-dir={self.git_dir(owner, repo)}", "diff", "--raw", "--no-renames",
+                                     "--no-abbrev", "-z", base, head], capture_output=True, check=True).stdout
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Failed to diff {owner}/{repo} {base}..{head}: {e.stderr.decode(errors='replace').strip()}")
+            return None
+        fields = output.split(b"\0")
+        files = []
+        for record, raw_path in zip(fields[0::2], fields[1::2]):
+            old_mode, mode, _, sha, letter = record.decode().split()
+            if GITLINK_MODE in (old_mode.lstrip(":"), mode):
+                continue  # Submodule commits are not listed by list_tree either
+            path = raw_path.decode("utf-8", errors="surrogateescape")
+            status = self.DIFF_STATUSES.get(letter, "modified")
+            files.append({"filename": path, "status": status} if status == "removed" else
+                         {"filename": path, "status": status, "sha": sha, "mode": mode})
+        sizes = self._object_sizes(owner, repo, [entry["sha"] for entry in files if "sha" in entry])
+        for entry in files:
+            if "sha" in entry:
+                entry["size"] = sizes.get(entry["sha"])
+        return files
+
+    def _object_sizes(self, owner: str, repo: str, shas: List[str]) -> Dict[str, int]:
+        """Sizes of objects by SHA, from one `git cat-file --batch-check`."""
+        if not shas:
+            return {}
+        output = subprocess.run(["git", f"--git-dir={self.git_dir(owner, repo)}", "cat-file", "--batch-check"],
+                                input="\n".join(shas) + "\n", capture_output=True, text=True, check=True).stdout
+        sizes = {}
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) == 3:  # "<sha> missing" otherwise
+                sizes[parts[0]] = int(parts[2])
+        return sizes
+
+    def read_file(self, owner: str, repo: str, path: str, ref: str, max_bytes: Optional[int] = None) -> str:
+        """Reads the content of a file, or its first `max_bytes` bytes."""
+        tree = self._trees.get(f"{owner}/{repo}@{ref}")
+        name = (tree.sha(path) if tree is not None else None) or f"{ref}:{path}"
+        try:
+            _, obj_type, content = self._batch(owner, repo).read(name)
+        except GitObjectNotFound:
+            return ""  # File not found, treat as empty or missing
+        if obj_type != "blob":
+            return ""
+        limit = max_bytes if max_bytes is not None else self.max_file_bytes
+        raw = content[:limit]
+        with self._lock:
+            counts = self._stats.setdefault(f"{owner}/{repo}", Counter())
+            counts["blobs_read"] += 1
+            if len(raw) < len(content):
+                counts["truncated_reads"] += 1
+            if is_binary(raw):
+                counts["binary_skipped"] += 1
+                return ""
+        return raw.decode("utf-8", errors="replace")
+
+    def fetch_stats(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Object reads served from the local mirror for one repository."""
+        with self._lock:
+            counts = self._stats.get(f"{owner}/{repo}", Counter())
+            batch = self._batches.get(f"{owner}/{repo}")
+            return {
+                "local_git": {
+                    "git_dir": batch.git_dir if batch else None,
+                    "blobs_read": counts["blobs_read"],
+                    "truncated_reads": counts["truncated_reads"],
+                    "binary_skipped": counts["binary_skipped"],
+                    "objects_read": batch.objects_read if batch else 0
+                }
+            }
+
+    def close(self):
+        with self._lock:
+            for batch in self._batches.values():
+                batch.close()
+            self._batches.clear()
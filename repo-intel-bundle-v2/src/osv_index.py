@@ -0,0 +1,402 @@
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .blob_cache import cache_dir
+from .dependency_parser import CARGO, GO, NPM, PYPI, normalize_name
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 1
+# Packages of an ecosystem are spread over this many shard files, by CRC-32 of the name
+SHARDS = 256
+# Ecosystems whose version ordering is implemented below; advisories for others are not imported
+ECOSYSTEMS = (NPM, PYPI, GO, CARGO)
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "UNKNOWN")
+
+SEMVER = re.compile(r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+.*)?$")
+PEP440 = re.compile(
+    r"^v?(?:(?P<epoch>\d+)!)?(?P<release>\d+(?:\.\d+)*)"
+    r"(?:[-_.]?(?P<pre>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre_n>\d+)?)?"
+    r"(?:-(?P<post_implicit>\d+)|[-_.]?(?P<post>post|rev|r)[-_.]?(?P<post_n>\d+)?)?"
+    r"(?:[-_.]?(?P<dev>dev)[-_.]?(?P<dev_n>\d+)?)?"
+    r"(?:\+[a-z0-9]+(?:[-_.][a-z0-9]+)*)?$",
+    re.IGNORECASE,
+)
+PRE_RANKS = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+# Every key starts with a number, so these bound all of them
+LOWEST: Tuple = ()
+HIGHEST: Tuple = (math.inf,)
+
+VersionKey = Tuple
+
+
+def _semver_key(version: str) -> Optional[VersionKey]:
+    match = SEMVER.match(version)
+    if not match:
+        return None
+    major, minor, patch, pre = match.groups()
+    # A release sorts after its prereleases; numeric identifiers sort before alphanumeric ones
+    pre_key = (1,) if pre is None else (0, *((0, int(p), "") if p.isdigit() else (1, 0, p) for p in pre.split(".")))
+    return int(major), int(minor or 0), int(patch or 0), pre_key
+
+
+def _pep440_key(version: str) -> Optional[VersionKey]:
+    match = PEP440.match(version.strip())
+    if not match:
+        return None
+    numbers = [int(n) for n in match["release"].split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()  # 1.0 == 1.0.0
+    has_post = match["post_implicit"] is not None or match["post"] is not None
+    if match["pre"] is not None:
+        pre = (PRE_RANKS[match["pre"].lower()], int(match["pre_n"] or 0))
+    elif match["dev"] is not None and not has_post:
+        pre = (-1, 0)  # 1.0.dev0 precedes 1.0a0
+    else:
+        pre = (9, 0)
+    post = int(match["post_implicit"] or match["post_n"] or 0) if has_post else -1
+    dev = int(match["dev_n"] or 0) if match["dev"] is not None else math.inf
+    return int(match["epoch"] or 0), tuple(numbers), pre, post, dev
+
+
+def version_key(ecosystem: str, version: str) -> Optional[VersionKey]:
+    """Sort key for a version in an ecosystem's own ordering, or None when it cannot be parsed."""
+    return _pep440_key(version) if ecosystem == PYPI else _semver_key(version)
+
+
+@dataclass(frozen=True)
+class Interval:
+    """Affected versions [lo, hi), or [lo, hi] when `inclusive` (OSV last_affected); `advisory` indexes the shard."""
+    lo: VersionKey
+    hi: VersionKey
+    inclusive: bool
+    advisory: int
+    fixed: Optional[str]
+
+    def contains(self, key: VersionKey) -> bool:
+        return self.lo <= key and (key < self.hi or (self.inclusive and key == self.hi))
+
+
+class IntervalTree:
+    """
+    Static centered interval tree. Each node keeps the intervals spanning its
+    center twice, sorted by lower bound and by upper bound, so a stabbing query
+    visits one root-to-leaf path and stops scanning each list at the first miss.
+    """
+
+    __slots__ = ("center", "by_lo", "by_hi", "left", "right")
+
+    def __init__(self, intervals: Sequence[Interval]):
+        los = sorted(iv.lo for iv in intervals)
+        # The median lower bound lies inside its own interval, so every node holds at least one
+        self.center = los[len(los) // 2]
+        here, left, right = [], [], []
+        for iv in intervals:
+            if iv.contains(self.center):
+                here.append(iv)
+            elif iv.lo > self.center:
+                right.append(iv)
+            else:
+                left.append(iv)
+        self.by_lo = sorted(here, key=lambda iv: iv.lo)
+        self.by_hi = sorted(here, key=lambda iv: (iv.hi, iv.inclusive), reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def stab(self, key: VersionKey) -> List[Interval]:
+        """Intervals containing `key`."""
+        found = []
+        node = self
+        while node is not None:
+            if key < node.center:
+                for iv in node.by_lo:
+                    if iv.lo > key:
+                        break
+                    found.append(iv)
+                node = node.left
+            elif key > node.center:
+                for iv in node.by_hi:
+                    if not iv.contains(key):
+                        break
+                    found.append(iv)
+                node = node.right
+            else:
+                found.extend(node.by_lo)
+                break
+        return found
+
+
+class _Package:
+    """Advisories for one package: a tree over its version ranges plus explicitly listed versions."""
+
+    __slots__ = ("tree", "versions")
+
+    def __init__(self, ecosystem: str, entry: Dict[str, Any]):
+        intervals = []
+        for lo, hi, inclusive, advisory in entry.get("ranges", ()):
+            lo_key = LOWEST if lo is None else version_key(ecosystem, lo)
+            hi_key = HIGHEST if hi is None else version_key(ecosystem, hi)
+            # Empty ranges (introduced == fixed) are dropped; the tree relies on every interval being non-empty
+            if lo_key is not None and hi_key is not None and (lo_key < hi_key or (inclusive and lo_key == hi_key)):
+                intervals.append(Interval(lo_key, hi_key, inclusive, advisory, None if inclusive else hi))
+        self.tree = IntervalTree(intervals) if intervals else None
+        self.versions: Dict[str, List[int]] = entry.get("versions", {})
+
+    def lookup(self, ecosystem: str, version: str) -> List[Tuple[int, Optional[str]]]:
+        """(advisory, fixed version) pairs affecting `version`."""
+        found = [(advisory, None) for advisory in self.versions.get(version, ())]
+        key = version_key(ecosystem, version) if self.tree is not None else None
+        if key is not None:
+            found.extend((iv.advisory, iv.fixed) for iv in self.tree.stab(key))
+        return found
+
+
+def _ranges(ecosystem: str, ranges: Iterable[Dict[str, Any]], advisory: int) -> Iterator[List[Any]]:
+    """OSV SEMVER/ECOSYSTEM ranges as [introduced, fixed or last_affected, inclusive, advisory] intervals."""
+    for entry in ranges:
+        if entry.get("type") not in ("SEMVER", "ECOSYSTEM"):
+            continue  # GIT ranges are commit hashes
+        events = []
+        for event in entry.get("events", ()):
+            kind, version = next(iter(event.items()), (None, None))
+            if kind not in ("introduced", "fixed", "last_affected"):
+                continue  # "limit" only bounds GIT ranges
+            key = LOWEST if kind == "introduced" and version == "0" else version_key(ecosystem, version)
+            if key is None:
+                logger.debug(f"Skipping range with unparseable {ecosystem} version {version!r}")
+                events = None
+                break
+            events.append((key, kind != "introduced", kind, version))
+        if not events:
+            continue
+        # Events may come in any order; at equal versions a fix closes before the next introduction opens
+        events.sort(key=lambda e: (e[0], not e[1]))
+        start, is_open = None, False
+        for _, _, kind, version in events:
+            if kind == "introduced":
+                if not is_open:
+                    start, is_open = None if version == "0" else version, True
+            elif is_open:
+                yield [start, version, kind == "last_affected", advisory]
+                start, is_open = None, False
+        if is_open:
+            yield [start, None, False, advisory]
+
+
+def _severity(record: Dict[str, Any], affected: Dict[str, Any]) -> str:
+    for source in (affected.get("ecosystem_specific"), affected.get("database_specific"), record.get("database_specific")):
+        label = str((source or {}).get("severity", "")).upper()
+        if label:
+            return "MEDIUM" if label == "MODERATE" else label if label in SEVERITIES else "UNKNOWN"
+    return "UNKNOWN"
+
+
+def _read_records(source: str) -> Iterator[Dict[str, Any]]:
+    """OSV records from an export zip (e.g. PyPI/all.zip), a directory of JSON files, or one JSON file or list."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield json.loads(archive.read(name))
+    elif os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.endswith(".json"):
+                    with open(os.path.join(root, name)) as f:
+                        yield json.load(f)
+    else:
+        opener = gzip.open if source.endswith(".gz") else open
+        with opener(source, "rt") as f:
+            data = json.load(f)
+        yield from data if isinstance(data, list) else [data]
+
+
+def describe_match(dependency: Dict[str, Any]) -> str:
+    """One-line evidence for a vulnerable dependency from VulnerabilityIndex.match()."""
+    advisories = ", ".join(
+        a["id"] + (f" (fixed in {a['fixed']})" if a["fixed"] else "") for a in dependency["advisories"]
+    )
+    return f"{dependency['name']} {dependency['version']} ({dependency['ecosystem']}, {dependency['path']}): {advisories}"
+
+
+def _shard(name: str) -> str:
+    return f"{zlib.crc32(name.encode()) % SHARDS:02x}"
+
+
+class VulnerabilityIndex:
+    """
+    Offline index of OSV advisories, on disk, keyed by ecosystem and package.
+
+    `build` imports OSV dumps once; packages are spread over SHARDS gzipped
+    JSON files per ecosystem, each holding the packages' version ranges and
+    advisory summaries. A lookup loads only the shard its package hashes to
+    (kept in memory afterwards) and builds an interval tree over that package's
+    ranges, so matching a whole portfolio's dependencies makes no network
+    calls and touches each shard at most once.
+    """
+
+    _shared: Dict[str, "VulnerabilityIndex"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "index.json")) as f:
+            self.info: Dict[str, Any] = json.load(f)
+        if self.info.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported OSV index format {self.info.get('format')} in {directory}; rebuild it")
+        self._shards: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._packages: Dict[Tuple[str, str], Optional[_Package]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "shard_loads": 0}
+
+    @staticmethod
+    def default_directory() -> str:
+        return os.path.abspath(os.getenv("OSV_INDEX_DIR") or
+                               os.path.join(cache_dir(), "osv"))
+
+    @classmethod
+    def from_env(cls) -> Optional["VulnerabilityIndex"]:
+        """Returns the process-wide index at OSV_INDEX_DIR (default: osv/ under REPO_INTEL_CACHE_DIR), or None if none was built."""
+        directory = cls.default_directory()
+        with cls._shared_lock:
+            if directory not in cls._shared:
+                if not os.path.exists(os.path.join(directory, "index.json")):
+                    return None
+                cls._shared[directory] = cls(directory)
+            return cls._shared[directory]
+
+    @classmethod
+    def build(cls, sources: Sequence[str], directory: Optional[str] = None) -> "VulnerabilityIndex":
+        """
+        Imports OSV records from `sources` into a new index at `directory`,
+        replacing any index already there once the new one is complete.
+        """
+        directory = os.path.abspath(directory or cls.default_directory())
+        started = time.time()
+        # ecosystem -> shard -> {"packages": {name: {"ranges", "versions"}}, "advisories": [...]}
+        shards: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        advisories = skipped = 0
+        for source in sources:
+            for record in _read_records(source):
+                if record.get("withdrawn"):
+                    continue
+                imported = False
+                for affected in record.get("affected", ()):
+                    package = affected.get("package") or {}
+                    ecosystem = package.get("ecosystem")
+                    if ecosystem not in ECOSYSTEMS or not package.get("name"):
+                        continue
+                    name = normalize_name(ecosystem, package["name"])
+                    shard = shards.setdefault(ecosystem, {}).setdefault(_shard(name), {"packages": {}, "advisories": []})
+                    index = len(shard["advisories"])
+                    shard["advisories"].append({
+                        "id": record["id"],
+                        "aliases": record.get("aliases", []),
+                        "summary": record.get("summary") or (record.get("details") or "")[:200],
+                        "severity": _severity(record, affected),
+                    })
+                    entry = shard["packages"].setdefault(name, {"ranges": [], "versions": {}})
+                    entry["ranges"].extend(_ranges(ecosystem, affected.get("ranges", ()), index))
+                    for version in affected.get("versions", ()):
+                        entry["versions"].setdefault(version, []).append(index)
+                    imported = True
+                advisories += imported
+                skipped += not imported
+
+        parent = os.path.dirname(directory)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=".osv-")
+        try:
+            for ecosystem, by_shard in shards.items():
+                os.makedirs(os.path.join(staging, ecosystem))
+                for shard, payload in by_shard.items():
+                    with gzip.open(os.path.join(staging, ecosystem, f"{shard}.json.gz"), "wt") as f:
+                        json.dump(payload, f, separators=(",", ":"))
+            info = {
+                "format": INDEX_FORMAT,
+                "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "sources": [os.path.basename(s) for s in sources],
+                "advisories": advisories,
+                "packages": {e: sum(len(s["packages"]) for s in by_shard.values()) for e, by_shard in shards.items()},
+            }
+            with open(os.path.join(staging, "index.json"), "w") as f:
+                json.dump(info, f, indent=2)
+            if os.path.exists(directory):
+                shutil.rmtree(directory)
+            os.replace(staging, directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        logger.info(f"Indexed {advisories} OSV advisories ({skipped} for other ecosystems skipped) "
+                    f"in {time.time() - started:.1f}s at {directory}")
+        with cls._shared_lock:
+            cls._shared.pop(directory, None)
+        return cls(directory)
+
+    def _load_shard(self, ecosystem: str, shard: str) -> Dict[str, Any]:
+        path = os.path.join(self.directory, ecosystem, f"{shard}.json.gz")
+        try:
+            with gzip.open(path, "rt") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            payload = {"packages": {}, "advisories": []}
+        self.stats["shard_loads"] += 1
+        return payload
+
+    def _package(self, ecosystem: str, name: str) -> Tuple[Optional[_Package], List[Dict[str, Any]]]:
+        shard_id = (ecosystem, _shard(name))
+        with self._lock:
+            shard = self._shards.get(shard_id)
+            if shard is None:
+                shard = self._shards[shard_id] = self._load_shard(*shard_id)
+            key = (ecosystem, name)
+            if key not in self._packages:
+                entry = shard["packages"].get(name)
+                self._packages[key] = _Package(ecosystem, entry) if entry is not None else None
+            return self._packages[key], shard["advisories"]
+
+    def lookup(self, ecosystem: str, name: str, version: str) -> List[Dict[str, Any]]:
+        """Advisories affecting one package version, each with the version that fixes it when known."""
+        self.stats["lookups"] += 1
+        if ecosystem not in ECOSYSTEMS:
+            return []
+        package, advisories = self._package(ecosystem, normalize_name(ecosystem, name))
+        if package is None:
+            return []
+        found: Dict[str, Dict[str, Any]] = {}
+        for advisory, fixed in package.lookup(ecosystem, version):
+            record = advisories[advisory]
+            if record["id"] not in found or (fixed and not found[record["id"]]["fixed"]):
+                found[record["id"]] = {**record, "fixed": fixed}
+        return sorted(found.values(), key=lambda a: (SEVERITIES.index(a["severity"]), a["id"]))
+
+    def match(self, dependencies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        The dependencies (dicts as in the `dependencies` signal) with at least one
+        advisory, each with its "advisories". Dependencies without a resolved version are skipped.
+        """
+        vulnerable = []
+        for dependency in dependencies:
+            if not dependency.get("version"):
+                continue
+            advisories = self.lookup(dependency["ecosystem"], dependency["name"], dependency["version"])
+            if advisories:
+                vulnerable.append({**dependency, "advisories": advisories})
+        return vulnerable
+
+    def describe(self) -> Dict[str, Any]:
+        """What the index holds, for recording alongside results computed from it."""
+        return {"built_at": self.info["built_at"], "advisories": self.info["advisories"]}
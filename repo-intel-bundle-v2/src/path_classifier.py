@@ -0,0 +1,129 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Exact repository-root paths
+ROOT_PATH_TAGS: Dict[str, Tuple[str, ...]] = {
+    "package.json": ("manifest",),
+    "requirements.txt": ("manifest",),
+    "pom.xml": ("manifest",),
+    "build.gradle": ("manifest",),
+    "go.mod": ("manifest",),
+    "Cargo.toml": ("manifest",),
+    "package-lock.json": ("lockfile",),
+    "yarn.lock": ("lockfile",),
+    "poetry.lock": ("lockfile",),
+    "Pipfile.lock": ("lockfile",),
+    "go.sum": ("lockfile",),
+    "Cargo.lock": ("lockfile",),
+    ".gitlab-ci.yml": ("gitlab_ci",),
+    ".circleci/config.yml": ("circleci",),
+    ".travis.yml": ("travis",),
+}
+
+# Extension of the basename (after its last dot)
+EXTENSION_TAGS: Dict[str, Tuple[str, ...]] = {
+    "tf": ("terraform",),
+    "yaml": ("yaml", "secret_scan"),
+    "yml": ("yaml", "secret_scan"),
+    "py": ("secret_scan",),
+    "js": ("secret_scan",),
+    "json": ("secret_scan",),
+    "env": ("secret_scan",),
+    "properties": ("secret_scan",),
+    "xml": ("secret_scan",),
+}
+
+# Any path component, including the basename
+TEST_DIRS = frozenset({"tests", "test", "__tests__", "spec"})
+
+# Case-insensitive substrings anywhere in the path
+SUBSTRING_TAGS: Dict[str, str] = {
+    "jenkinsfile": "jenkins",
+    "dockerfile": "dockerfile",
+}
+
+# Test file naming conventions, as one pattern. Every alternative contains "test" or "spec"
+# (ignoring case), so it only runs on the few paths that pass that substring check.
+TEST_FILE = re.compile(r"(?:_test\.py|test_.*\.py|\.test\.js|\.spec\.js|Test\.java)$")
+
+
+class PathIndex:
+    """
+    Paths grouped by tag, in tree order, from a single classification pass.
+    Tagged paths keep the size and mode the listing gave them (trees API entries
+    carry both), so detectors can judge a file before reading it.
+    """
+
+    def __init__(self, tagged: Dict[str, List[str]], total: int, positions: Optional[Dict[str, int]] = None,
+                 sizes: Sequence[int] = (), modes: Sequence[int] = ()):
+        self._tagged = tagged
+        self.total = total
+        # Tagged path -> its position in the listing's packed size and mode arrays (-1 and 0 when unknown)
+        self._positions = positions or {}
+        self._sizes = sizes
+        self._modes = modes
+
+    def has(self, tag: str) -> bool:
+        return tag in self._tagged
+
+    def paths(self, tag: str) -> List[str]:
+        return self._tagged.get(tag, [])
+
+    def tags(self) -> List[str]:
+        return sorted(self._tagged)
+
+    def size(self, path: str) -> Optional[int]:
+        """Size in bytes of a tagged path, or None when unknown."""
+        i = self._positions.get(path)
+        return self._sizes[i] if i is not None and self._sizes[i] >= 0 else None
+
+    def mode(self, path: str) -> Optional[str]:
+        """Git file mode of a tagged path (e.g. "100644"), or None when unknown."""
+        i = self._positions.get(path)
+        return f"{self._modes[i]:o}" if i is not None and self._modes[i] else None
+
+
+def classify_paths(paths: Iterable[str]) -> PathIndex:
+    """
+    Classifies every path in one pass. Each path costs a few dict lookups and
+    substring checks; the split and regex only run on paths mentioning "test" or "spec".
+    A CompactTree listing also contributes the sizes and modes of tagged paths.
+    """
+    tagged: Dict[str, List[str]] = {}
+    positions: Dict[str, int] = {}
+    # Only a listing that carries sizes and modes (CompactTree) has positions worth keeping
+    sizes, modes = getattr(paths, "sizes", None), getattr(paths, "modes", None)
+    root_tags = ROOT_PATH_TAGS
+    extension_tags = EXTENSION_TAGS
+    substring_tags = tuple(SUBSTRING_TAGS.items())
+    test_dirs = TEST_DIRS
+    test_file = TEST_FILE.search
+    total = 0
+    for path in paths:
+        total += 1
+        tags = root_tags.get(path, ())
+        dot = path.rfind(".")
+        if dot >= 0:
+            # No extension matches when the last dot is in a directory name (the slice contains "/")
+            tags += extension_tags.get(path[dot + 1:], ())
+        lowered = path.lower()
+        if lowered.startswith("readme"):
+            tags += ("readme",)
+        for needle, tag in substring_tags:
+            if needle in lowered:
+                tags += (tag,)
+        if "Chart.yaml" in path:
+            tags += ("helm_chart",)
+        if path.startswith(".github/workflows") and path.endswith(".yml"):
+            tags += ("github_actions",)
+        if "test" in lowered or "spec" in lowered:
+            if not test_dirs.isdisjoint(path.split("/")):
+                tags += ("test_dir",)
+            if test_file(path):
+                tags += ("test_file",)
+        if tags:
+            for tag in tags:
+                tagged.setdefault(tag, []).append(path)
+            if sizes is not None:
+                positions[path] = total - 1
+    return PathIndex(tagged, total, positions, sizes or (), modes or ())
@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pace requests once the remaining budget drops below this share of the limit
+DEFAULT_LOW_WATER = 0.2
+# Requests kept in reserve per window (left for humans/other tools sharing the token)
+DEFAULT_RESERVE = 50
+# Longest single pause before a rate-limited request is surfaced as a failure
+DEFAULT_MAX_WAIT = 3600
+# Fallback pause for secondary limits that come without Retry-After
+SECONDARY_LIMIT_PAUSE = 60
+
+
+def credential_id(token: str) -> str:
+    """Short, non-reversible label for a token, safe to put in logs and metrics."""
+    return hashlib.sha256((token or "").encode()).hexdigest()[:8]
+
+
+@dataclass
+class _Budget:
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    paused_until: float = 0.0
+    next_slot: float = 0.0
+    requests: int = 0
+    throttled_seconds: float = 0.0
+    primary_limit_hits: int = 0
+    secondary_limit_hits: int = 0
+
+
+class RateLimitScheduler:
+    """
+    Process-wide request scheduler driven by GitHub's rate-limit headers.
+
+    Every GitHubClient in the process shares one instance, keyed per credential
+    and rate-limit resource ("core", "graphql", ...). While the budget is healthy
+    requests pass straight through; below `low_water` of the limit they are paced
+    evenly over the time left until reset, and at the reserve they wait for the
+    window to reset. 403/429 responses from primary or secondary limits become a
+    pause-and-retry instead of a failure.
+    """
+
+    _instance: Optional["RateLimitScheduler"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, low_water: float = DEFAULT_LOW_WATER, reserve: int = DEFAULT_RESERVE,
+                 max_wait: float = DEFAULT_MAX_WAIT, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.low_water = low_water
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._budgets: Dict[str, _Budget] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "RateLimitScheduler":
+        """Returns the process-wide scheduler, configured from GITHUB_RATE_LIMIT_* env vars."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(
+                    low_water=float(os.getenv("GITHUB_RATE_LIMIT_LOW_WATER", DEFAULT_LOW_WATER)),
+                    reserve=int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", DEFAULT_RESERVE)),
+                    max_wait=float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", DEFAULT_MAX_WAIT)),
+                )
+            return cls._instance
+
+    def _budget(self, credential: str, resource: str) -> _Budget:
+        return self._budgets.setdefault(f"{credential}:{resource}", _Budget())
+
+    def acquire(self, credential: str, resource: str = "core"):
+        """Blocks until a request may be sent with this credential."""
+        with self._lock:
+            budget = self._budget(credential, resource)
+            now = self._clock()
+            if budget.reset_at and now >= budget.reset_at:
+                # A new window started; the next response will tell us the real numbers
+                budget.remaining = budget.limit
+                budget.reset_at = 0.0
+
+            start = max(now, budget.paused_until)
+            if budget.remaining is not None and budget.limit:
+                if budget.remaining <= self.reserve and budget.reset_at > start:
+                    start = budget.reset_at
+                elif budget.remaining < budget.limit * self.low_water and budget.reset_at > start:
+                    interval = (budget.reset_at - start) / max(1, budget.remaining - self.reserve)
+                    start = max(start, budget.next_slot)
+                    budget.next_slot = start + interval
+                # Count the request against our local view until headers confirm it
+                budget.remaining = max(0, budget.remaining - 1)
+
+            budget.requests += 1
+            wait = start - now
+            if wait > 0:
+                budget.throttled_seconds += wait
+
+        if wait > 0:
+            if wait > 1:
+                logger.info(f"Rate limit pacing: waiting {wait:.1f}s ({resource} budget for {credential})")
+            self._sleep(wait)
+
+    def wait_time(self, credential: str, resource: str = "core") -> float:
+        """Seconds until this credential can send without waiting for a pause or a reset (0 when ready)."""
+        with self._lock:
+            budget = self._budget(credential, resource)
+            now = self._clock()
+            ready = max(now, budget.paused_until)
+            if budget.remaining is not None and budget.remaining <= self.reserve and budget.reset_at > now:
+                ready = max(ready, budget.reset_at)
+            return ready - now
+
+    def remaining(self, credential: str, resource: str = "core") -> Optional[int]:
+        """Last known remaining budget for a credential, or None before its first response."""
+        with self._lock:
+            return self._budget(credential, resource).remaining
+
+    def record(self, credential: str, response, resource: str = "core") -> Optional[float]:
+        """
+        Updates the budget from a response's headers. When the response was rate
+        limited, pauses the credential and returns the pause in seconds; otherwise None.
+        """
+        headers = response.headers
+        with self._lock:
+            budget = self._budget(credential, headers.get("X-RateLimit-Resource", resource))
+            now = self._clock()
+            if "X-RateLimit-Remaining" in headers:
+                try:
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                    reset_at = float(headers.get("X-RateLimit-Reset", 0))
+                    budget.limit = int(headers.get("X-RateLimit-Limit", budget.limit or 0)) or budget.limit
+                except ValueError:
+                    remaining, reset_at = None, 0.0
+                if remaining is not None:
+                    # Responses from concurrent workers arrive out of order: within a window keep the lowest count
+                    if reset_at != budget.reset_at or budget.remaining is None:
+                        budget.remaining = remaining
+                    else:
+                        budget.remaining = min(budget.remaining, remaining)
+                    budget.reset_at = reset_at
+
+            if response.status_code not in (403, 429):
+                return None
+
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    wait = float(retry_after)
+                except ValueError:
+                    wait = SECONDARY_LIMIT_PAUSE
+                budget.secondary_limit_hits += 1
+            elif headers.get("X-RateLimit-Remaining") == "0":
+                wait = max(0.0, budget.reset_at - now) + 1
+                budget.primary_limit_hits += 1
+            elif response.status_code == 429 or "secondary rate limit" in (response.text or "").lower():
+                wait = SECONDARY_LIMIT_PAUSE
+                budget.secondary_limit_hits += 1
+            else:
+                # A plain permission error, not a rate limit
+                return None
+
+            budget.paused_until = max(budget.paused_until, now + wait)
+
+        logger.warning(f"Rate limited ({resource} budget for {credential}); paused for {wait:.0f}s")
+        return wait
+
+    def should_retry(self, credential: str, resource: str = "core") -> bool:
+        """Whether waiting for this credential to recover stays within `max_wait`."""
+        wait = self.wait_time(credential, resource)
+        if wait > self.max_wait:
+            logger.error(f"Rate limited for {wait:.0f}s ({resource} budget for {credential}); giving up on this request")
+            return False
+        return True
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current budget per credential/resource, for run summaries and dashboards."""
+        now = self._clock()
+        with self._lock:
+            return {
+                key: {
+                    "limit": b.limit,
+                    "remaining": b.remaining,
+                    "reset_in_seconds": max(0, round(b.reset_at - now)) if b.reset_at else None,
+                    "paced": bool(b.limit and b.remaining is not None and b.remaining < b.limit * self.low_water),
+                    "requests": b.requests,
+                    "throttled_seconds": round(b.throttled_seconds, 2),
+                    "primary_limit_hits": b.primary_limit_hits,
+                    "secondary_limit_hits": b.secondary_limit_hits,
+                }
+                for key, b in self._budgets.items()
+            }
@@ -2,6 +2,8 @@ import json
 from datetime import datetime
 from typing import Dict, Any
 
+from .osv_index import describe_match
+
 class ReportGenerator:
     def __init__(self, analysis_data: Dict[str, Any]):
         self.data = analysis_data
@@ -74,6 +76,24 @@ class ReportGenerator:
             for secret in signals.get('potential_secrets_found'):
                 # Redact actual secret part if displayed (here we just show file location mostly)
                 md.append(f"  - ⚠️ {secret}")
+        if signals.get('vulnerable_dependencies'):
+            md.append(f"- **Vulnerable Dependencies:** {len(signals['vulnerable_dependencies'])} of {len(signals.get('dependencies', []))}")
+            for dependency in signals['vulnerable_dependencies']:
+                md.append(f"  - 🚨 {describe_match(dependency)}")
+        if signals.get('dependency_audit_incomplete'):
+            md.append(f"- **Dependency Audit:** ⚠️ Incomplete, {len(signals['dependency_audit_incomplete'])} files not audited")
+            for skipped in signals['dependency_audit_incomplete']:
+                md.append(f"  - {skipped['path']} ({skipped['reason']})")
+        if signals.get('high_entropy_strings'):
+            md.append(f"- **High-Entropy Strings:** {len(signals['high_entropy_strings'])} found")
+            for evidence in signals['high_entropy_strings']:
+                md.append(f"  - ⚠️ {evidence}")
+        coverage = signals.get('scan_coverage')
+        if coverage and coverage['skipped']:
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in coverage['by_reason'].items())
+            md.append(f"- **Content Scan Coverage:** {coverage['skipped']} of {coverage['candidates']} files skipped ({reasons})")
+            for skip in signals['skipped_files']:
+                md.append(f"  - {skip['path']} ({skip['reason']})")
 
         md.append("")
         md.append("---")
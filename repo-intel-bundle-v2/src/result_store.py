@@ -0,0 +1,124 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from .blob_cache import cache_dir
+from .tree_cache import CompactTree
+
+logger = logging.getLogger(__name__)
+
+# Bump when detection or scoring changes so results computed by older code are not reused
+RESULT_VERSION = 10
+
+
+class ResultStore:
+    """
+    Persistent store of analysis results keyed by commit SHA.
+
+    A commit SHA pins the exact tree that was analyzed, so a stored result never
+    goes stale: re-analyzing the same commit returns it without touching the API.
+    The most recent result per repository is also tracked, as the baseline for
+    incremental re-analysis, along with the file listing it was computed from.
+    """
+
+    _shared: Dict[str, "ResultStore"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str):
+        self.directory = os.path.join(directory, "results", f"v{RESULT_VERSION}")
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultStore"]:
+        """
+        Returns the process-wide store under REPO_INTEL_CACHE_DIR, or None when
+        RESULT_CACHE is set to "false".
+        """
+        if os.getenv("RESULT_CACHE", "true").lower() in ("0", "false", "no"):
+            return None
+        directory = cache_dir()
+        with cls._shared_lock:
+            if directory not in cls._shared:
+                cls._shared[directory] = cls(directory)
+            return cls._shared[directory]
+
+    def _path(self, owner: str, repo: str, name: str) -> str:
+        return os.path.join(self.directory, owner.lower(), repo.lower(), f"{name}.json")
+
+    def _listing_path(self, owner: str, repo: str, commit_sha: str) -> str:
+        return os.path.join(self.directory, owner.lower(), repo.lower(), f"{commit_sha}.tree.gz")
+
+    def get(self, owner: str, repo: str, commit_sha: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored result for a commit, or None."""
+        return self._load(self._path(owner, repo, commit_sha))
+
+    def latest(self, owner: str, repo: str) -> Optional[Dict[str, Any]]:
+        """Returns the most recently stored result for a repository, or None."""
+        pointer = self._load(self._path(owner, repo, "latest"))
+        if not pointer:
+            return None
+        return self.get(owner, repo, pointer["commit_sha"])
+
+    def put(self, owner: str, repo: str, commit_sha: str, result: Dict[str, Any]):
+        """Stores a result and marks it as the latest for the repository."""
+        self._write(self._path(owner, repo, commit_sha), result)
+        self._write(self._path(owner, repo, "latest"), {"commit_sha": commit_sha})
+
+    def listing(self, owner: str, repo: str, commit_sha: str) -> Optional[CompactTree]:
+        """Returns the file listing stored for a commit, with each file's SHA, size and mode, or None."""
+        entries = []
+        try:
+            with gzip.open(self._listing_path(owner, repo, commit_sha), "rt", errors="surrogateescape") as f:
+                for line in f:
+                    sha, size, mode, path = line.rstrip("\n").split("\t", 3)
+                    entries.append({"path": path, "sha": sha or None, "size": int(size) if size else None,
+                                    "mode": mode or None})
+        except (OSError, EOFError, ValueError):
+            return None
+        return CompactTree(entries)
+
+    def put_listing(self, owner: str, repo: str, commit_sha: str, file_paths: Sequence[str]):
+        """
+        Stores the file listing a result was computed from, gzipped, one
+        "sha<TAB>size<TAB>mode<TAB>path" line per file (fields left empty where unknown).
+        """
+        path = self._listing_path(owner, repo, commit_sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        entries = file_paths.entries() if isinstance(file_paths, CompactTree) else ({"path": p} for p in file_paths)
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", errors="surrogateescape") as f:
+                for entry in entries:
+                    size = entry.get("size")
+                    f.write(f"{entry.get('sha') or ''}\t{'' if size is None else size}\t"
+                            f"{entry.get('mode') or ''}\t{entry['path']}\n")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store file listing at {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _load(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path: str, payload: Dict[str, Any]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store result at {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
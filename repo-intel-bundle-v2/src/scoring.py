@@ -34,9 +34,11 @@ def calculate_scores(signals: Dict[str, Any]) -> Dict[str, int]:
 
 
     # 3. Risk Score (Higher is WORSE)
-    # Start: 10. Increase for secrets, missing tests, old dependencies (not impl), missing CI.
+    # Start: 10. Increase for secrets, missing tests, vulnerable dependencies, missing CI.
     risk = 10
     if signals.get("has_secrets_smell"): risk += 40
+    if signals.get("has_vulnerable_dependencies"): risk += 20
+    elif signals.get("dependency_audit_incomplete"): risk += 10
     if not signals.get("has_tests"): risk += 20
     if not signals.get("has_ci"): risk += 10
     
@@ -5,9 +5,13 @@ import json
 import logging
 from dotenv import load_dotenv
 
-from .utils import setup_logging, get_env_var
-from .github_client import GitHubClient
-from .analyzer import RepoAnalyzer
+from .utils import setup_logging, get_env_var, get_github_tokens, run_sync
+from .github_client import GitHubClient, client_options_from_env, max_file_bytes_from_env
+from .async_github_client import AsyncGitHubClient
+from .local_git import LocalGitClient
+from .analyzer import RepoAnalyzer, AsyncRepoAnalyzer
+from .rate_limit import RateLimitScheduler
+from .result_store import ResultStore
 
 # Setup logic
 load_dotenv()
@@ -18,15 +22,22 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("repo-intel-bundle-v2")
 
 # Global dependencies (lazy loaded or verified on startup)
-github_token = os.getenv("GITHUB_TOKEN")
+# GITHUB_TOKENS (comma-separated) spreads requests over several tokens; GITHUB_TOKEN is used otherwise
+github_tokens = get_github_tokens()
 api_base = os.getenv("GITHUB_API_BASE_URL")
 output_dir = os.getenv("OUTPUT_DIR", "outputs")
+fetch_mode = os.getenv("GITHUB_FETCH_MODE", "contents")
+max_concurrency = int(os.getenv("GITHUB_MAX_CONCURRENCY", "8"))
+# When set, repos are read from local mirrors (<root>/<owner>/<repo>.git) instead of the GitHub API
+git_mirror_root = os.getenv("GIT_MIRROR_ROOT")
+# Re-analyze new commits from their diff against the latest stored result
+incremental = os.getenv("INCREMENTAL_ANALYSIS", "false").lower() in ("1", "true", "yes")
 
-if not github_token:
+if not github_tokens and not git_mirror_root:
     logger.warning("GITHUB_TOKEN not found in environment. Server may fail to fetch private repos or hit rate limits.")
 
 @mcp.tool()
-def analyze_repo(repo_url: str, ref: Optional[str] = None) -> str:
+def analyze_repo(repo_url: str, ref: Optional[str] = None, signals: Optional[List[str]] = None) -> str:
     """
     Analyzes a single GitHub repository and returns the JSON result.
     Does NOT write to file (use analyze_repos for that).
@@ -34,20 +45,34 @@ def analyze_repo(repo_url: str, ref: Optional[str] = None) -> str:
     Args:
         repo_url: Full URL of the repository (e.g., https://github.com/owner/repo)
         ref: Branch or commit hash (optional, defaults to repo default)
+        signals: Only compute these signals, e.g. ["has_tests", "has_ci"] (optional; the result
+            is then partial, without scores, findings or report)
     """
     logger.info(f"Analyzing repo: {repo_url} @ {ref or 'default'}")
     
-    if not github_token:
+    if not github_tokens and not git_mirror_root:
         return json.dumps({"error": "GITHUB_TOKEN is missing."})
 
+    client = None
     try:
-        client = GitHubClient(token=github_token, api_base_url=api_base)
-        analyzer = RepoAnalyzer(client)
-        result = analyzer.analyze(repo_url, ref)
+        if git_mirror_root:
+            client = LocalGitClient(git_mirror_root, max_file_bytes_from_env())
+            analyzer = RepoAnalyzer(client, result_store=ResultStore.from_env(), incremental=incremental)
+        else:
+            client = GitHubClient(token=github_tokens, api_base_url=api_base, **client_options_from_env())
+            analyzer = RepoAnalyzer(client, fetch_mode=fetch_mode, result_store=ResultStore.from_env(),
+                                    incremental=incremental)
+        result = analyzer.analyze(repo_url, ref, signals)
+        if signals:
+            # Only the requested signals; serializing lazy signals would evaluate every detector
+            result["signals"] = {name: result["signals"][name] for name in signals}
         return json.dumps(result, indent=2, default=str)
     except Exception as e:
         logger.error(f"Analysis failed: {e}", exc_info=True)
         return json.dumps({"error": str(e)})
+    finally:
+        if isinstance(client, LocalGitClient):
+            client.close()
 
 @mcp.tool()
 def analyze_repos(repo_urls: List[str], ref: Optional[str] = None, project_name: Optional[str] = None) -> str:
@@ -61,11 +86,14 @@ def analyze_repos(repo_urls: List[str], ref: Optional[str] = None, project_name:
     """
     import time
     
-    if not github_token:
+    if not github_tokens and not git_mirror_root:
         return json.dumps({"error": "GITHUB_TOKEN is missing."})
 
-    client = GitHubClient(token=github_token, api_base_url=api_base)
-    analyzer = RepoAnalyzer(client)
+    backend = LocalGitClient(git_mirror_root, max_file_bytes_from_env()) if git_mirror_root else None
+    client = AsyncGitHubClient(token=github_tokens, api_base_url=api_base, max_concurrency=max_concurrency,
+                               backend=backend, **client_options_from_env())
+    analyzer = AsyncRepoAnalyzer(client, fetch_mode="contents" if backend else fetch_mode,
+                                 result_store=ResultStore.from_env(), incremental=incremental)
 
     # Determine output folder
     if not project_name:
@@ -83,12 +111,22 @@ def analyze_repos(repo_urls: List[str], ref: Optional[str] = None, project_name:
         "failures": []
     }
     
-    for url in repo_urls:
+    logger.info(f"Processing {len(repo_urls)} repos (max concurrency {max_concurrency})...")
+    try:
+        # 1. Analyze (all repos overlap, bounded by the client's concurrency limit)
+        outcomes = run_sync(analyzer.analyze_many(repo_urls, ref))
+    finally:
+        client.close()
+    # Remaining API budget after the run, so large portfolios can be planned around it
+    summary["rate_limit"] = RateLimitScheduler.shared().snapshot()
+    # Per-endpoint latency, error and retry counts for the run
+    summary["http"] = client.http_metrics()
+
+    for url, result in zip(repo_urls, outcomes):
         try:
-            logger.info(f"Processing {url}...")
-            # 1. Analyze
-            result = analyzer.analyze(url, ref)
-            
+            if isinstance(result, Exception):
+                raise result
+
             # 2. Write Individual Outputs
             owner = result["metadata"]["owner"]
             repo = result["metadata"]["repo"]
@@ -0,0 +1,113 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NEGATIVE_TTL = 60
+NEGATIVE_CACHE_MAX_ENTRIES = 10000
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and receive the same result (or exception) instead of
+    issuing an identical HTTP request. Nothing is cached once the call returns.
+    """
+
+    _instance: Optional["SingleFlight"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "SingleFlight":
+        """Returns the process-wide instance, so separate clients coalesce too."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Runs `fn` once per in-flight key. Returns (result, shared), where shared means another caller ran it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class NegativeCache:
+    """Remembers keys that returned 404 for `ttl` seconds, so repeated misses skip the request."""
+
+    _instance: Optional["NegativeCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, ttl: float = DEFAULT_NEGATIVE_TTL, max_entries: int = NEGATIVE_CACHE_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        # key -> expiry, oldest first
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "NegativeCache":
+        """Returns the process-wide cache with a TTL from GITHUB_NEGATIVE_CACHE_TTL (0 disables it)."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(ttl=float(os.getenv("GITHUB_NEGATIVE_CACHE_TTL", DEFAULT_NEGATIVE_TTL)))
+            return cls._instance
+
+    def add(self, key: str):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = self._clock() + self.ttl
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expiry = self._entries.get(key)
+            if expiry is None:
+                return False
+            if self._clock() >= expiry:
+                del self._entries[key]
+                return False
+            return True
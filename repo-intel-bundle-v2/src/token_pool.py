@@ -0,0 +1,83 @@
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Union
+
+from .rate_limit import RateLimitScheduler, credential_id
+
+logger = logging.getLogger(__name__)
+
+
+class TokenPool:
+    """
+    Spreads requests over several GitHub tokens.
+
+    Each request goes to the token with the most remaining quota for its
+    resource, as tracked by the shared RateLimitScheduler. A token that is
+    exhausted or paused by a secondary limit is retired until it can send
+    again; if every token is retired, the one that recovers first is used
+    and the scheduler waits for it.
+    """
+
+    def __init__(self, tokens: Union[str, List[str]], scheduler: RateLimitScheduler):
+        if isinstance(tokens, str):
+            tokens = [t.strip() for t in tokens.split(",")]
+        # Keep order, drop blanks and duplicates
+        self.tokens = list(dict.fromkeys(t for t in tokens if t))
+        if not self.tokens:
+            self.tokens = [""]
+        self.scheduler = scheduler
+        self._credentials = {token: credential_id(token) for token in self.tokens}
+        # Requests routed per token; breaks ties so tokens without quota info yet share the load
+        self._sent = Counter()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def credential(self, token: str) -> str:
+        return self._credentials[token]
+
+    @property
+    def credentials(self) -> List[str]:
+        return list(self._credentials.values())
+
+    def select(self, resource: str = "core") -> str:
+        """Picks the token to send the next request with."""
+        if len(self.tokens) == 1:
+            return self.tokens[0]
+
+        best, best_score = None, None
+        earliest, earliest_wait = self.tokens[0], float("inf")
+        for token in self.tokens:
+            credential = self._credentials[token]
+            wait = self.scheduler.wait_time(credential, resource)
+            if wait > 0:
+                # Retired until its pause ends or its window resets
+                if wait < earliest_wait:
+                    earliest, earliest_wait = token, wait
+                continue
+            remaining = self.scheduler.remaining(credential, resource)
+            # Tokens we have not heard back about yet are assumed fresh
+            score = (float("inf") if remaining is None else remaining, -self._sent[token])
+            if best_score is None or score > best_score:
+                best, best_score = token, score
+
+        if best is None:
+            logger.warning(f"All {len(self.tokens)} tokens are exhausted for '{resource}'; "
+                           f"waiting {earliest_wait:.0f}s for the first to recover")
+            best = earliest
+        with self._lock:
+            self._sent[best] += 1
+        return best
+
+    def status(self, resource: str = "core") -> List[Dict]:
+        """Per-token quota view (by credential id, never the token itself)."""
+        return [
+            {
+                "credential": self._credentials[token],
+                "remaining": self.scheduler.remaining(self._credentials[token], resource),
+                "retired_for_seconds": round(self.scheduler.wait_time(self._credentials[token], resource)),
+            }
+            for token in self.tokens
+        ]
@@ -0,0 +1,190 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_POOL_SIZE = 8
+# Full-jitter exponential backoff: sleep uniformly in [0, min(cap, base * 2^attempt)]
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = (500, 502, 503, 504)
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_REPO_PATH = re.compile(r"/repos/[^/]+/[^/]+(?:/([^/?]+)(?:/([^/?]+))?)?")
+
+
+def endpoint_name(url: str) -> str:
+    """Groups a request URL by API endpoint ("repo", "contents", "trees", "graphql", ...) for metrics."""
+    path = urlparse(url).path
+    if path.endswith("/graphql"):
+        return "graphql"
+    match = _REPO_PATH.search(path)
+    if not match:
+        return path.rstrip("/").rsplit("/", 1)[-1] or "root"
+    section, sub = match.groups()
+    if section is None:
+        return "repo"
+    return sub if section == "git" and sub else section
+
+
+class _EndpointStats:
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "buckets", "retries")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.retries: Counter = Counter()
+
+    def percentile(self, q: float) -> Optional[int]:
+        """Upper bound of the bucket holding the q-th quantile (None when above the last bound)."""
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= target:
+                return bound
+        return None
+
+
+class TransportMetrics:
+    """Per-endpoint latency histograms, error and retry counters for one transport."""
+
+    def __init__(self):
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, endpoint: str) -> _EndpointStats:
+        return self._endpoints.setdefault(endpoint, _EndpointStats())
+
+    def observe(self, endpoint: str, seconds: float, error: bool = False):
+        ms = seconds * 1000
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.count += 1
+            stats.errors += int(error)
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+            bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+            stats.buckets[bucket] += 1
+
+    def retry(self, endpoint: str, reason: str):
+        with self._lock:
+            self._stats(endpoint).retries[reason] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics per endpoint, for run summaries. Percentiles are histogram bucket bounds."""
+        labels = [f"le_{b}ms" for b in LATENCY_BUCKETS_MS] + [f"gt_{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": s.count,
+                    "errors": s.errors,
+                    "retries": dict(s.retries),
+                    "mean_ms": round(s.total_ms / s.count, 1) if s.count else 0,
+                    "p50_ms": s.percentile(0.5),
+                    "p95_ms": s.percentile(0.95),
+                    "max_ms": round(s.max_ms, 1),
+                    "histogram": {label: n for label, n in zip(labels, s.buckets) if n},
+                }
+                for endpoint, s in sorted(self._endpoints.items())
+            }
+
+    def log_summary(self):
+        for endpoint, s in self.snapshot().items():
+            retries = sum(s["retries"].values())
+            logger.info(f"HTTP {endpoint}: {s['requests']} requests, p50<={s['p50_ms']}ms p95<={s['p95_ms']}ms "
+                        f"max {s['max_ms']}ms, {s['errors']} errors, {retries} retries")
+
+
+class Transport:
+    """
+    The HTTP layer under GitHubClient: one pooled `requests.Session` with explicit
+    connect/read timeouts, jittered exponential backoff on connection errors,
+    timeouts and 5xx responses for idempotent requests, and per-endpoint metrics.
+    Rate-limit responses are returned as-is; RateLimitScheduler owns those.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 sleep: Callable[[float], None] = time.sleep, jitter: Callable[[], float] = random.random):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.metrics = TransportMetrics()
+        self._sleep = sleep
+        self._jitter = jitter
+        self.session = requests.Session()
+        self.resize(pool_size)
+
+    @classmethod
+    def from_env(cls) -> "Transport":
+        """Configured from GITHUB_CONNECT_TIMEOUT, GITHUB_READ_TIMEOUT, GITHUB_MAX_RETRIES and GITHUB_MAX_CONCURRENCY."""
+        return cls(
+            pool_size=int(os.getenv("GITHUB_MAX_CONCURRENCY", DEFAULT_POOL_SIZE)),
+            connect_timeout=float(os.getenv("GITHUB_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+            read_timeout=float(os.getenv("GITHUB_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+            max_retries=int(os.getenv("GITHUB_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        )
+
+    def resize(self, pool_size: int):
+        """Keeps one keep-alive connection per concurrent worker instead of urllib3's default of 10 per host."""
+        self.pool_size = max(1, pool_size)
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def backoff(self, attempt: int) -> float:
+        return self._jitter() * min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt))
+
+    def send(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Sends a request, retrying transient failures up to `max_retries` times. Only
+        GET/HEAD are retried unless `retry` says the request is safe to repeat.
+        Latency is measured to the response headers, so streamed bodies are not included.
+        """
+        endpoint = endpoint_name(url)
+        retryable = retry if retry is not None else method in ("GET", "HEAD")
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.metrics.observe(endpoint, time.perf_counter() - start, error=True)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                reason = "timeout" if isinstance(e, requests.exceptions.Timeout) else "connection"
+            else:
+                failed = response.status_code in RETRY_STATUSES
+                self.metrics.observe(endpoint, time.perf_counter() - start, error=failed)
+                if not failed or not retryable or attempt >= self.max_retries:
+                    return response
+                response.close()
+                reason = str(response.status_code)
+
+            delay = self.backoff(attempt)
+            attempt += 1
+            self.metrics.retry(endpoint, reason)
+            logger.warning(f"{method} {endpoint} failed ({reason}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            self._sleep(delay)
+
+    def close(self):
+        self.metrics.log_summary()
+        self.session.close()
@@ -0,0 +1,187 @@
+import logging
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 256
+_NO_SHA = bytes(20)
+
+
+class CompactTree(Sequence):
+    """
+    Read-only file listing that stores each path as (directory id, basename).
+
+    Directory prefixes and basenames are kept once in small tables, and per-file
+    blob SHAs, sizes and modes live in packed arrays, so a 300k-path monorepo
+    costs a fraction of a list of full path strings plus per-path dicts. It
+    behaves as a list of paths (in the order the tree was listed) for
+    SignalDetector, with `sha()`, `size()` and `mode()` lookups by path.
+    """
+
+    __slots__ = ("_dirs", "_dir_ids", "_names", "_shas", "_sizes", "_modes", "_order", "nbytes", "__weakref__")
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]):
+        dirs: List[str] = []
+        dir_lookup: Dict[str, int] = {}
+        name_lookup: Dict[str, str] = {}
+        self._dir_ids = array("I")
+        self._names: List[str] = []
+        shas = bytearray()
+        self._sizes = array("q")
+        self._modes = array("I")
+        for entry in entries:
+            directory, _, name = entry["path"].rpartition("/")
+            prefix = f"{directory}/" if directory else ""
+            dir_id = dir_lookup.get(prefix)
+            if dir_id is None:
+                dir_id = dir_lookup[prefix] = len(dirs)
+                dirs.append(prefix)
+            self._dir_ids.append(dir_id)
+            self._names.append(name_lookup.setdefault(name, name))
+            shas += bytes.fromhex(entry["sha"]) if entry.get("sha") else _NO_SHA
+            self._sizes.append(entry["size"] if entry.get("size") is not None else -1)
+            self._modes.append(int(entry["mode"], 8) if entry.get("mode") else 0)
+        self._dirs = dirs
+        self._shas = bytes(shas)
+        # Positions sorted by path, for binary-search lookups without a path -> index dict
+        self._order = array("I", sorted(range(len(self._names)), key=self.__getitem__))
+        self.nbytes = (
+            sum(sys.getsizeof(d) for d in dirs)
+            + sum(sys.getsizeof(n) for n in name_lookup)
+            + sys.getsizeof(self._names)
+            + len(self._shas)
+            + sum(a.itemsize * len(a) for a in (self._dir_ids, self._sizes, self._modes, self._order))
+        )
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._dirs[self._dir_ids[index]] + self._names[index]
+
+    def __iter__(self) -> Iterator[str]:
+        dirs = self._dirs
+        for dir_id, name in zip(self._dir_ids, self._names):
+            yield dirs[dir_id] + name
+
+    @property
+    def sizes(self) -> Sequence[int]:
+        """Sizes in listing order, -1 where unknown."""
+        return self._sizes
+
+    @property
+    def modes(self) -> Sequence[int]:
+        """Modes as integers in listing order, 0 where unknown."""
+        return self._modes
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Entries in listing order, shaped like the input: {"path", "sha", "size", "mode"}, None where unknown."""
+        for i, path in enumerate(self):
+            raw = self._shas[i * 20:(i + 1) * 20]
+            yield {
+                "path": path,
+                "sha": raw.hex() if raw != _NO_SHA else None,
+                "size": self._sizes[i] if self._sizes[i] >= 0 else None,
+                "mode": f"{self._modes[i]:o}" if self._modes[i] else None
+            }
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self._find(path) is not None
+
+    def __repr__(self) -> str:
+        return f"<CompactTree {len(self)} paths, {self.nbytes} bytes>"
+
+    def _find(self, path: str) -> Optional[int]:
+        lo = bisect_left(self._order, path, key=self.__getitem__)
+        if lo < len(self._order) and self[self._order[lo]] == path:
+            return self._order[lo]
+        return None
+
+    def index(self, path: str, *args) -> int:
+        found = self._find(path)
+        if found is None:
+            raise ValueError(f"{path!r} is not in tree")
+        return found
+
+    def sha(self, path: str) -> Optional[str]:
+        """Blob SHA of a path, or None when unknown."""
+        i = self._find(path)
+        if i is None:
+            return None
+        raw = self._shas[i * 20:(i + 1) * 20]
+        return raw.hex() if raw != _NO_SHA else None
+
+    def size(self, path: str) -> Optional[int]:
+        """Size in bytes of a path, or None when unknown."""
+        i = self._find(path)
+        return self._sizes[i] if i is not None and self._sizes[i] >= 0 else None
+
+    def mode(self, path: str) -> Optional[str]:
+        """Git file mode of a path (e.g. "100644"), or None when unknown."""
+        i = self._find(path)
+        return f"{self._modes[i]:o}" if i is not None and self._modes[i] else None
+
+
+class TreeCache:
+    """
+    Process-wide LRU of CompactTrees keyed by owner/repo@commit SHA.
+
+    Only trees addressed by commit SHA belong here: their content can never
+    change, so every client in the process can share them across analyses.
+    Eviction is driven by the trees' estimated memory, bounded by `max_bytes`.
+    """
+
+    _instance: Optional["TreeCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: "OrderedDict[str, CompactTree]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "TreeCache":
+        """Returns the process-wide cache, bounded by TREE_CACHE_MAX_MB (0 keeps nothing)."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(int(os.getenv("TREE_CACHE_MAX_MB", str(DEFAULT_MAX_MB))) * 1024 * 1024)
+            return cls._instance
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: str) -> Optional[CompactTree]:
+        with self._lock:
+            tree = self._entries.get(key)
+            if tree is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return tree
+
+    def put(self, key: str, tree: CompactTree):
+        if tree.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.nbytes
+            self._entries[key] = tree
+            self._total_bytes += tree.nbytes
+            while self._total_bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+                self.stats["evictions"] += 1
+                logger.debug(f"Evicted tree {evicted_key} ({evicted.nbytes} bytes)")
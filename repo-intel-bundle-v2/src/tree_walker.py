@@ -0,0 +1,141 @@
+import fnmatch
+import logging
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Vendored or generated directories that dominate monorepo trees but carry no signal of their own
+DEFAULT_IGNORE_DIRS = ("node_modules", "vendor", "third_party")
+DEFAULT_MAX_WORKERS = 8
+# Subtrees fetched per round; bounds how many listings are held in memory at once
+CHUNK_SIZE = 256
+# Budget for one walk, after which the listing is returned partial
+DEFAULT_MAX_REQUESTS = 5000
+DEFAULT_DEADLINE_SECONDS = 300
+
+
+class TreeWalker:
+    """
+    Lists a tree that is too large for GitHub's recursive trees endpoint.
+
+    Walks the tree level by level with non-recursive `git/trees/<sha>` calls,
+    fetching each level's subtrees in parallel. Directories matching
+    `ignore_dirs` (fnmatch patterns against the directory name, or against the
+    full path when the pattern contains "/") are not descended into.
+
+    With an `executor` (the caller's worker pool), listings run on its workers
+    and the calling thread lists any that have not started yet itself, so the
+    walk stays within the caller's concurrency limit without waiting on a busy
+    pool. A walk stops after `max_requests` listings or `deadline_seconds`; the
+    directories it did not reach are returned so the listing can be flagged partial.
+    """
+
+    def __init__(self, client, max_workers: int = DEFAULT_MAX_WORKERS,
+                 ignore_dirs: Sequence[str] = DEFAULT_IGNORE_DIRS, executor: Optional[Executor] = None,
+                 max_requests: Optional[int] = DEFAULT_MAX_REQUESTS,
+                 deadline_seconds: Optional[float] = DEFAULT_DEADLINE_SECONDS):
+        self.client = client
+        self.max_workers = max(1, max_workers)
+        self.ignore_dirs = tuple(ignore_dirs)
+        self.executor = executor
+        self.max_requests = max_requests
+        self.deadline_seconds = deadline_seconds
+
+    @classmethod
+    def from_env(cls, client, executor: Optional[Executor] = None) -> "TreeWalker":
+        """
+        Configured from GITHUB_MAX_CONCURRENCY, GITHUB_TREE_IGNORE_DIRS (comma-separated, empty to
+        walk everything), GITHUB_TREE_MAX_REQUESTS and GITHUB_TREE_DEADLINE_SECONDS (0 for no limit).
+        """
+        ignore = os.getenv("GITHUB_TREE_IGNORE_DIRS")
+        max_requests = int(os.getenv("GITHUB_TREE_MAX_REQUESTS", DEFAULT_MAX_REQUESTS))
+        deadline = float(os.getenv("GITHUB_TREE_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS))
+        return cls(
+            client,
+            max_workers=int(os.getenv("GITHUB_MAX_CONCURRENCY", DEFAULT_MAX_WORKERS)),
+            ignore_dirs=DEFAULT_IGNORE_DIRS if ignore is None else [p.strip() for p in ignore.split(",") if p.strip()],
+            executor=executor,
+            max_requests=max_requests if max_requests > 0 else None,
+            deadline_seconds=deadline if deadline > 0 else None,
+        )
+
+    def ignored(self, path: str) -> bool:
+        name = path.rsplit("/", 1)[-1]
+        return any(fnmatch.fnmatchcase(path if "/" in pattern else name, pattern) for pattern in self.ignore_dirs)
+
+    def walk(self, owner: str, repo: str, tree_sha: str) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        """
+        Returns (blob entries with full paths, skipped directories, unwalked directories)
+        for the tree. Entries keep the trees API fields (`path`, `mode`, `type`, `sha`, `size`).
+        Unwalked directories are those left when the request or time budget ran out.
+        """
+        if self.executor is not None:
+            return self._walk(owner, repo, tree_sha, self.executor)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tree-walker") as pool:
+            return self._walk(owner, repo, tree_sha, pool)
+
+    def _walk(self, owner: str, repo: str, tree_sha: str, pool: Executor) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        blobs: List[Dict[str, Any]] = []
+        skipped: List[str] = []
+        unwalked: List[str] = []
+        deadline = time.monotonic() + self.deadline_seconds if self.deadline_seconds is not None else None
+        requests = 0
+        level = [("", tree_sha)]
+        depth = 0
+        while level:
+            next_level = []
+            for start in range(0, len(level), CHUNK_SIZE):
+                chunk = level[start:start + CHUNK_SIZE]
+                if self.max_requests is not None:
+                    chunk = chunk[:max(0, self.max_requests - requests)]
+                if not chunk or (deadline is not None and time.monotonic() > deadline):
+                    unwalked.extend(prefix.rstrip("/") or "/" for prefix, _ in level[start:])
+                    break
+                if start + len(chunk) < min(start + CHUNK_SIZE, len(level)):
+                    unwalked.extend(prefix.rstrip("/") for prefix, _ in level[start + len(chunk):])
+                requests += len(chunk)
+                for (prefix, _), entries in zip(chunk, self._list_all(pool, owner, repo, chunk)):
+                    for entry in entries:
+                        path = f"{prefix}{entry['path']}"
+                        if entry["type"] == "tree":
+                            if self.ignored(path):
+                                skipped.append(path)
+                            else:
+                                next_level.append((f"{path}/", entry["sha"]))
+                        elif entry["type"] == "blob":
+                            blobs.append(dict(entry, path=path))
+                if unwalked:
+                    break
+            logger.debug(f"Walked level {depth} of {owner}/{repo}: {len(level)} trees, {len(next_level)} subtrees next")
+            if unwalked:
+                unwalked.extend(prefix.rstrip("/") for prefix, _ in next_level)
+                break
+            level = next_level
+            depth += 1
+
+        if skipped:
+            logger.info(f"Skipped {len(skipped)} ignored directories in {owner}/{repo} (e.g. {', '.join(skipped[:3])})")
+        if unwalked:
+            logger.warning(f"Tree walk of {owner}/{repo} ran out of budget after {requests} listings; "
+                           f"{len(unwalked)} directories not listed (e.g. {', '.join(unwalked[:3])})")
+        return blobs, skipped, unwalked
+
+    def _list_all(self, pool: Executor, owner: str, repo: str, chunk: List[Tuple[str, str]]) -> List[List[Dict[str, Any]]]:
+        futures = [pool.submit(self._list, owner, repo, prefix, sha) for prefix, sha in chunk]
+        # Listings still queued are run here rather than waited on, so a walk driven from a
+        # worker of a shared pool cannot deadlock it
+        return [self._list(owner, repo, prefix, sha) if future.cancel() else future.result()
+                for (prefix, sha), future in zip(chunk, futures)]
+
+    def _list(self, owner: str, repo: str, prefix: str, tree_sha: str) -> List[Dict[str, Any]]:
+        # Tree SHAs are immutable, so listings stored by earlier runs are reused without a request
+        url = f"{self.client.api_base_url}/repos/{owner}/{repo}/git/trees/{tree_sha}"
+        data = self.client._get_json(url, owner, repo, immutable=True)
+        self.client._count(owner, repo, "subtree_calls")
+        if data.get("truncated", False):
+            # A single directory over the API limit; nothing smaller to fall back to
+            logger.warning(f"Subtree {prefix or '/'} of {owner}/{repo} is truncated.")
+        return data.get("tree", [])
@@ -1,6 +1,9 @@
+import asyncio
 import logging
 import os
 import sys
+import threading
+from typing import List
 
 def setup_logging(level=logging.INFO):
     """Configures logging for the application."""
@@ -16,3 +19,37 @@ def get_env_var(name: str, default: str = None, required: bool = False) -> str:
     if required and not value:
         raise ValueError(f"Environment variable {name} is required but not set.")
     return value
+
+def get_github_tokens() -> List[str]:
+    """
+    GitHub tokens to spread requests over: GITHUB_TOKENS (comma-separated) when set,
+    otherwise the single GITHUB_TOKEN. Returns an empty list when neither is set.
+    """
+    raw = os.getenv("GITHUB_TOKENS") or os.getenv("GITHUB_TOKEN") or ""
+    return [t.strip() for t in raw.split(",") if t.strip()]
+
+def run_sync(coro):
+    """
+    Runs a coroutine to completion from synchronous code.
+    Works even when called from inside a running event loop (e.g. a sync MCP tool)
+    by driving the coroutine on a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    outcome = {}
+
+    def runner():
+        try:
+            outcome["result"] = asyncio.run(coro)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
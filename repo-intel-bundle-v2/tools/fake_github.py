@@ -0,0 +1,592 @@
+import argparse
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import re
+import tarfile
+import threading
+import time
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BRANCH = "main"
+
+
+def git_blob_sha(content: bytes) -> str:
+    """Computes the git object id of a blob, as returned by the trees API."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def synthetic_repo(files: int = 200, yaml_files: int = 50, dockerfiles: int = 1, seed: int = 0) -> Dict[str, bytes]:
+    """
+    Generates a deterministic repository layout with the shapes SignalDetector looks for:
+    a README, manifests, CI workflows, tests, Kubernetes YAML and Dockerfiles.
+    """
+    rng = random.Random(seed)
+    repo = {
+        "README.md": b"# Synthetic repository\n",
+        "requirements.txt": b"requests==2.31.0\n",
+        ".github/workflows/ci.yml": b"name: ci\non: [push]\njobs: {}\n",
+        "tests/test_app.py": b"def test_ok():\n    assert True\n",
+    }
+
+    for i in range(dockerfiles):
+        path = "Dockerfile" if i == 0 else f"services/svc{i}/Dockerfile"
+        repo[path] = b"FROM python:3.12-slim\nUSER app\nHEALTHCHECK CMD true\n"
+
+    for i in range(yaml_files):
+        if i % 2 == 0:
+            body = f"apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: cm-{i}\n"
+        else:
+            body = f"key_{i}: value_{rng.randint(0, 10**6)}\n"
+        repo[f"deploy/{i // 50}/resource_{i}.yaml"] = body.encode()
+
+    remaining = max(0, files - len(repo))
+    for i in range(remaining):
+        package = f"pkg{i // 100}"
+        body = "\n".join(f"value_{j} = {rng.randint(0, 10**9)}" for j in range(20))
+        repo[f"src/{package}/module_{i}.py"] = body.encode()
+
+    return repo
+
+
+class Cassette:
+    """
+    Recorded API interactions, keyed by method, path and request body.
+
+    Only the response headers the client relies on are kept, and request
+    headers (including Authorization) are never stored, so cassettes are safe
+    to commit. Rate-limit headers are left out too: replays get them from the
+    fake server's own rate-limit emulation instead.
+    """
+
+    KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link", "Content-Range")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                for item in json.load(f).get("interactions", []):
+                    self.interactions[item["key"]] = item
+
+    @staticmethod
+    def key(method: str, path: str, body: bytes = b"") -> str:
+        return f"{method} {path} {hashlib.sha1(body).hexdigest() if body else '-'}"
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.interactions.get(key)
+
+    def record(self, key: str, status: int, headers: Dict[str, str], body: bytes):
+        with self._lock:
+            self.interactions[key] = {
+                "key": key,
+                "status": status,
+                "headers": {k: headers[k] for k in self.KEPT_HEADERS if k in headers},
+                "body": base64.b64encode(body).decode(),
+            }
+
+    def save(self):
+        with self._lock:
+            payload = {"version": 1, "interactions": sorted(self.interactions.values(), key=lambda i: i["key"])}
+        with open(self.path, "w") as f:
+            json.dump(payload, f, indent=1)
+
+
+class FakeGitHubState:
+    """Repositories served by the fake API plus per-endpoint request counters."""
+
+    def __init__(self, repos: Dict[str, Dict[str, bytes]], tree_limit: Optional[int] = None,
+                 latency: float = 0.0, rate_limit: Optional[int] = None, rate_limit_window: int = 3600,
+                 cassette: Optional[Cassette] = None, upstream: Optional[str] = None):
+        self.repos = repos
+        # Entries a recursive tree listing may return before it is marked truncated
+        self.tree_limit = tree_limit
+        # Seconds added to every response
+        self.latency = latency
+        # Requests per token and resource per window; None sends no rate-limit headers
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        # Replay recorded responses from the cassette, or record them from `upstream` when set
+        self.cassette = cassette
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._trees: Dict[str, Tuple[str, Dict[str, List[Dict[str, Any]]]]] = {}
+        # full_name -> {commit SHA: files} for every version pushed, so older commits can be compared
+        self.history: Dict[str, Dict[str, Dict[str, bytes]]] = {}
+        # (credential, resource) -> [used, reset epoch seconds]
+        self._windows: Dict[Tuple[str, str], List[int]] = {}
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.stats[endpoint] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats.clear()
+
+    def _window(self, credential: str, resource: str) -> List[int]:
+        now = time.time()
+        window = self._windows.get((credential, resource))
+        if window is None or now >= window[1]:
+            window = self._windows[(credential, resource)] = [0, int(now) + self.rate_limit_window]
+        return window
+
+    def rate_limit_exhausted(self, credential: str, resource: str) -> bool:
+        if self.rate_limit is None:
+            return False
+        with self._lock:
+            used, _ = self._window(credential, resource)
+            return used >= self.rate_limit
+
+    def rate_limit_headers(self, credential: str, resource: str, counted: bool) -> Dict[str, str]:
+        """Charges a request to the window (unless `counted` is False, e.g. a 304) and returns GitHub's headers."""
+        if self.rate_limit is None:
+            return {}
+        with self._lock:
+            window = self._window(credential, resource)
+            if counted:
+                window[0] = min(self.rate_limit, window[0] + 1)
+            used, reset_at = window
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.rate_limit - used),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def commit_sha(self, full_name: str) -> str:
+        return self.commit_sha_of(self.repos[full_name])
+
+    @staticmethod
+    def commit_sha_of(files: Dict[str, bytes]) -> str:
+        digest = hashlib.sha1()
+        for path in sorted(files):
+            digest.update(path.encode() + b"\0" + git_blob_sha(files[path]).encode())
+        return digest.hexdigest()
+
+    def push(self, full_name: str, files: Dict[str, bytes]) -> str:
+        """Replaces a repo's files with a new commit, keeping the old one comparable. Returns the new SHA."""
+        with self._lock:
+            if full_name in self.repos:
+                old = self.repos[full_name]
+                self.history.setdefault(full_name, {})[self.commit_sha_of(old)] = old
+            self.repos[full_name] = files
+            self._trees.pop(full_name, None)
+        return self.commit_sha(full_name)
+
+    def snapshot(self, full_name: str, ref: str) -> Optional[Dict[str, bytes]]:
+        """Files at a commit SHA (full or 7+ characters), the default branch or HEAD."""
+        if ref in (DEFAULT_BRANCH, "HEAD") or (len(ref) >= 7 and self.commit_sha(full_name).startswith(ref)):
+            return self.repos[full_name]
+        for sha, files in self.history.get(full_name, {}).items():
+            if len(ref) >= 7 and sha.startswith(ref):
+                return files
+        return None
+
+    def trees(self, full_name: str) -> Tuple[str, Dict[str, List[Dict[str, Any]]]]:
+        """Returns (root tree SHA, {tree SHA: non-recursive entries}) for a repo, built once."""
+        with self._lock:
+            if full_name not in self._trees:
+                self._trees[full_name] = self._build_trees(self.repos[full_name])
+            return self._trees[full_name]
+
+    @staticmethod
+    def _build_trees(files: Dict[str, bytes]) -> Tuple[str, Dict[str, List[Dict[str, Any]]]]:
+        children: Dict[str, List[Dict[str, Any]]] = {"": []}
+        for path in sorted(files):
+            parts = path.split("/")
+            for i in range(1, len(parts)):
+                children.setdefault("/".join(parts[:i]), [])
+            children["/".join(parts[:-1])].append({
+                "path": parts[-1],
+                "mode": "100644",
+                "type": "blob",
+                "sha": git_blob_sha(files[path]),
+                "size": len(files[path]),
+            })
+
+        # Hash directories deepest first so each parent can reference its children's SHAs
+        trees, dir_shas = {}, {}
+        for directory in sorted(children, key=lambda d: -d.count("/") if d else 1):
+            entries = children[directory] + [
+                {"path": d.rsplit("/", 1)[-1], "mode": "040000", "type": "tree", "sha": dir_shas[d]}
+                for d in sorted(children)
+                if d and d.rpartition("/")[0] == directory
+            ]
+            entries.sort(key=lambda e: e["path"])
+            sha = hashlib.sha1(json.dumps(entries, sort_keys=True).encode()).hexdigest()
+            dir_shas[directory] = sha
+            trees[sha] = entries
+        return dir_shas[""], trees
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    state: FakeGitHubState = None
+
+    ROUTES = [
+        ("tree", re.compile(r"^/repos/([^/]+)/([^/]+)/git/trees/(.+)$")),
+        ("commit", re.compile(r"^/repos/([^/]+)/([^/]+)/commits/(.+)$")),
+        ("compare", re.compile(r"^/repos/([^/]+)/([^/]+)/compare/([^/]+)\.\.\.([^/]+)$")),
+        ("contents", re.compile(r"^/repos/([^/]+)/([^/]+)/contents/(.+)$")),
+        ("tarball", re.compile(r"^/repos/([^/]+)/([^/]+)/tarball/(.+)$")),
+        ("zipball", re.compile(r"^/repos/([^/]+)/([^/]+)/zipball/(.+)$")),
+        ("repo", re.compile(r"^/repos/([^/]+)/([^/]+)$")),
+    ]
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def do_POST(self):
+        self._serve("POST")
+
+    def _serve(self, method: str):
+        parsed = urlparse(self.path)
+        self._credential = None
+        if parsed.path == "/_stats":
+            return self._send_json(dict(self.state.stats))
+
+        self.state.count("requests")
+        length = int(self.headers.get("Content-Length", 0))
+        self._body = self.rfile.read(length) if length else b""
+        self._resource = "graphql" if parsed.path.endswith("/graphql") else "core"
+        self._credential = self.headers.get("Authorization", "")
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+        if self.state.rate_limit_exhausted(self._credential, self._resource):
+            self.state.count("rate_limited")
+            return self._send_bytes(json.dumps({"message": "API rate limit exceeded"}).encode(), "application/json", 403)
+
+        if self.state.cassette is not None:
+            key = Cassette.key(method, self.path, self._body)
+            if self.state.upstream:
+                return self._record(method, key)
+            if self._replay(key):
+                return
+        if method == "GET":
+            self._route_get(parsed)
+        else:
+            self._route_post(parsed)
+
+    def _record(self, method: str, key: str):
+        """Forwards the request upstream with the caller's own headers and stores the response."""
+        headers = {k: v for k, v in self.headers.items() if k.lower() in ("authorization", "accept", "x-github-api-version", "range")}
+        self.state.count("recorded")
+        response = requests.request(method, f"{self.state.upstream}{self.path}", headers=headers,
+                                    data=self._body or None, timeout=60)
+        self.state.cassette.record(key, response.status_code, response.headers, response.content)
+        self._send_bytes(response.content, response.headers.get("Content-Type", "application/json"),
+                         response.status_code, {k: response.headers[k] for k in Cassette.KEPT_HEADERS[1:] if k in response.headers})
+
+    def _replay(self, key: str) -> bool:
+        interaction = self.state.cassette.lookup(key)
+        if interaction is None:
+            self.state.count("cassette_miss")
+            return False
+        self.state.count("replayed")
+        headers = dict(interaction["headers"])
+        content_type = headers.pop("Content-Type", "application/json")
+        etag = headers.get("ETag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.state.count("not_modified")
+            return self._send_bytes(b"", content_type, 304, {"ETag": etag})
+        self._send_bytes(base64.b64decode(interaction["body"]), content_type, interaction["status"], headers)
+        return True
+
+    def _route_get(self, parsed):
+        query = parse_qs(parsed.query)
+        for endpoint, pattern in self.ROUTES:
+            match = pattern.match(parsed.path)
+            if not match:
+                continue
+            self.state.count(endpoint)
+            owner, repo = match.group(1), match.group(2)
+            full_name = f"{owner}/{repo}"
+            if full_name not in self.state.repos:
+                return self._send_json({"message": "Not Found"}, status=404)
+            handler = getattr(self, f"_handle_{endpoint}")
+            return handler(full_name, *match.groups()[2:], query=query)
+
+        self.state.count("unknown")
+        self._send_json({"message": "Not Found"}, status=404)
+
+    GRAPHQL_OBJECT = re.compile(r"(\w+): object\(expression: \$(\w+)\)")
+
+    def _route_post(self, parsed):
+        if parsed.path not in ("/graphql", "/api/graphql"):
+            self.state.count("unknown")
+            return self._send_json({"message": "Not Found"}, status=404)
+
+        self.state.count("graphql")
+        payload = json.loads(self._body or b"{}")
+        variables = payload.get("variables", {})
+        full_name = f"{variables.get('owner')}/{variables.get('name')}"
+        if full_name not in self.state.repos:
+            return self._send_json({"data": {"repository": None},
+                                    "errors": [{"type": "NOT_FOUND", "message": f"Could not resolve to a Repository '{full_name}'"}]})
+
+        files = self.state.repos[full_name]
+        repository = {}
+        # Only the aliased `object(expression: $var)` form GraphQLBlobReader sends is understood
+        for alias, var in self.GRAPHQL_OBJECT.findall(payload.get("query", "")):
+            _, _, path = variables.get(var, "").partition(":")
+            content = files.get(path)
+            if content is None:
+                repository[alias] = None
+                continue
+            try:
+                text, is_binary = content.decode("utf-8"), False
+            except UnicodeDecodeError:
+                text, is_binary = None, True
+            repository[alias] = {
+                "oid": git_blob_sha(content),
+                "byteSize": len(content),
+                "isBinary": is_binary,
+                "isTruncated": False,
+                "text": text,
+            }
+        self._send_json({"data": {"repository": repository}})
+
+    # --- Endpoints ---
+
+    def _handle_repo(self, full_name: str, query=None):
+        self._send_json({
+            "full_name": full_name,
+            "default_branch": DEFAULT_BRANCH,
+            "stargazers_count": 0,
+            "language": "Python",
+        })
+
+    def _handle_commit(self, full_name: str, ref: str, query=None):
+        files = self.state.snapshot(full_name, ref)
+        if files is None:
+            return self._send_json({"message": f"No commit found for SHA: {ref}"}, status=422)
+        sha = self.state.commit_sha_of(files)
+        if "sha" in self.headers.get("Accept", ""):
+            return self._send_bytes(sha.encode(), "application/vnd.github.sha")
+        if files is not self.state.repos[full_name]:
+            return self._send_json({"sha": sha})  # Trees are only served for the current commit
+        self._send_json({"sha": sha, "commit": {"tree": {"sha": self.state.trees(full_name)[0]}}})
+
+    def _handle_compare(self, full_name: str, base: str, head: str, query=None):
+        # History is linear, so head is always "ahead" of an older base
+        old, new = self.state.snapshot(full_name, base), self.state.snapshot(full_name, head)
+        if old is None or new is None:
+            return self._send_json({"message": "Not Found"}, status=404)
+        files = []
+        for path in sorted(set(old) | set(new)):
+            if path not in old:
+                status = "added"
+            elif path not in new:
+                status = "removed"
+            elif old[path] != new[path]:
+                status = "modified"
+            else:
+                continue
+            files.append({"filename": path, "status": status, "sha": git_blob_sha(new.get(path, b""))})
+        self._send_json({"status": "identical" if not files else "ahead", "total_commits": 1 if files else 0,
+                         "files": files})
+
+    def _handle_tree(self, full_name: str, ref: str, query=None):
+        root_sha, trees = self.state.trees(full_name)
+        sha = ref if ref in trees else root_sha  # Branch names and commit SHAs resolve to the root tree
+        if "recursive" not in (query or {}):
+            return self._send_json({"sha": sha, "tree": trees[sha], "truncated": False})
+
+        entries = []
+        pending = [("", sha)]
+        while pending:
+            prefix, tree_sha = pending.pop()
+            for entry in reversed(trees[tree_sha]):
+                entries.append(dict(entry, path=f"{prefix}{entry['path']}"))
+                if entry["type"] == "tree":
+                    pending.append((f"{prefix}{entry['path']}/", entry["sha"]))
+        entries.sort(key=lambda e: e["path"])
+
+        limit = self.state.tree_limit
+        truncated = limit is not None and len(entries) > limit
+        self._send_json({"sha": sha, "tree": entries[:limit] if truncated else entries, "truncated": truncated})
+
+    RANGE = re.compile(r"^bytes=(\d+)-(\d*)$")
+
+    def _handle_contents(self, full_name: str, path: str, query=None):
+        content = self.state.repos[full_name].get(unquote(path))
+        if content is None:
+            return self._send_json({"message": "Not Found"}, status=404)
+        if "raw" in self.headers.get("Accept", ""):
+            match = self.RANGE.match(self.headers.get("Range", ""))
+            if match:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(content) - 1
+                body = content[start:end + 1]
+                return self._send_bytes(body, "application/octet-stream", 206,
+                                        {"Content-Range": f"bytes {start}-{start + len(body) - 1}/{len(content)}"})
+            return self._send_bytes(content, "application/octet-stream")
+        self._send_json({
+            "type": "file",
+            "path": path,
+            "sha": git_blob_sha(content),
+            "size": len(content),
+            "encoding": "base64",
+            "content": base64.b64encode(content).decode(),
+        })
+
+    def _archive_prefix(self, full_name: str) -> str:
+        return f"{full_name.replace('/', '-')}-{self.state.commit_sha(full_name)[:7]}/"
+
+    def _handle_tarball(self, full_name: str, ref: str, query=None):
+        prefix = self._archive_prefix(full_name)
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for path, content in self.state.repos[full_name].items():
+                info = tarfile.TarInfo(prefix + path)
+                info.size = len(content)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(content))
+        self._send_bytes(buffer.getvalue(), "application/x-gzip")
+
+    def _handle_zipball(self, full_name: str, ref: str, query=None):
+        prefix = self._archive_prefix(full_name)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path, content in self.state.repos[full_name].items():
+                zf.writestr(prefix + path, content)
+        self._send_bytes(buffer.getvalue(), "application/zip")
+
+    # --- Helpers ---
+
+    def _send_json(self, payload, status: int = 200):
+        body = json.dumps(payload).encode()
+        if status != 200:
+            return self._send_bytes(body, "application/json", status)
+
+        # Honour conditional requests the way GitHub does
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.state.count("not_modified")
+            return self._send_bytes(b"", "application/json", 304, {"ETag": etag})
+        self._send_bytes(body, "application/json", status, {"ETag": etag})
+
+    def _send_bytes(self, body: bytes, content_type: str, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        headers = dict(headers or {})
+        if getattr(self, "_credential", None) is not None:
+            # Like GitHub, 304s and rate-limit rejections are not charged against the budget
+            headers.update(self.state.rate_limit_headers(self._credential, self._resource, counted=status not in (304, 403)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeGitHubServer:
+    """
+    Local stand-in for the GitHub REST and GraphQL endpoints used by GitHubClient.
+    Runs in a background thread; point GitHubClient(api_base_url=server.url) at it.
+
+    Serves synthetic `repos`, and/or replays a `cassette` file. With `upstream`
+    (e.g. https://api.github.com) it records instead: requests are forwarded with
+    the client's own token and the responses saved to the cassette on stop().
+    `latency` (seconds) and `rate_limit` (requests per token and resource per
+    `rate_limit_window` seconds) emulate network delay and GitHub's rate limits.
+    """
+
+    def __init__(self, repos: Optional[Dict[str, Dict[str, bytes]]] = None, host: str = "127.0.0.1", port: int = 0,
+                 tree_limit: Optional[int] = None, latency: float = 0.0, rate_limit: Optional[int] = None,
+                 rate_limit_window: int = 3600, cassette: Optional[str] = None, upstream: Optional[str] = None):
+        if upstream and not cassette:
+            raise ValueError("Recording from an upstream API needs a cassette path")
+        self.state = FakeGitHubState(repos or {}, tree_limit, latency, rate_limit, rate_limit_window,
+                                     Cassette(cassette) if cassette else None, upstream)
+        handler = type("BoundFakeGitHubHandler", (FakeGitHubHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> Counter:
+        return self.state.stats
+
+    def push(self, full_name: str, files: Dict[str, bytes]) -> str:
+        """Makes `files` the repo's new head commit and returns its SHA."""
+        return self.state.push(full_name, files)
+
+    def start(self) -> "FakeGitHubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.state.cassette is not None and self.state.upstream:
+            self.state.cassette.save()
+            logger.info(f"Saved {len(self.state.cassette.interactions)} interactions to {self.state.cassette.path}")
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Serve synthetic or recorded repositories through a fake GitHub API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repo", default="fake/synthetic", help="owner/name of the synthetic repo")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--yaml", type=int, default=50)
+    parser.add_argument("--dockerfiles", type=int, default=1)
+    parser.add_argument("--tree-limit", type=int, help="Truncate recursive tree listings after this many entries")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--rate-limit", type=int, help="Requests per token and resource per window (sends X-RateLimit-* headers)")
+    parser.add_argument("--rate-limit-window", type=int, default=3600, help="Rate-limit window in seconds")
+    parser.add_argument("--cassette", help="Cassette file to replay (or record into with --record)")
+    parser.add_argument("--record", metavar="UPSTREAM", help="Record from this API base URL, e.g. https://api.github.com")
+    args = parser.parse_args()
+
+    repos = {args.repo: synthetic_repo(args.files, args.yaml, args.dockerfiles)}
+    server = FakeGitHubServer(repos, args.host, args.port, tree_limit=args.tree_limit, latency=args.latency_ms / 1000,
+                              rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window,
+                              cassette=args.cassette, upstream=args.record)
+    if args.record:
+        logger.info(f"Recording {args.record} into {args.cassette} at {server.url} (Ctrl+C to stop and save)")
+    else:
+        logger.info(f"Fake GitHub API serving {args.repo} at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()